@@ -0,0 +1,130 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Micro-benchmark of the JSON work done per marketplace action.
+
+Compares the previous path (json.dumps of the script parameters, model_dump
+re-serialized by aiohttp, response decoded to str and parsed with json.loads)
+with every available codec, and reports the CPU spent per action and per
+second at the given call rates.
+
+Run from server/secops-soar:
+
+    python -m benchmarks.codec_benchmark --rates 10,100,1000
+"""
+
+import argparse
+import json
+import timeit
+
+from secops_soar_mcp.codec import CODECS, get_codec
+from secops_soar_mcp.utils.models import ApiManualActionDataModel, TargetEntity
+
+
+def sample_action() -> tuple:
+    """Returns script parameters, an action request and an encoded response."""
+    script_params = {
+        "Search Value": "10.0.0.1,10.0.0.2,evil.example.com",
+        "CSV Path": "/opt/siemplify/csv",
+        "File Encoding Types": "utf-8,latin-1",
+        "Days Back": "30",
+        "Mark As Suspicious": True,
+        "Fields To Return": "src_ip,dst_ip,user,hostname",
+    }
+    action = ApiManualActionDataModel(
+        alertGroupIdentifiers=[f"rule_{i}_c0ffee" for i in range(3)],
+        caseId=523,
+        targetEntities=[
+            TargetEntity(Identifier=f"10.0.0.{i}", EntityType="ADDRESS")
+            for i in range(5)
+        ],
+        scope=None,
+        isPredefinedScope=False,
+        actionProvider="Scripts",
+        actionName="VirusTotalV3_Enrich IP",
+        properties={
+            "IntegrationInstance": "8d1b5f5e-3c4a-4f0e-9a43-2b7f1c7f9e10",
+            "ScriptName": "VirusTotalV3_Enrich IP",
+            "ScriptParametersEntityFields": json.dumps(script_params),
+        },
+    )
+    response = {
+        "resultId": 987654,
+        "status": "Completed",
+        "resultJson": [
+            {
+                "Entity": f"10.0.0.{i}",
+                "EntityResult": {
+                    "last_analysis_stats": {"harmless": 70, "malicious": i, "suspicious": 0},
+                    "reputation": -i,
+                    "tags": ["scanner", "tor"],
+                    "whois": "NetRange: 10.0.0.0 - 10.255.255.255 " * 8,
+                },
+            }
+            for i in range(5)
+        ],
+        "message": "Successfully enriched the following entities.",
+    }
+    return script_params, action, json.dumps(response).encode()
+
+
+def previous_path(script_params, action, response_body):
+    json.dumps(script_params)
+    json.dumps(action.model_dump()).encode("utf-8")
+    json.loads(response_body.decode("utf-8"))
+
+
+def codec_path(codec, script_params, action, response_body):
+    codec.dumps(script_params).decode()
+    codec.dumps(action)
+    codec.loads(response_body)
+
+
+def measure(fn, number: int) -> float:
+    """Returns the best time per call in microseconds."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument(
+        "--rates",
+        default="10,100,1000",
+        help="Comma-separated action rates (actions per second) to report CPU for.",
+    )
+    args = parser.parse_args()
+    rates = [float(rate) for rate in args.rates.split(",")]
+    sample = sample_action()
+
+    results = {"previous": measure(lambda: previous_path(*sample), args.number)}
+    for name in CODECS:
+        try:
+            codec = get_codec(name)
+        except ValueError as e:
+            print(f"Skipping {name}: {e}")
+            continue
+        results[name] = measure(lambda: codec_path(codec, *sample), args.number)
+
+    baseline = results["previous"]
+    header = f"{'path':<10} {'us/action':>10} {'saved':>8}"
+    header += "".join(f" {f'ms CPU/s @{rate:g}/s':>18}" for rate in rates)
+    print(header)
+    for name, micros in results.items():
+        line = f"{name:<10} {micros:>10.1f} {1 - micros / baseline:>8.0%}"
+        line += "".join(f" {micros * rate / 1000:>18.2f}" for rate in rates)
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local stand-in for the SOAR API, with latency and fault injection.
+
+Serves every endpoint in `utils.consts.Endpoints` with generated, stable
+data, so the server can be exercised and measured without a tenant. Each
+request is delayed by a latency drawn from the configured distribution and
+fails with a 500 or is throttled with a 429 at the configured rates.
+Request counts per endpoint are served at /__stats.
+
+Run from server/secops-soar and point the server at it:
+
+    python -m benchmarks.fake_soar --port 8480 --latency-ms 40 --error-rate 0.01
+    SOAR_URL=http://127.0.0.1:8480 SOAR_APP_KEY=fake python -m secops_soar_mcp.server
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, fields
+from typing import Optional
+
+from aiohttp import web
+from secops_soar_mcp.utils.consts import Endpoints
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+STATS_PATH = "/__stats"
+_CONFIG_KEY = web.AppKey("config", object)
+_STATS_KEY = web.AppKey("stats", object)
+
+
+@dataclass
+class FakeSoarConfig:
+    """Shape of the generated data and the faults injected into responses."""
+
+    # Mean added latency per request, and how it is distributed around it.
+    latency_ms: float = 20.0
+    latency_distribution: str = "lognormal"
+    # Spread of the uniform (+/- fraction of the mean) and lognormal (sigma)
+    # distributions.
+    latency_spread: float = 0.5
+    # Fractions of requests answered with a 500, or with a 429 and Retry-After.
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    # Fraction of executed actions whose result reports a failed run.
+    action_failure_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+    cases: int = 500
+    page_size: int = 50
+    # Items per page of the alert, comment and event lists of a case; 0
+    # returns each list in one response.
+    list_page_size: int = 0
+    alerts_per_case: int = 3
+    events_per_alert: int = 20
+    # Approximate size of the raw log of each event and of each action result.
+    event_bytes: int = 1024
+    action_result_bytes: int = 2048
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{self.latency_distribution}'. "
+                f"Use one of: {', '.join(LATENCY_DISTRIBUTIONS)}"
+            )
+
+
+class FakeSoarStats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = Counter()
+        self.statuses = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "uptime_seconds": round(time.monotonic() - self.started, 3),
+            "requests": sum(self.requests.values()),
+            "by_endpoint": dict(self.requests),
+            "by_status": {str(status): n for status, n in self.statuses.items()},
+            "max_in_flight": self.max_in_flight,
+        }
+
+
+def _sample_latency(config: FakeSoarConfig, rng: random.Random) -> float:
+    """Returns a latency in seconds."""
+    mean = config.latency_ms / 1000
+    if mean <= 0:
+        return 0.0
+    if config.latency_distribution == "fixed":
+        return mean
+    if config.latency_distribution == "uniform":
+        spread = mean * min(1.0, config.latency_spread)
+        return rng.uniform(mean - spread, mean + spread)
+    if config.latency_distribution == "exponential":
+        return rng.expovariate(1 / mean)
+    # Lognormal with the given sigma, scaled to keep the configured mean.
+    sigma = config.latency_spread
+    return rng.lognormvariate(math.log(mean) - sigma**2 / 2, sigma)
+
+
+@web.middleware
+async def _inject_faults(request: web.Request, handler):
+    if request.path == STATS_PATH:
+        return await handler(request)
+    config: FakeSoarConfig = request.app[_CONFIG_KEY]
+    stats: FakeSoarStats = request.app[_STATS_KEY]
+    route = request.match_info.route.resource
+    stats.requests[
+        f"{request.method} {route.canonical if route else request.path}"
+    ] += 1
+    stats.in_flight += 1
+    stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+    try:
+        rng = random.Random()
+        await asyncio.sleep(_sample_latency(config, rng))
+        draw = rng.random()
+        if draw < config.throttle_rate:
+            response = web.json_response(
+                {"errorMessage": "Too many requests"},
+                status=429,
+                headers={"Retry-After": f"{config.retry_after_seconds:g}"},
+            )
+        elif draw < config.throttle_rate + config.error_rate:
+            response = web.json_response(
+                {"errorMessage": "Injected server error"}, status=500
+            )
+        else:
+            response = await handler(request)
+        stats.statuses[response.status] += 1
+        return response
+    except web.HTTPException as e:
+        stats.statuses[e.status] += 1
+        raise
+    finally:
+        stats.in_flight -= 1
+
+
+def _case_id(request: web.Request) -> int:
+    try:
+        return int(request.match_info["case_id"])
+    except ValueError:
+        raise web.HTTPNotFound()
+
+
+def _case(config: FakeSoarConfig, case_id: int) -> dict:
+    rng = random.Random(config.seed * 1_000_003 + case_id)
+    update_time = 1_746_057_600_000 + case_id * 60_000
+    return {
+        "id": case_id,
+        "displayName": f"Suspicious activity {case_id}",
+        "status": rng.choice(["OPENED", "CLOSED"]),
+        "priority": rng.choice(
+            ["PriorityLow", "PriorityMedium", "PriorityHigh", "PriorityCritical"]
+        ),
+        "stage": "Triage",
+        "environment": "Default Environment",
+        "createTime": update_time - 3_600_000,
+        "updateTime": update_time,
+        "tags": [{"displayName": "fake"}],
+    }
+
+
+def _check_case(config: FakeSoarConfig, case_id: int):
+    if not 1 <= case_id <= config.cases:
+        raise web.HTTPNotFound(text='{"errorMessage": "Case not found"}')
+
+
+def _list_page(request: web.Request, key: str, items: list) -> web.Response:
+    config: FakeSoarConfig = request.app[_CONFIG_KEY]
+    if not config.list_page_size:
+        return web.json_response({key: items})
+    page = int(request.query.get("pageToken") or 0)
+    first = page * config.list_page_size
+    body = {key: items[first : first + config.list_page_size]}
+    if first + config.list_page_size < len(items):
+        body["nextPageToken"] = str(page + 1)
+    return web.json_response(body)
+
+
+def _alert_group(case_id: int, index: int) -> str:
+    return f"fake_rule_{index}_{case_id:08x}"
+
+
+async def list_cases(request: web.Request) -> web.Response:
+    config: FakeSoarConfig = request.app[_CONFIG_KEY]
+    page = int(request.query.get("pageToken") or 0)
+    first = page * config.page_size + 1
+    last = min(config.cases, first + config.page_size - 1)
+    body = {"cases": [_case(config, case_id) for case_id in range(first, last + 1)]}
+    if last < config.cases:
+        body["nextPageToken"] = str(page + 1)
+    return web.json_response(body)
+
+
+async def get_case(request: web.Request) -> web.Response:
+    config: FakeSoarConfig = request.app[_CONFIG_KEY]
+    case_id = _case_id(request)
+    _check_case(config, case_id)
+    return web.json_response(_case(config, case_id))
+
+
+async def update_case(request: web.Request) -> web.Response:
+    config: FakeSoarConfig = request.app[_CONFIG_KEY]
+    case_id = _case_id(request)
+    _check_case(config, case_id)
+    return web.json_response({**_case(config, case_id), **await request.json()})
+
+
+async def list_comments(request: web.Request) -> web.Response:
+    case_id = _case_id(request)
+    return _list_page(
+        request,
+        "comments",
+        [
+            {"id": case_id * 10 + i, "comment": f"Analyst note {i}", "user": "fake"}
+            for i in range(2)
+        ],
+    )
+
+
+async def post_comment(request: web.Request) -> web.Response:
+    body = await request.json()
+    return web.json_response(
+        {"id": random.randrange(1 << 30), "comment": body.get("Comment")}
+    )
+
+
+async def list_alerts(request: web.Request) -> web.Response:
+    config: FakeSoarConfig = request.app[_CONFIG_KEY]
+    case_id = _case_id(request)
+    _check_case(config, case_id)
+    alerts = [
+        {
+            "id": case_id * 100 + i,
+            "displayName": f"Fake alert {i}",
+            "alertGroupIdentifier": _alert_group(case_id, i),
+            "product": "Fake SIEM",
+            "severity": "HIGH",
+        }
+        for i in range(config.alerts_per_case)
+    ]
+    if request.query.get("$select") == "alertGroupIdentifier":
+        alerts = [{"alertGroupIdentifier": a["alertGroupIdentifier"]} for a in alerts]
+    return _list_page(request, "caseAlerts", alerts)
+
+
+async def get_alert(request: web.Request) -> web.Response:
+    case_id = _case_id(request)
+    alert_id = request.match_info["alert_id"]
+    return web.json_response(
+        {"id": alert_id, "caseId": case_id, "displayName": "Fake alert"}
+    )
+
+
+async def list_involved_events(request: web.Request) -> web.Response:
+    config: FakeSoarConfig = request.app[_CONFIG_KEY]
+    alert_id = request.match_info["alert_id"]
+    raw_log = "x" * config.event_bytes
+    events = [
+        {
+            "id": f"{alert_id}-{i}",
+            "event": {
+                "metadata": {"eventType": "NETWORK_CONNECTION", "productName": "Fake"},
+                "principal": {"ip": [f"10.0.{i % 256}.1"], "hostname": f"host-{i}"},
+                "target": {"ip": [f"203.0.113.{i % 256}"], "port": 443},
+            },
+            "rawLog": raw_log,
+        }
+        for i in range(config.events_per_alert)
+    ]
+    return _list_page(request, "involvedEvents", events)
+
+
+async def alerts_entities(request: web.Request) -> web.Response:
+    body = await request.json()
+    return web.json_response(
+        {
+            "alerts": [
+                {
+                    "alertGroupIdentifier": group,
+                    "entities": [
+                        {"identifier": "10.0.0.1", "entityType": "ADDRESS"},
+                        {"identifier": "HOST-1", "entityType": "HOSTNAME"},
+                    ],
+                }
+                for group in body.get("alertGroupIdentifiers", [])
+            ]
+        }
+    )
+
+
+async def entity_data(request: web.Request) -> web.Response:
+    body = await request.json()
+    return web.json_response(
+        {
+            "identifier": body.get("entityIdentifier"),
+            "entityType": body.get("entityType"),
+            "isSuspicious": False,
+            "isInternalAsset": True,
+            "cases": [1, 2],
+        }
+    )
+
+
+async def search_entities(request: web.Request) -> web.Response:
+    body = await request.json()
+    term = body.get("term") or "10.0.0.1"
+    return web.json_response(
+        {"objectsList": [{"identifier": term, "entityType": "ADDRESS"}]}
+    )
+
+
+async def get_scopes(request: web.Request) -> web.Response:
+    return web.json_response(["All entities", "All hostnames", "All IP addresses"])
+
+
+async def integration_instances(request: web.Request) -> web.Response:
+    name = request.match_info["integration_name"]
+    return web.json_response(
+        {"integration_instances": [{"identifier": f"fake-instance-{name}"}]}
+    )
+
+
+async def execute_manual_action(request: web.Request) -> web.Response:
+    config: FakeSoarConfig = request.app[_CONFIG_KEY]
+    body = await request.json()
+    failed = random.random() < config.action_failure_rate
+    return web.json_response(
+        {
+            "resultId": random.randrange(1 << 30),
+            "status": "Failed" if failed else "Completed",
+            "actionName": body.get("actionName"),
+            "caseId": body.get("caseId"),
+            "resultJson": "r" * config.action_result_bytes,
+        }
+    )
+
+
+async def stats(request: web.Request) -> web.Response:
+    return web.json_response(request.app[_STATS_KEY].as_dict())
+
+
+def _route(template: str) -> str:
+    """Turns an `Endpoints` template into an aiohttp route path."""
+    path = template.split("?", 1)[0]
+    for placeholder, name in (
+        ("{CASE_ID}", "{case_id}"),
+        ("{ALERT_ID}", "{alert_id}"),
+        ("{INTEGRATION_NAME}", "{integration_name}"),
+    ):
+        path = path.replace(placeholder, name)
+    return path
+
+
+def create_app(config: Optional[FakeSoarConfig] = None) -> web.Application:
+    """Returns the fake SOAR API application."""
+    app = web.Application(middlewares=[_inject_faults])
+    app[_CONFIG_KEY] = config or FakeSoarConfig()
+    app[_STATS_KEY] = FakeSoarStats()
+    routes = [
+        ("GET", Endpoints.BASE_CASE_URL, list_cases),
+        ("GET", Endpoints.BASE_SPECIFIC_CASE_URL, get_case),
+        ("PATCH", Endpoints.BASE_SPECIFIC_CASE_URL, update_case),
+        ("GET", Endpoints.BASE_CASE_COMMENTS_URL, list_comments),
+        ("POST", Endpoints.BASE_CASE_COMMENTS_URL, post_comment),
+        # Also serves LIST_ALERT_GROUP_IDENTIFIERS_BY_CASE, which adds $select.
+        ("GET", Endpoints.BASE_ALERT_URL, list_alerts),
+        ("GET", Endpoints.BASE_SPECIFIC_ALERT_URL, get_alert),
+        ("GET", Endpoints.LIST_INVOLVED_EVENTS_BY_ALERT, list_involved_events),
+        ("POST", Endpoints.GET_ALERT_GROUP_IDENTIFIERS_ENTITIES, alerts_entities),
+        ("POST", Endpoints.FETCH_FULL_UNIQUE_ENTITY, entity_data),
+        ("POST", Endpoints.SEARCH_ENTITY, search_entities),
+        ("GET", Endpoints.GET_SCOPES, get_scopes),
+        ("GET", Endpoints.LIST_INTEGRATION_INSTANCES, integration_instances),
+        ("POST", Endpoints.EXECUTE_MANUAL_ACTION, execute_manual_action),
+    ]
+    for method, template, handler in routes:
+        app.router.add_route(method, _route(template), handler)
+    app.router.add_get(STATS_PATH, stats)
+    return app
+
+
+async def start(
+    config: Optional[FakeSoarConfig] = None, host: str = "127.0.0.1", port: int = 0
+) -> tuple:
+    """Starts the fake SOAR API in the running event loop.
+
+    Returns:
+        The runner, to `cleanup()` when done, and the base URL.
+    """
+    runner = web.AppRunner(create_app(config), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}"
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    """Adds a command line option for every `FakeSoarConfig` field."""
+    defaults = FakeSoarConfig()
+    for field in fields(FakeSoarConfig):
+        option = "--" + field.name.replace("_", "-")
+        default = getattr(defaults, field.name)
+        if field.name == "latency_distribution":
+            parser.add_argument(option, choices=LATENCY_DISTRIBUTIONS, default=default)
+        else:
+            parser.add_argument(option, type=type(default), default=default)
+
+
+def config_from_args(args: argparse.Namespace) -> FakeSoarConfig:
+    return FakeSoarConfig(
+        **{field.name: getattr(args, field.name) for field in fields(FakeSoarConfig)}
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the SOAR API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8480)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    web.run_app(
+        create_app(config_from_args(args)),
+        host=args.host,
+        port=args.port,
+        access_log=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
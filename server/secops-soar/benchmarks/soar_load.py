@@ -0,0 +1,352 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Load test of the SOAR server's tools against the local SOAR stand-in.
+
+Starts the fake SOAR API (see `benchmarks.fake_soar`) in-process, binds the
+server to it and calls a weighted mix of case management tools and
+marketplace actions from `--concurrency` concurrent callers for
+`--duration` seconds. Reports p50/p95/p99 latency and throughput per tool,
+and the requests the fake SOAR API received.
+
+Run from server/secops-soar:
+
+    python -m benchmarks.soar_load --concurrency 50 --duration 20 \\
+        --mix get_case_full_details=3,list_alerts_by_case=2,csv_ping=1 \\
+        --latency-ms 40 --error-rate 0.01
+
+Mix entries that are not one of the built-in case management scenarios are
+called as marketplace action tools of the `--integrations` being loaded.
+Pass `--soar-url` to drive an already running stand-in instead, and
+`--via-mcp` to include MCP protocol handling in the measured latency.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+from benchmarks import fake_soar
+from secops_soar_mcp.utils import consts
+
+# Scenario name -> (tool name, arguments for a random case of the stand-in).
+SCENARIOS: Dict[str, Callable[[random.Random, int], Tuple[str, dict]]] = {
+    "list_cases": lambda rng, cases: ("list_cases", {}),
+    "search_cases": lambda rng, cases: (
+        "search_cases",
+        {"status": ["OPENED"], "max_results": 20, "max_pages": 5},
+    ),
+    "get_case_full_details": lambda rng, cases: (
+        "get_case_full_details",
+        {"case_id": str(rng.randint(1, cases))},
+    ),
+    "get_case_full_details_deep": lambda rng, cases: (
+        "get_case_full_details",
+        {"case_id": str(rng.randint(1, cases)), "deep": True},
+    ),
+    "list_alerts_by_case": lambda rng, cases: (
+        "list_alerts_by_case",
+        {"case_id": str(rng.randint(1, cases))},
+    ),
+    "list_events_by_alert": lambda rng, cases: _events_arguments(rng, cases),
+    "get_entities_by_alert_group_identifiers": lambda rng, cases: (
+        "get_entities_by_alert_group_identifiers",
+        _case_and_groups(rng, cases),
+    ),
+}
+
+
+def _events_arguments(rng: random.Random, cases: int) -> Tuple[str, dict]:
+    case_id = rng.randint(1, cases)
+    return "list_events_by_alert", {
+        "case_id": str(case_id),
+        "alert_id": str(case_id * 100),
+    }
+
+
+def _case_and_groups(rng: random.Random, cases: int) -> dict:
+    case_id = rng.randint(1, cases)
+    return {
+        "case_id": str(case_id),
+        "alert_group_identifiers": [fake_soar._alert_group(case_id, 0)],
+    }
+
+
+def _action_scenario(tool_name: str):
+    def arguments(rng: random.Random, cases: int) -> Tuple[str, dict]:
+        return tool_name, {
+            "target_entities": [],
+            **_case_and_groups(rng, cases),
+        }
+
+    return arguments
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for entry in mix.split(","):
+        if not entry.strip():
+            continue
+        name, _, weight = entry.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    if not weights or any(weight < 0 for weight in weights.values()):
+        raise ValueError(f"Invalid mix '{mix}'")
+    return weights
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    index = round(fraction * len(sorted_values)) - 1
+    index = max(0, min(len(sorted_values) - 1, index))
+    return sorted_values[index]
+
+
+def _is_failure(result: Any) -> bool:
+    return isinstance(result, dict) and result.get("Status") == "Failed"
+
+
+class LoadResult:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.failures: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, str] = {}
+        self.elapsed = 0.0
+
+    def record(self, scenario: str, seconds: float, error: Optional[str]):
+        self.latencies[scenario].append(seconds)
+        if error is not None:
+            self.failures[scenario] += 1
+            self.errors.setdefault(scenario, error[:200])
+
+    def summary(self) -> Dict[str, Any]:
+        rows = {}
+        everything = []
+        for scenario, latencies in sorted(self.latencies.items()):
+            everything.extend(latencies)
+            rows[scenario] = self._row(latencies, self.failures[scenario])
+        rows["all"] = self._row(everything, sum(self.failures.values()))
+        return rows
+
+    def _row(self, latencies: List[float], failures: int) -> Dict[str, Any]:
+        latencies = sorted(latencies)
+        return {
+            "calls": len(latencies),
+            "failed": failures,
+            "calls_per_second": round(len(latencies) / self.elapsed, 1)
+            if self.elapsed
+            else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        }
+
+
+async def run_load(
+    call_tool: Callable,
+    scenarios: Dict[str, Callable],
+    weights: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    cases: int,
+    seed: int = 0,
+) -> LoadResult:
+    """Calls tools from `concurrency` callers until `duration` seconds passed."""
+    result = LoadResult()
+    names = list(weights)
+    weight_values = list(weights.values())
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def caller(index: int):
+        rng = random.Random(seed * 7919 + index)
+        while time.perf_counter() < deadline:
+            scenario = rng.choices(names, weights=weight_values)[0]
+            tool_name, arguments = scenarios[scenario](rng, cases)
+            call_started = time.perf_counter()
+            error = None
+            try:
+                response = await call_tool(tool_name, arguments)
+                if _is_failure(response):
+                    error = str(response.get("Message"))
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            result.record(scenario, time.perf_counter() - call_started, error)
+
+    await asyncio.gather(*(caller(i) for i in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _tool_caller(mcp, session=None) -> Callable:
+    """Returns a coroutine function calling a tool and returning its result."""
+    if session is None:
+        return mcp._tool_manager.call_tool
+
+    async def call_over_mcp(name: str, arguments: dict) -> Any:
+        response = await session.call_tool(name, arguments)
+        if response.isError:
+            raise RuntimeError(response.content[0].text if response.content else "")
+        if response.structuredContent is not None:
+            return response.structuredContent.get("result", response.structuredContent)
+        return json.loads(response.content[0].text) if response.content else None
+
+    return call_over_mcp
+
+
+def print_report(summary: Dict[str, Any], backend: Dict[str, Any], errors: Dict):
+    header = (
+        f"{'tool':<42} {'calls':>7} {'failed':>7} {'calls/s':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for scenario, row in summary.items():
+        print(
+            f"{scenario:<42} {row['calls']:>7} {row['failed']:>7} "
+            f"{row['calls_per_second']:>9} {row['p50_ms']:>8} {row['p95_ms']:>8} "
+            f"{row['p99_ms']:>8} {row['max_ms']:>8}"
+        )
+    if backend:
+        calls = summary["all"]["calls"] or 1
+        print(
+            f"\nSOAR API: {backend['requests']} requests "
+            f"({backend['requests'] / calls:.2f} per tool call), "
+            f"statuses {backend['by_status']}, max {backend['max_in_flight']} in flight"
+        )
+    for scenario, error in errors.items():
+        print(f"First failure of {scenario}: {error}")
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    weights = parse_mix(args.mix)
+    runner = None
+    soar_url = args.soar_url
+    if soar_url is None:
+        runner, soar_url = await fake_soar.start(fake_soar.config_from_args(args))
+    os.environ[consts.ENV_SOAR_URL] = soar_url
+    os.environ.setdefault(consts.ENV_SOAR_APP_KEY, "fake")
+    if args.no_response_cache:
+        os.environ[consts.ENV_SOAR_RESPONSE_CACHE_TTL] = "0"
+
+    # Imported after the environment is set up, like the server entry point.
+    from mcp.shared.memory import create_connected_server_and_client_session
+    from secops_soar_mcp import bindings, server
+    from secops_soar_mcp.bulk_actions import is_action_tool
+
+    await bindings.bind()
+    try:
+        await server.register_tools(args.integrations, shards=args.shards)
+        scenarios = dict(SCENARIOS)
+        for name in weights:
+            if name in scenarios:
+                continue
+            tool = server.mcp._tool_manager.get_tool(name)
+            if tool is None or not is_action_tool(tool):
+                raise ValueError(
+                    f"'{name}' is neither a scenario ({', '.join(SCENARIOS)}) nor a "
+                    f"marketplace action of the integrations '{args.integrations}'"
+                )
+            scenarios[name] = _action_scenario(name)
+
+        async with contextlib.AsyncExitStack() as stack:
+            session = None
+            if args.via_mcp:
+                session = await stack.enter_async_context(
+                    create_connected_server_and_client_session(server.mcp._mcp_server)
+                )
+            result = await run_load(
+                _tool_caller(server.mcp, session),
+                scenarios,
+                weights,
+                args.concurrency,
+                args.duration,
+                args.cases,
+                args.seed,
+            )
+
+        backend = {}
+        async with aiohttp.ClientSession() as http:
+            with contextlib.suppress(aiohttp.ClientError):
+                async with http.get(soar_url + fake_soar.STATS_PATH) as response:
+                    if response.status == 200:
+                        backend = await response.json()
+        return {
+            "summary": result.summary(),
+            "soar_api": backend,
+            "http_client": bindings.http_client.stats(),
+            "errors": result.errors,
+        }
+    finally:
+        await server.stop_shards()
+        await bindings.cleanup()
+        if runner is not None:
+            await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load test of the SOAR server's tools against the SOAR stand-in"
+    )
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    parser.add_argument(
+        "--mix",
+        default="get_case_full_details=3,list_alerts_by_case=2,list_events_by_alert=2,list_cases=1,csv_ping=1",
+        help="Comma-separated scenario=weight entries",
+    )
+    parser.add_argument(
+        "--integrations",
+        default="CSV",
+        help="Integrations to load for marketplace action entries of the mix",
+    )
+    parser.add_argument(
+        "--shards", type=int, default=0, help="Host the integrations in shards"
+    )
+    parser.add_argument(
+        "--via-mcp",
+        action="store_true",
+        help="Call tools through an in-memory MCP client session",
+    )
+    parser.add_argument(
+        "--no-response-cache",
+        action="store_true",
+        help="Disable the response cache so every call reaches the SOAR API",
+    )
+    parser.add_argument(
+        "--soar-url", help="Use a running SOAR stand-in instead of starting one"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    fake_soar.add_config_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        report = asyncio.run(main_async(args))
+    except ValueError as e:
+        parser.error(str(e))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report["summary"], report["soar_api"], report["errors"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Data-driven execution of marketplace manual actions.
+
+Every generated marketplace tool performs the same steps: validate the
+scope, look up the integration instance and post an ExecuteManualAction
+request. The only differences are the integration, the action name and how
+tool arguments map to script parameters. `ActionSpec` captures those
+differences so a single executor can serve any marketplace action.
+"""
+
+import asyncio
+import math
+import os
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from logger_utils import get_logger
+from pydantic import BaseModel
+from secops_soar_mcp import bindings
+from secops_soar_mcp.circuit_breaker import CircuitBreaker
+from secops_soar_mcp.http_client import is_error_result, is_transient_error
+from secops_soar_mcp.metrics import integration_scope
+from secops_soar_mcp.utils import consts
+from secops_soar_mcp.utils.consts import Endpoints
+from secops_soar_mcp.utils.models import ApiManualActionDataModel, TargetEntity
+
+logger = get_logger(__name__)
+
+# Result statuses of actions that SOAR ran but that failed in the integration.
+FAILED_EXECUTION_STATUSES = frozenset(["failed", "faulted", "error"])
+
+
+class ActionParameter(NamedTuple):
+    """Maps a tool argument to a script parameter of the action."""
+
+    argument: str
+    script_name: str
+    # Optional parameters are only sent when the argument is not None.
+    optional: bool
+
+
+class ActionSpec(NamedTuple):
+    """Everything needed to execute one marketplace action."""
+
+    integration: str
+    action_name: str
+    parameters: Tuple[ActionParameter, ...]
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "ActionSpec":
+        return cls(
+            integration=data["integration"],
+            action_name=data["action_name"],
+            parameters=tuple(ActionParameter(*p) for p in data["parameters"]),
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "integration": self.integration,
+            "action_name": self.action_name,
+            "parameters": [list(p) for p in self.parameters],
+        }
+
+
+def build_script_parameters(
+    spec: ActionSpec, arguments: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Builds the script parameters of an action from tool arguments."""
+    script_params = {}
+    for parameter in spec.parameters:
+        value = arguments.get(parameter.argument)
+        if parameter.optional and value is None:
+            continue
+        script_params[parameter.script_name] = value
+    return script_params
+
+
+async def run_action(
+    spec: ActionSpec,
+    case_id: str,
+    alert_group_identifiers: List[str],
+    target_entities: Optional[List[TargetEntity]] = None,
+    scope: Optional[str] = None,
+    **arguments: Any,
+) -> dict:
+    """Executes an action with arguments validated against its tool signature.
+
+    Model-typed arguments such as `EmailContent` are sent as plain objects,
+    the same way the generated action functions send them.
+    """
+    arguments = {
+        name: value.model_dump() if isinstance(value, BaseModel) else value
+        for name, value in arguments.items()
+    }
+    return await execute_action(
+        spec, case_id, alert_group_identifiers, target_entities, scope, arguments
+    )
+
+
+async def execute_action(
+    spec: ActionSpec,
+    case_id: str,
+    alert_group_identifiers: List[str],
+    target_entities: Optional[List[TargetEntity]],
+    scope: Optional[str],
+    arguments: Dict[str, Any],
+) -> dict:
+    """Executes a marketplace action as a manual action on a case.
+
+    Calls go through the circuit breaker of the integration: while it is open
+    the action fails immediately without contacting SOAR.
+
+    Args:
+        spec: The action to execute.
+        case_id: The ID of the case to run the action on.
+        alert_group_identifiers: Identifiers for the alert groups.
+        target_entities: Specific entities to run the action on. When empty,
+            the action runs on the entities selected by `scope`.
+        scope: A predefined entity scope, used when no targets are given.
+        arguments: The action-specific tool arguments, keyed by argument name.
+
+    Returns:
+        dict: The result of the action execution, or a failure status.
+    """
+    if target_entities:
+        # Specific target entities provided, ignore scope parameter
+        final_target_entities = target_entities
+        final_scope = None
+        is_predefined_scope = False
+    else:
+        if scope not in bindings.valid_scopes:
+            allowed_values_str = ", ".join(sorted(list(bindings.valid_scopes)))
+            return {
+                "Status": "Failed",
+                "Message": f"Invalid scope '{scope}'. Allowed values are: {allowed_values_str}",
+            }
+        final_target_entities = []
+        final_scope = scope
+        is_predefined_scope = True
+
+    breaker = bindings.circuit_breakers.get(spec.integration)
+    if not breaker.allow():
+        return _circuit_open_result(spec.integration, breaker)
+    try:
+        with integration_scope(spec.integration):
+            response, executed = await _execute_on_instance(
+                spec,
+                case_id,
+                alert_group_identifiers,
+                final_target_entities,
+                final_scope,
+                is_predefined_scope,
+                arguments,
+            )
+    except BaseException:
+        breaker.release()
+        raise
+    if is_transient_error(response):
+        breaker.record_failure(response["Message"])
+    elif executed and is_failed_execution(response):
+        # SOAR accepted the request but the integration failed to run it.
+        breaker.record_failure(
+            response.get("Message") or f"{spec.action_name} failed"
+        )
+    elif isinstance(response, dict) and response.get("Status") == "Failed":
+        # Rejected requests and missing instances say nothing about the
+        # integration's health.
+        breaker.release()
+    else:
+        breaker.record_success()
+    return response
+
+
+def is_failed_execution(response: Any) -> bool:
+    """Returns whether an execution result reports that the action failed."""
+    if not isinstance(response, dict) or is_error_result(response):
+        return False
+    status = response.get("status", response.get("Status"))
+    return isinstance(status, str) and status.lower() in FAILED_EXECUTION_STATUSES
+
+
+def _circuit_open_result(integration: str, breaker: CircuitBreaker) -> dict:
+    return {
+        "Status": "Failed",
+        "Message": (
+            f"Integration {integration} is unavailable after "
+            f"{breaker.consecutive_failures} consecutive failures. Retry in "
+            f"{math.ceil(breaker.retry_after())}s or use another integration."
+        ),
+        "CircuitBreaker": breaker.status(),
+    }
+
+
+async def _execute_on_instance(
+    spec: ActionSpec,
+    case_id: str,
+    alert_group_identifiers: List[str],
+    target_entities: List[TargetEntity],
+    scope: Optional[str],
+    is_predefined_scope: bool,
+    arguments: Dict[str, Any],
+) -> Tuple[dict, bool]:
+    """Posts the action to the integration's instance.
+
+    Returns:
+        The response, and whether it is the result of an execution rather
+        than a failure to look up the instance or to reach SOAR.
+    """
+    try:
+        instance_response = await bindings.get_integration_instances(
+            spec.integration
+        )
+        if is_error_result(instance_response):
+            return instance_response, False
+        instances = instance_response.get("integration_instances", [])
+    except Exception as e:
+        logger.error("Error fetching instance for %s: %s", spec.integration, e)
+        return {"Status": "Failed", "Message": f"Error fetching instance: {e}"}, False
+
+    if not instances:
+        logger.warning("No active integration instance found for %s", spec.integration)
+        return {"Status": "Failed", "Message": "No active instance found."}, False
+
+    instance_identifier = instances[0].get("identifier")
+    if not instance_identifier:
+        return (
+            {"Status": "Failed", "Message": "Instance found but identifier is missing."},
+            False,
+        )
+
+    action_data = ApiManualActionDataModel(
+        alertGroupIdentifiers=alert_group_identifiers,
+        caseId=case_id,
+        targetEntities=target_entities,
+        scope=scope,
+        isPredefinedScope=is_predefined_scope,
+        actionProvider="Scripts",
+        actionName=spec.action_name,
+        properties={
+            "IntegrationInstance": instance_identifier,
+            "ScriptName": spec.action_name,
+            "ScriptParametersEntityFields": bindings.http_client.codec.dumps(
+                build_script_parameters(spec, arguments)
+            ).decode(),
+        },
+    )
+
+    try:
+        execution_response = await bindings.http_client.post(
+            Endpoints.EXECUTE_MANUAL_ACTION, req=action_data
+        )
+        bindings.invalidate_case_cache(case_id)
+        if is_instance_missing(execution_response):
+            # The instance was removed; look it up again next time.
+            bindings.invalidate_integration_instances(spec.integration)
+        return execution_response, not is_error_result(execution_response)
+    except Exception as e:
+        logger.error(
+            "Error executing action %s for %s: %s",
+            spec.action_name,
+            spec.integration,
+            e,
+        )
+        return {"Status": "Failed", "Message": f"Error executing action: {e}"}, False
+
+
+def is_instance_missing(response: Any) -> bool:
+    """Returns whether an execution response reports an unknown integration instance.
+
+    Throttling and server errors say nothing about the instance, so only a 404
+    or an explicit "instance not found" message drops the cached identifier.
+    """
+    if not isinstance(response, dict):
+        return False
+    if is_error_result(response) and response["Error"].get("StatusCode") == 404:
+        return True
+    message = str(response.get("Message") or "").lower()
+    return "instance" in message and "not found" in message
+
+
+class RateLimiter:
+    """Token bucket limiting how fast actions are started."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Waits until an action may be started."""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(integration: str) -> RateLimiter:
+    """Returns the rate limiter shared by all bulk runs of an integration."""
+    limiter = _rate_limiters.get(integration)
+    if limiter is None:
+        rate = float(
+            os.getenv(
+                consts.ENV_SOAR_ACTION_RATE_LIMIT, consts.DEFAULT_ACTION_RATE_LIMIT
+            )
+        )
+        limiter = RateLimiter(rate, burst=rate)
+        _rate_limiters[integration] = limiter
+    return limiter
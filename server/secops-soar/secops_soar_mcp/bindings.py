@@ -14,10 +14,15 @@
 """Bindings for the SOAR client."""
 
 import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import dotenv
 from logger_utils import get_logger
-from secops_soar_mcp.http_client import HttpClient
+from secops_soar_mcp.circuit_breaker import CircuitBreakers
+from secops_soar_mcp.http_client import HttpClient, HttpClientConfig, is_error_result
+from secops_soar_mcp.instance_cache import IntegrationInstanceCache
+from secops_soar_mcp.metrics import Metrics
+from secops_soar_mcp.response_cache import CASES_TAG, case_tag
 from secops_soar_mcp.utils import consts
 
 dotenv.load_dotenv()
@@ -26,12 +31,20 @@ logger = get_logger(__name__)
 
 
 http_client: HttpClient = None
+integration_instances: IntegrationInstanceCache = None
+circuit_breakers: CircuitBreakers = None
 valid_scopes = set()
+# Called with the ID of every case whose cached reads are dropped, e.g. to
+# tell the server about actions run by a worker process (see shards.py).
+on_case_invalidated: Optional[Callable[[Any], None]] = None
+# Returns snapshots of the breakers and metrics of the worker processes
+# hosting integrations, when there are any.
+worker_snapshots: Optional[Callable[[], Awaitable[List[Dict[str, Any]]]]] = None
 
 
 async def _get_valid_scopes():
     valid_scopes_list = await http_client.get(consts.Endpoints.GET_SCOPES)
-    if valid_scopes_list is None:
+    if is_error_result(valid_scopes_list):
         raise RuntimeError(
             "Failed to fetch valid scopes from SOAR, please make sure you have configured the right SOAR credentials. Shutting down..."
         )
@@ -40,13 +53,84 @@ async def _get_valid_scopes():
 
 async def bind():
     """Binds global variables."""
-    global http_client, valid_scopes
+    global http_client, integration_instances, circuit_breakers, valid_scopes
     http_client = HttpClient(
-        os.getenv(consts.ENV_SOAR_URL), os.getenv(consts.ENV_SOAR_APP_KEY)
+        os.getenv(consts.ENV_SOAR_URL),
+        os.getenv(consts.ENV_SOAR_APP_KEY),
+        HttpClientConfig.from_env(),
+    )
+    integration_instances = IntegrationInstanceCache(
+        http_client,
+        ttl=float(
+            os.getenv(
+                consts.ENV_SOAR_INSTANCE_CACHE_TTL, consts.DEFAULT_INSTANCE_CACHE_TTL
+            )
+        ),
+        refresh_after=float(
+            os.getenv(
+                consts.ENV_SOAR_INSTANCE_CACHE_REFRESH_AFTER,
+                consts.DEFAULT_INSTANCE_CACHE_REFRESH_AFTER,
+            )
+        ),
+    )
+    circuit_breakers = CircuitBreakers(
+        failure_threshold=int(
+            os.getenv(
+                consts.ENV_SOAR_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                consts.DEFAULT_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            )
+        ),
+        reset_timeout=float(
+            os.getenv(
+                consts.ENV_SOAR_CIRCUIT_BREAKER_RESET_TIMEOUT,
+                consts.DEFAULT_CIRCUIT_BREAKER_RESET_TIMEOUT,
+            )
+        ),
     )
     valid_scopes = await _get_valid_scopes()
 
 
+async def get_integration_instances(integration_name: str):
+    """Returns the (cached) integration instances response for an integration."""
+    return await integration_instances.get(integration_name)
+
+
+def invalidate_integration_instances(integration_name: str):
+    """Drops the cached instances of an integration, e.g. after a failed action."""
+    integration_instances.invalidate(integration_name)
+
+
+def invalidate_case_cache(case_id):
+    """Drops cached reads of a case after an action may have changed it."""
+    http_client.invalidate(case_tag(case_id), CASES_TAG)
+    if on_case_invalidated is not None:
+        on_case_invalidated(case_id)
+
+
+async def _worker_snapshots() -> List[Dict[str, Any]]:
+    return await worker_snapshots() if worker_snapshots is not None else []
+
+
+async def circuit_breaker_status() -> Dict[str, Dict[str, Any]]:
+    """Returns the breaker of every integration, including those of workers."""
+    status = circuit_breakers.status()
+    for snapshot in await _worker_snapshots():
+        status.update(snapshot["breakers"])
+    return status
+
+
+async def request_metrics() -> Metrics:
+    """Returns the request metrics of this process and of its workers."""
+    snapshots = await _worker_snapshots()
+    if not snapshots:
+        return http_client.metrics
+    return Metrics.merged(
+        [http_client.metrics.to_json(), *(snapshot["metrics"] for snapshot in snapshots)]
+    )
+
+
 async def cleanup():
     """Cleans up global variables."""
+    if integration_instances is not None:
+        integration_instances.clear()
     await http_client.close()
@@ -0,0 +1,178 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tool for running one marketplace action across many cases or entities."""
+
+import asyncio
+from typing import Annotated, Any, Dict, List, Optional
+
+from logger_utils import get_logger
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.tools import Tool
+from pydantic import Field
+from secops_soar_mcp.actions import get_rate_limiter
+from secops_soar_mcp.http_client import is_error_result
+from secops_soar_mcp.utils.models import BulkActionTarget
+from secops_soar_mcp.utils.pydantic_list_field import PydanticListField
+
+logger = get_logger(__name__)
+
+MARKETPLACE_PACKAGE = "secops_soar_mcp.marketplace"
+MAX_BULK_CONCURRENCY = 50
+# Arguments every marketplace action tool accepts.
+ACTION_TARGET_ARGUMENTS = ("case_id", "alert_group_identifiers", "target_entities")
+
+
+def integration_of(tool: Tool) -> str:
+    """Returns the module stem of the integration a marketplace action tool belongs to.
+
+    Executor, lazy and shard tools record it; tools registered straight from
+    a module function are traced back to their module. The stem is the key
+    of the integration's rate limiter, whichever way its tools are served.
+    """
+    module_stem = getattr(tool, "module_stem", None)
+    if module_stem is not None:
+        return module_stem
+    return tool.fn.__module__.removeprefix(MARKETPLACE_PACKAGE + ".")
+
+
+def is_action_tool(tool: Tool) -> bool:
+    properties = tool.parameters.get("properties", {})
+    return all(argument in properties for argument in ACTION_TARGET_ARGUMENTS)
+
+
+def _is_failure(result: Any) -> bool:
+    return is_error_result(result) or (
+        isinstance(result, dict) and result.get("Status") == "Failed"
+    )
+
+
+def register_tools(mcp: FastMCP):
+    @mcp.tool()
+    async def execute_bulk_action(
+        action_name: Annotated[
+            str,
+            Field(
+                ...,
+                description="The name of the marketplace action tool to run (e.g. 'virus_total_v3_enrich_hash').",
+            ),
+        ],
+        targets: Annotated[
+            List[BulkActionTarget],
+            PydanticListField(
+                BulkActionTarget,
+                description="The cases, alert groups and optional target entities to run the action on, one run per item.",
+            ),
+        ],
+        parameters: Annotated[
+            Optional[Dict[str, Any]],
+            Field(
+                default=None,
+                description="Action-specific arguments, keyed by the action tool's argument names, applied to every run.",
+            ),
+        ],
+        scope: Annotated[
+            str,
+            Field(
+                default="All entities",
+                description="The scope used for targets that do not list target entities.",
+            ),
+        ],
+        max_concurrency: Annotated[
+            int,
+            Field(
+                default=10,
+                description=f"How many runs may be in progress at once (at most {MAX_BULK_CONCURRENCY}).",
+            ),
+        ],
+    ) -> dict:
+        """Run one marketplace action across many cases or entities in a single call.
+
+        Enrichment and containment often need the same action applied to hundreds of
+        targets. Instead of one tool call per target, this tool runs the given marketplace
+        action once per item in `targets`, with bounded concurrency and a per-integration
+        rate limit, and returns the aggregated outcome.
+
+        Args:
+            action_name (str): The name of an enabled marketplace action tool. (Example: "virus_total_v3_enrich_hash")
+            targets (List[BulkActionTarget]): One item per run, each with `case_id`,
+                                              `alert_group_identifiers` and optional `target_entities`.
+            parameters (Optional[Dict[str, Any]]): Action-specific arguments shared by every run,
+                                                   using the argument names of the action tool.
+            scope (str): The entity scope for runs without explicit target entities.
+            max_concurrency (int): How many runs may be in progress at once.
+
+        Returns:
+            dict: A summary with 'total', 'succeeded' and 'failed' counts, 'results' with the
+                  action result of every successful run and 'failures' with the error of every
+                  failed run. Each entry carries the `index` and `case_id` of its target.
+
+        **Workflow Integration:**
+        - Use after identifying many targets (e.g. via `search_cases` or `get_entities_by_alert_group_identifiers`)
+          that need the same marketplace action.
+
+        **Next Steps (using MCP-enabled tools):**
+        - Inspect `failures` and retry only those targets if needed.
+        - Document the bulk outcome on the affected cases using a case commenting tool.
+        """
+        tool = mcp._tool_manager.get_tool(action_name)
+        if tool is None or not is_action_tool(tool):
+            return {
+                "Status": "Failed",
+                "Message": f"'{action_name}' is not an enabled marketplace action tool.",
+            }
+        if not targets:
+            return {"Status": "Failed", "Message": "No targets were given."}
+
+        limiter = get_rate_limiter(integration_of(tool))
+        semaphore = asyncio.Semaphore(max(1, min(max_concurrency, MAX_BULK_CONCURRENCY)))
+        shared_arguments = {
+            name: value
+            for name, value in (parameters or {}).items()
+            if name not in ACTION_TARGET_ARGUMENTS
+        }
+        shared_arguments["scope"] = scope
+
+        async def run_one(index: int, target: BulkActionTarget) -> Dict[str, Any]:
+            arguments = {
+                **shared_arguments,
+                "case_id": target.case_id,
+                "alert_group_identifiers": target.alert_group_identifiers,
+                "target_entities": [
+                    entity.model_dump() for entity in target.target_entities
+                ],
+            }
+            outcome = {"index": index, "case_id": target.case_id}
+            async with semaphore:
+                await limiter.acquire()
+                try:
+                    result = await tool.run(arguments)
+                except Exception as e:
+                    logger.debug("Bulk run %d of %s failed: %s", index, action_name, e)
+                    return {**outcome, "error": str(e)}
+            if _is_failure(result):
+                return {**outcome, "error": result}
+            return {**outcome, "result": result}
+
+        outcomes = await asyncio.gather(
+            *(run_one(index, target) for index, target in enumerate(targets))
+        )
+        failures = [outcome for outcome in outcomes if "error" in outcome]
+        return {
+            "action_name": action_name,
+            "total": len(outcomes),
+            "succeeded": len(outcomes) - len(failures),
+            "failed": len(failures),
+            "results": [outcome for outcome in outcomes if "result" in outcome],
+            "failures": failures,
+        }
@@ -0,0 +1,619 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Bulk export of cases, with their alerts, comments and events, to NDJSON.
+
+Every exported case is one line of gzip-compressed JSON:
+
+    {"case": {...}, "alerts": {...}, "comments": {...},
+     "alert_events": {"<alert id>": {...}}, "errors": [...]}
+
+Each page of the case list is written as its own gzip member, so the file
+is always a valid gzip stream of complete pages. After each page the file
+offset and the next page token are saved to a checkpoint file next to the
+output. An interrupted export resumes by truncating the output to the last
+checkpoint and continuing from its page token. Existing files are never
+overwritten unless asked to, and the `export_cases` tool only writes inside
+the export directory (SOAR_EXPORT_DIR).
+
+Run as a command with `python -m secops_soar_mcp.case_export --output cases.ndjson.gz`.
+"""
+
+import argparse
+import asyncio
+import gzip
+import os
+import sys
+from contextlib import aclosing
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated, Any, Dict, List, Optional
+
+from logger_utils import get_logger, setup_logging
+from mcp.server.fastmcp import FastMCP
+from pydantic import Field
+from secops_soar_mcp import bindings
+from secops_soar_mcp.case_management import (
+    MAX_FAN_OUT_CONCURRENCY,
+    case_matches,
+    case_update_time,
+    parse_time,
+)
+from secops_soar_mcp.codec import PydanticCodec
+from secops_soar_mcp.http_client import is_error_result
+from secops_soar_mcp.pagination import NEXT_PAGE_TOKEN, iter_pages
+from secops_soar_mcp.streaming import Projection
+from secops_soar_mcp.utils import consts
+from secops_soar_mcp.utils.consts import Endpoints
+
+logger = get_logger(__name__)
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+CHECKPOINT_VERSION = 1
+# Checkpoints are small and written rarely; a fixed codec keeps them readable
+# regardless of SOAR_JSON_CODEC.
+_checkpoint_codec = PydanticCodec()
+
+
+def checkpoint_path_for(output: Path) -> Path:
+    return output.with_name(output.name + CHECKPOINT_SUFFIX)
+
+
+def resolve_export_path(output_path: str) -> Path:
+    """Resolves a client-supplied output path inside the export directory.
+
+    Raises:
+        ValueError: If the path is absolute, contains '..' or resolves outside
+            the export directory, e.g. through a symlink.
+    """
+    relative = Path(output_path)
+    if not output_path or relative.is_absolute() or ".." in relative.parts:
+        raise ValueError(
+            f"Invalid output path '{output_path}'. Use a path relative to the "
+            f"export directory ({consts.ENV_SOAR_EXPORT_DIR}) without '..'."
+        )
+    export_dir = Path(
+        os.getenv(consts.ENV_SOAR_EXPORT_DIR, consts.DEFAULT_EXPORT_DIR)
+    ).resolve()
+    resolved = (export_dir / relative).resolve()
+    if resolved == export_dir or not resolved.is_relative_to(export_dir):
+        raise ValueError(
+            f"Invalid output path '{output_path}'. It must name a file inside "
+            f"the export directory {export_dir}."
+        )
+    return resolved
+
+
+def _load_checkpoint(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        checkpoint = _checkpoint_codec.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version in {path}")
+    return checkpoint
+
+
+def _save_checkpoint(path: Path, checkpoint: Dict[str, Any]):
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_bytes(_checkpoint_codec.dumps(checkpoint))
+    os.replace(temporary, path)
+
+
+class CaseExporter:
+    """Exports the cases of a time range with bounded request concurrency.
+
+    All requests of an export (case pages excepted) share one semaphore, so
+    at most `max_concurrency` alert, comment and event requests are in flight
+    no matter how many cases and alerts are being exported at once.
+    """
+
+    def __init__(
+        self,
+        output: Path,
+        updated_since: Optional[datetime] = None,
+        updated_until: Optional[datetime] = None,
+        status: Optional[List[str]] = None,
+        priority: Optional[List[str]] = None,
+        include_events: bool = True,
+        event_fields: Optional[List[str]] = None,
+        max_concurrency: int = 10,
+    ):
+        self.output = Path(output)
+        self.checkpoint_path = checkpoint_path_for(self.output)
+        self.updated_since = updated_since
+        self.updated_until = updated_until
+        self.status = status
+        self.priority = priority
+        self.include_events = include_events
+        self.event_projection = (
+            Projection(tuple(event_fields)) if event_fields else None
+        )
+        self.max_concurrency = max(1, min(max_concurrency, MAX_FAN_OUT_CONCURRENCY))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def filters(self) -> Dict[str, Any]:
+        """The export's filters, recorded in the checkpoint to validate resumes."""
+        return {
+            "updated_since": self.updated_since.isoformat()
+            if self.updated_since
+            else None,
+            "updated_until": self.updated_until.isoformat()
+            if self.updated_until
+            else None,
+            "status": self.status,
+            "priority": self.priority,
+            "include_events": self.include_events,
+            "event_fields": list(self.event_projection.fields)
+            if self.event_projection
+            else None,
+        }
+
+    def matches(self, case: dict) -> bool:
+        if not case_matches(case, self.status, self.priority, self.updated_since):
+            return False
+        if self.updated_until is not None:
+            updated = case_update_time(case)
+            if updated is None or updated >= self.updated_until:
+                return False
+        return True
+
+    async def run(
+        self,
+        resume: bool = True,
+        max_pages: Optional[int] = None,
+        overwrite: bool = False,
+    ) -> dict:
+        """Exports matching cases until the case list is exhausted.
+
+        Args:
+            resume: Continue from the checkpoint of an earlier export to the
+                same output. Otherwise the export starts over.
+            max_pages: Stop after this many pages of the case list; the
+                export can be continued later with `resume`.
+            overwrite: Replace an existing output when starting over.
+
+        Returns:
+            A summary with the counts of the whole export so far and whether
+            it is complete.
+
+        Raises:
+            ValueError: If the checkpoint does not match the export, or the
+                output exists and is neither resumed nor to be overwritten.
+        """
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        checkpoint = _load_checkpoint(self.checkpoint_path) if resume else None
+        if checkpoint is not None and checkpoint["filters"] != self.filters():
+            raise ValueError(
+                f"The checkpoint {self.checkpoint_path} belongs to an export with "
+                "other filters. Export to another file or start over without resume."
+            )
+        resuming = checkpoint is not None
+        if not resuming and not overwrite and self.output.exists():
+            raise ValueError(
+                f"{self.output} already exists. Export to another file, or "
+                "resume the export that wrote it."
+            )
+        if checkpoint is None:
+            checkpoint = {
+                "version": CHECKPOINT_VERSION,
+                "filters": self.filters(),
+                "page_token": None,
+                "offset": 0,
+                "pages": 0,
+                "cases_scanned": 0,
+                "cases_exported": 0,
+                "case_errors": 0,
+                "complete": False,
+            }
+            self.checkpoint_path.unlink(missing_ok=True)
+        elif checkpoint["complete"]:
+            return self._summary(checkpoint)
+
+        offset = checkpoint["offset"]
+        if offset and (
+            not self.output.exists() or self.output.stat().st_size < offset
+        ):
+            raise ValueError(
+                f"{self.output} is shorter than its checkpoint. "
+                "Start over without resume."
+            )
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        if resuming and self.output.exists():
+            mode = "r+b"
+        else:
+            # Exclusive creation, unless overwriting, never clobbers a file
+            # created since the check above.
+            mode = "wb" if overwrite else "xb"
+        with open(self.output, mode) as file:
+            # Drop whatever an interrupted run wrote after the last checkpoint.
+            file.truncate(offset)
+            file.seek(offset)
+            pages = 0
+            page_iterator = iter_pages(
+                bindings.http_client,
+                Endpoints.BASE_CASE_URL,
+                params={"$expand": "tags"},
+                page_token=checkpoint["page_token"],
+                max_pages=max_pages,
+            )
+            # Closing the pages on break cancels the prefetched page request.
+            async with aclosing(page_iterator):
+                async for page in page_iterator:
+                    if is_error_result(page):
+                        checkpoint["error"] = page
+                        break
+                    checkpoint.pop("error", None)
+                    cases = page.get("cases", [])
+                    exported, case_errors = await self._write_page(
+                        file, [case for case in cases if self.matches(case)]
+                    )
+                    pages += 1
+                    checkpoint["pages"] += 1
+                    checkpoint["cases_scanned"] += len(cases)
+                    checkpoint["cases_exported"] += exported
+                    checkpoint["case_errors"] += case_errors
+                    checkpoint["page_token"] = page.get(NEXT_PAGE_TOKEN)
+                    checkpoint["complete"] = not checkpoint["page_token"]
+                    checkpoint["offset"] = file.tell()
+                    _save_checkpoint(self.checkpoint_path, checkpoint)
+                    logger.info(
+                        "Exported page %d: %d of %d cases (%d in total)",
+                        checkpoint["pages"],
+                        exported,
+                        len(cases),
+                        checkpoint["cases_exported"],
+                    )
+                    if max_pages is not None and pages >= max_pages:
+                        break
+        return self._summary(checkpoint)
+
+    async def _write_page(self, file, cases: List[dict]) -> tuple:
+        """Exports the cases of one page as a gzip member, as each completes."""
+        if not cases:
+            return 0, 0
+        codec = bindings.http_client.codec
+        exported = case_errors = 0
+        with gzip.GzipFile(fileobj=file, mode="wb") as member:
+            for record in asyncio.as_completed(
+                [self._export_case(case) for case in cases]
+            ):
+                record = await record
+                member.write(codec.dumps(record) + b"\n")
+                exported += 1
+                case_errors += bool(record["errors"])
+        file.flush()
+        os.fsync(file.fileno())
+        return exported, case_errors
+
+    async def _get(self, endpoint: str, **kwargs) -> Any:
+        async with self._semaphore:
+            return await bindings.http_client.get(endpoint, **kwargs)
+
+    async def _get_all(self, endpoint: str, items_key: str, **kwargs) -> Any:
+        """Fetches every page of a list and returns the first page holding
+        the items of all pages, or the error result of a failed page."""
+        merged = None
+        params = None
+        while True:
+            page = await self._get(endpoint, params=params, **kwargs)
+            if is_error_result(page):
+                return page
+            if merged is None:
+                # Responses are shared with concurrent callers; never mutate them.
+                merged = {**page, items_key: list(page.get(items_key) or [])}
+            else:
+                merged[items_key].extend(page.get(items_key) or [])
+            token = page.get(NEXT_PAGE_TOKEN)
+            if not token:
+                merged.pop(NEXT_PAGE_TOKEN, None)
+                return merged
+            params = {"pageToken": token}
+
+    async def _export_case(self, case: dict) -> dict:
+        case_id = case.get("id")
+        record = {"case": case, "errors": []}
+        alerts, comments = await asyncio.gather(
+            self._get_all(
+                Endpoints.BASE_ALERT_URL.format(CASE_ID=case_id), "caseAlerts"
+            ),
+            self._get_all(
+                Endpoints.BASE_CASE_COMMENTS_URL.format(CASE_ID=case_id), "comments"
+            ),
+            return_exceptions=True,
+        )
+        for key, result in (("alerts", alerts), ("comments", comments)):
+            record[key] = self._collect(record, key, case_id, result)
+        if not self.include_events or not isinstance(record["alerts"], dict):
+            return record
+
+        alert_ids = [
+            str(alert["id"])
+            for alert in record["alerts"].get("caseAlerts") or []
+            if alert.get("id") is not None
+        ]
+        events = await asyncio.gather(
+            *(
+                self._get_all(
+                    Endpoints.LIST_INVOLVED_EVENTS_BY_ALERT.format(
+                        CASE_ID=case_id, ALERT_ID=alert_id
+                    ),
+                    "involvedEvents",
+                    projection=self.event_projection,
+                )
+                for alert_id in alert_ids
+            ),
+            return_exceptions=True,
+        )
+        record["alert_events"] = {}
+        for alert_id, result in zip(alert_ids, events):
+            result = self._collect(record, "alert_events", alert_id, result)
+            if result is not None:
+                record["alert_events"][alert_id] = result
+        return record
+
+    @staticmethod
+    def _collect(record: dict, key: str, request_id: Any, result: Any) -> Any:
+        """Returns a successful result, or records the failure and returns None."""
+        if isinstance(result, BaseException):
+            error = {"Status": "Failed", "Message": str(result)}
+        elif is_error_result(result):
+            error = result
+        else:
+            return result
+        record["errors"].append({"result": key, "id": request_id, "error": error})
+        return None
+
+    def _summary(self, checkpoint: Dict[str, Any]) -> dict:
+        summary = {
+            "output": str(self.output),
+            "checkpoint": str(self.checkpoint_path),
+            "complete": checkpoint["complete"],
+            "pages": checkpoint["pages"],
+            "cases_scanned": checkpoint["cases_scanned"],
+            "cases_exported": checkpoint["cases_exported"],
+            "cases_with_errors": checkpoint["case_errors"],
+        }
+        if "error" in checkpoint:
+            summary["error"] = checkpoint["error"]
+        return summary
+
+
+def _parse_range(updated_since: Optional[str], updated_until: Optional[str]):
+    parsed = []
+    for name, value in (
+        ("updated_since", updated_since),
+        ("updated_until", updated_until),
+    ):
+        timestamp = parse_time(value) if value else None
+        if value and timestamp is None:
+            raise ValueError(f"Invalid {name} '{value}'. Use an ISO-8601 timestamp.")
+        parsed.append(timestamp)
+    return parsed
+
+
+def register_tools(mcp: FastMCP):
+    @mcp.tool()
+    async def export_cases(
+        output_path: Annotated[
+            str,
+            Field(
+                ...,
+                description="File to write the gzip-compressed NDJSON to, relative to the server's export directory (e.g. 'cases-2025-05.ndjson.gz').",
+            ),
+        ],
+        updated_since: Annotated[
+            Optional[str],
+            Field(
+                default=None,
+                description="Only export cases updated at or after this ISO-8601 timestamp.",
+            ),
+        ],
+        updated_until: Annotated[
+            Optional[str],
+            Field(
+                default=None,
+                description="Only export cases updated before this ISO-8601 timestamp.",
+            ),
+        ],
+        status: Annotated[
+            Optional[List[str]],
+            Field(
+                default=None,
+                description="Only export cases with one of these statuses.",
+            ),
+        ],
+        priority: Annotated[
+            Optional[List[str]],
+            Field(
+                default=None,
+                description="Only export cases with one of these priorities.",
+            ),
+        ],
+        include_events: Annotated[
+            bool,
+            Field(
+                default=True,
+                description="Also export the involved events of every alert.",
+            ),
+        ],
+        event_fields: Annotated[
+            Optional[List[str]],
+            Field(
+                default=None,
+                description="Only export these dotted field paths of each event.",
+            ),
+        ],
+        max_concurrency: Annotated[
+            int,
+            Field(
+                default=10,
+                description=f"How many alert, comment and event requests may be in progress at once (at most {MAX_FAN_OUT_CONCURRENCY}).",
+            ),
+        ],
+        max_pages: Annotated[
+            Optional[int],
+            Field(
+                default=None,
+                description="Stop after this many pages of the case list. Call again to continue.",
+            ),
+        ],
+        resume: Annotated[
+            bool,
+            Field(
+                default=True,
+                description="Continue an earlier export to the same file from its checkpoint. Existing files are never overwritten.",
+            ),
+        ],
+    ) -> dict:
+        """Export every case of a time range, with its alerts, comments and events, to a file.
+
+        Pages through the whole case list and fetches the alerts, comments and involved events
+        of each matching case concurrently, writing one JSON line per case to a gzip-compressed
+        NDJSON file in the export directory of the server host (SOAR_EXPORT_DIR, 'exports'
+        by default). Progress is checkpointed after every page, so an export
+        that was interrupted or limited with `max_pages` continues where it stopped when called
+        again with the same arguments.
+
+        Args:
+            output_path (str): The file to write, relative to the export directory and without
+                               '..'. A checkpoint is kept beside it as '<output_path>.checkpoint'.
+            updated_since (Optional[str]): Keep cases updated at or after this time. (Example: "2025-05-01T00:00:00Z")
+            updated_until (Optional[str]): Keep cases updated before this time. (Example: "2025-06-01T00:00:00Z")
+            status (Optional[List[str]]): Statuses to keep. (Example: ["CLOSED"])
+            priority (Optional[List[str]]): Priorities to keep. (Example: ["PriorityHigh"])
+            include_events (bool): Export the involved events of every alert. Defaults to True.
+            event_fields (Optional[List[str]]): The dotted paths of the event fields to keep
+                                                (see `list_events_by_alert`).
+            max_concurrency (int): How many requests may be in progress at once.
+            max_pages (Optional[int]): Stop after this many case list pages.
+            resume (bool): Continue from the checkpoint. Set to False to start over, which
+                           fails if the file exists.
+
+        Returns:
+            dict: A summary of the export so far:
+                  - 'complete': Whether the whole case list was exported.
+                  - 'pages' / 'cases_scanned' / 'cases_exported': Progress counts.
+                  - 'cases_with_errors': Exported cases for which some request failed; the
+                    failures are in the 'errors' field of their line.
+                  - 'error': Present if a case list page could not be fetched. Call again to retry.
+
+        **Workflow Integration:**
+        - Use for retrospectives or offline analysis of many cases instead of calling
+          `get_case_full_details` case by case.
+        """
+        try:
+            since, until = _parse_range(updated_since, updated_until)
+            exporter = CaseExporter(
+                resolve_export_path(output_path),
+                updated_since=since,
+                updated_until=until,
+                status=status,
+                priority=priority,
+                include_events=include_events,
+                event_fields=event_fields,
+                max_concurrency=max_concurrency,
+            )
+            return await exporter.run(resume=resume, max_pages=max_pages)
+        except (OSError, ValueError) as e:
+            return {"Status": "Failed", "Message": str(e)}
+
+
+async def _run_export(args: argparse.Namespace) -> dict:
+    since, until = _parse_range(args.since, args.until)
+    exporter = CaseExporter(
+        args.output,
+        updated_since=since,
+        updated_until=until,
+        status=args.status,
+        priority=args.priority,
+        include_events=not args.no_events,
+        event_fields=args.event_fields,
+        max_concurrency=args.max_concurrency,
+    )
+    await bindings.bind()
+    try:
+        return await exporter.run(
+            resume=not args.restart, max_pages=args.max_pages, overwrite=args.restart
+        )
+    finally:
+        await bindings.cleanup()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Exports SOAR cases to gzip-compressed NDJSON."""
+    export_parser = argparse.ArgumentParser(
+        description="Export SOAR cases with their alerts, comments and events"
+    )
+    export_parser.add_argument(
+        "--output", type=Path, required=True, help="The .ndjson.gz file to write"
+    )
+    export_parser.add_argument(
+        "--since", help="Export cases updated at or after this ISO-8601 time"
+    )
+    export_parser.add_argument(
+        "--until", help="Export cases updated before this ISO-8601 time"
+    )
+    export_parser.add_argument(
+        "--status", action="append", help="Case status to export; repeatable"
+    )
+    export_parser.add_argument(
+        "--priority", action="append", help="Case priority to export; repeatable"
+    )
+    export_parser.add_argument(
+        "--no-events", action="store_true", help="Do not export involved events"
+    )
+    export_parser.add_argument(
+        "--event-fields",
+        type=lambda value: [field for field in value.split(",") if field],
+        help="Comma-separated dotted event field paths to keep",
+    )
+    export_parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=10,
+        help=f"Requests in progress at once (at most {MAX_FAN_OUT_CONCURRENCY})",
+    )
+    export_parser.add_argument(
+        "--max-pages", type=int, help="Stop after this many case list pages"
+    )
+    export_parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the checkpoint and overwrite the output",
+    )
+    export_parser.add_argument(
+        "--verbose", action="store_true", help="Enable verbose (debug) logging"
+    )
+    args = export_parser.parse_args(argv)
+    setup_logging(args.verbose)
+
+    try:
+        summary = asyncio.run(_run_export(args))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    print(
+        f"Exported {summary['cases_exported']} of {summary['cases_scanned']} cases "
+        f"from {summary['pages']} pages to {summary['output']}"
+    )
+    if "error" in summary:
+        print(f"Stopped at a failed page: {summary['error']}", file=sys.stderr)
+        return 1
+    if not summary["complete"]:
+        print("The export is incomplete; run the command again to continue.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,17 +12,171 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import asyncio
+import re
+from contextlib import aclosing
+from datetime import datetime, timezone
 from secops_soar_mcp import bindings
 from mcp.server.fastmcp import FastMCP
+from secops_soar_mcp.http_client import is_error_result
+from secops_soar_mcp.pagination import NEXT_PAGE_TOKEN, iter_pages
+from secops_soar_mcp.response_cache import CASES_TAG, case_tag
+from secops_soar_mcp.streaming import Projection
 from secops_soar_mcp.utils.consts import Endpoints
 from secops_soar_mcp.utils.models import CasePriority
 from logger_utils import get_logger
-from typing import Annotated, Optional, List
+from typing import Annotated, Any, Optional, List
 from pydantic import Field
 from secops_soar_mcp.utils.pydantic_list_field import PydanticListField
 
 logger = get_logger(__name__)
 
+# Case fields that may hold the last update time, in order of preference.
+CASE_UPDATE_TIME_FIELDS = (
+    "updateTime",
+    "lastModifiedTime",
+    "modificationTimeUnixTimeInMs",
+    "updateTimeUnixTimeInMs",
+)
+MAX_FAN_OUT_CONCURRENCY = 50
+
+
+def _normalize_enum(value: Any, prefix: str) -> str:
+    """Normalizes values such as 'PRIORITY_HIGH', 'PriorityHigh' or 'high'."""
+    normalized = re.sub(r"[^a-z0-9]", "", str(value).lower())
+    return normalized.removeprefix(prefix)
+
+
+def _matches_enum(case_value: Any, wanted: List[str], prefix: str) -> bool:
+    if case_value is None:
+        return False
+    normalized = _normalize_enum(case_value, prefix)
+    return any(normalized.startswith(_normalize_enum(w, prefix)) for w in wanted)
+
+
+def parse_time(value: Any) -> Optional[datetime]:
+    """Parses an ISO-8601 string or a Unix timestamp in seconds or milliseconds."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            try:
+                parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            except ValueError:
+                return None
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed
+    if isinstance(value, (int, float)):
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, tz=timezone.utc)
+    return None
+
+
+def case_update_time(case: dict) -> Optional[datetime]:
+    """Returns when a case was last updated, if it records it."""
+    for field in CASE_UPDATE_TIME_FIELDS:
+        parsed = parse_time(case.get(field))
+        if parsed is not None:
+            return parsed
+    return None
+
+
+def case_matches(
+    case: dict,
+    status: Optional[List[str]],
+    priority: Optional[List[str]],
+    updated_since: Optional[datetime],
+) -> bool:
+    """Returns whether a case has one of the statuses and priorities, when
+    given, and was updated at or after `updated_since`."""
+    if status and not _matches_enum(case.get("status"), status, "status"):
+        return False
+    if priority and not _matches_enum(case.get("priority"), priority, "priority"):
+        return False
+    if updated_since is not None:
+        updated = case_update_time(case)
+        if updated is None or updated < updated_since:
+            return False
+    return True
+
+
+async def _fan_out_alerts(
+    case_id: str,
+    case_alerts: Any,
+    max_concurrency: int,
+    deadline: float,
+    event_projection: Optional[Projection] = None,
+) -> dict:
+    """Fetches the involved events of every alert and the entities of every alert group.
+
+    Calls run concurrently, at most `max_concurrency` at a time. Calls still
+    running after `deadline` seconds are cancelled. Failed and cancelled calls
+    are reported in 'errors' and the remaining results are returned as is.
+    """
+    alerts = []
+    if isinstance(case_alerts, dict) and not is_error_result(case_alerts):
+        alerts = case_alerts.get("caseAlerts") or []
+    semaphore = asyncio.Semaphore(max_concurrency)
+    cache_tags = [case_tag(case_id)]
+
+    async def limited(request):
+        async with semaphore:
+            return await request()
+
+    def events_request(alert_id):
+        return lambda: bindings.http_client.get(
+            Endpoints.LIST_INVOLVED_EVENTS_BY_ALERT.format(
+                CASE_ID=case_id, ALERT_ID=alert_id
+            ),
+            cache_tags=cache_tags,
+            projection=event_projection,
+        )
+
+    def entities_request(group):
+        return lambda: bindings.http_client.post(
+            Endpoints.GET_ALERT_GROUP_IDENTIFIERS_ENTITIES,
+            req={"caseId": case_id, "alertGroupIdentifiers": [group]},
+            retry=True,
+        )
+
+    # Maps each task to the result key it fills and the ID it was made for.
+    jobs = {}
+    groups = []
+    for alert in alerts:
+        alert_id = alert.get("id")
+        if alert_id is not None:
+            task = asyncio.ensure_future(limited(events_request(alert_id)))
+            jobs[task] = ("alert_events", str(alert_id))
+        group = alert.get("alertGroupIdentifier")
+        if group and group not in groups:
+            groups.append(group)
+    for group in groups:
+        task = asyncio.ensure_future(limited(entities_request(group)))
+        jobs[task] = ("alert_group_entities", group)
+
+    pending = set()
+    if jobs:
+        _, pending = await asyncio.wait(jobs, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    result = {"alert_events": {}, "alert_group_entities": {}, "errors": []}
+    for task, (result_key, key) in jobs.items():
+        if task in pending:
+            error = {"Status": "Failed", "Message": f"Timed out after {deadline}s."}
+        elif task.exception() is not None:
+            error = {"Status": "Failed", "Message": str(task.exception())}
+        elif is_error_result(task.result()):
+            error = task.result()
+        else:
+            result[result_key][key] = task.result()
+            continue
+        result["errors"].append({"result": result_key, "id": key, "error": error})
+    return result
+
 
 def register_tools(mcp: FastMCP):
     @mcp.tool()
@@ -63,8 +217,126 @@ def register_tools(mcp: FastMCP):
             return await bindings.http_client.get(
                 Endpoints.BASE_CASE_URL,
                 params={"$expand": "tags", "pageToken": next_page_token},
+                cache_tags=[CASES_TAG],
             )
-        return await bindings.http_client.get(Endpoints.BASE_CASE_URL)
+        return await bindings.http_client.get(
+            Endpoints.BASE_CASE_URL, cache_tags=[CASES_TAG]
+        )
+
+    @mcp.tool()
+    async def search_cases(
+        status: Annotated[
+            Optional[List[str]],
+            Field(
+                default=None,
+                description="Only return cases with one of these statuses (e.g. 'OPENED', 'CLOSED').",
+            ),
+        ],
+        priority: Annotated[
+            Optional[List[str]],
+            Field(
+                default=None,
+                description="Only return cases with one of these priorities (e.g. 'PriorityHigh', 'PriorityCritical').",
+            ),
+        ],
+        updated_since: Annotated[
+            Optional[str],
+            Field(
+                default=None,
+                description="Only return cases updated at or after this ISO-8601 timestamp (e.g. '2025-05-01T00:00:00Z').",
+            ),
+        ],
+        max_results: Annotated[
+            int,
+            Field(
+                default=50,
+                description="Stop paging once at least this many matching cases were found.",
+            ),
+        ],
+        max_pages: Annotated[
+            int,
+            Field(
+                default=50,
+                description="The maximum number of result pages to scan.",
+            ),
+        ],
+        page_token: Annotated[
+            Optional[str],
+            Field(
+                default=None,
+                description="The next_page_token of a previous search_cases call, to continue scanning.",
+            ),
+        ],
+    ) -> dict:
+        """Search the SOAR case queue across pages, filtering by status, priority and update time.
+
+        Unlike `list_cases`, which returns a single page, this tool walks the case list
+        server-side in one call. Each next page is fetched while the current one is being
+        filtered, and scanning stops as soon as `max_results` matches were found or
+        `max_pages` pages were scanned. Status and priority match case-insensitively and
+        ignore separators, so 'high', 'PriorityHigh' and 'PRIORITY_HIGH' are equivalent.
+
+        Args:
+            status (Optional[List[str]]): Statuses to keep. (Example: ["OPENED"])
+            priority (Optional[List[str]]): Priorities to keep. (Example: ["PriorityHigh", "PriorityCritical"])
+            updated_since (Optional[str]): Keep cases updated at or after this time. (Example: "2025-05-01T00:00:00Z")
+            max_results (int): Stop once at least this many cases matched. The rest of the page
+                               being scanned is still included, so the result can exceed it slightly.
+            max_pages (int): The maximum number of pages to scan.
+            page_token (Optional[str]): Resume scanning from a previous call's `next_page_token`.
+
+        Returns:
+            dict: A compact summary of the scan:
+                  - 'cases': The matching case objects, as returned by the SOAR platform.
+                  - 'matched_count': The number of matching cases.
+                  - 'cases_scanned' / 'pages_scanned': How much of the queue was examined.
+                  - 'next_page_token': Pass back as `page_token` to continue scanning, or null if the queue was exhausted.
+                  - 'error': Present if a page could not be fetched; the other fields hold the partial result.
+
+        **Workflow Integration:**
+        - Use instead of repeated `list_cases` calls when looking for cases that match criteria across a large queue.
+
+        **Next Steps (using MCP-enabled tools):**
+        - Use `get_case_full_details` on the returned `case_id` values to start the investigation.
+        """
+        since = parse_time(updated_since) if updated_since else None
+        if updated_since and since is None:
+            return {
+                "Status": "Failed",
+                "Message": f"Invalid updated_since '{updated_since}'. Use an ISO-8601 timestamp.",
+            }
+        result = {
+            "cases": [],
+            "matched_count": 0,
+            "cases_scanned": 0,
+            "pages_scanned": 0,
+            "next_page_token": None,
+        }
+        page_iterator = iter_pages(
+            bindings.http_client,
+            Endpoints.BASE_CASE_URL,
+            params={"$expand": "tags"},
+            page_token=page_token,
+            max_pages=max(1, max_pages),
+            cache_tags=[CASES_TAG],
+        )
+        # Closing the pages on break cancels the prefetched page request.
+        async with aclosing(page_iterator):
+            async for page in page_iterator:
+                if is_error_result(page):
+                    result["error"] = page
+                    break
+                result["pages_scanned"] += 1
+                cases = page.get("cases", [])
+                result["cases_scanned"] += len(cases)
+                result["cases"].extend(
+                    case for case in cases if case_matches(case, status, priority, since)
+                )
+                result["next_page_token"] = page.get(NEXT_PAGE_TOKEN)
+                if len(result["cases"]) >= max_results:
+                    break
+        result["matched_count"] = len(result["cases"])
+        return result
 
     @mcp.tool()
     async def post_case_comment(
@@ -100,10 +372,12 @@ def register_tools(mcp: FastMCP):
         - Use comments to justify changes in case priority (using a case priority tool) or status.
         - Share key comments or findings with other relevant systems if needed (e.g., ticketing, reporting).
         """
-        return await bindings.http_client.post(
+        response = await bindings.http_client.post(
             Endpoints.BASE_CASE_COMMENTS_URL.format(CASE_ID=case_id),
             req={"Comment": comment},
         )
+        bindings.http_client.invalidate(case_tag(case_id))
+        return response
 
     @mcp.tool()
     async def list_alerts_by_case(
@@ -150,9 +424,11 @@ def register_tools(mcp: FastMCP):
             return await bindings.http_client.get(
                 Endpoints.BASE_ALERT_URL.format(CASE_ID=case_id),
                 params={"pageToken": next_page_token},
+                cache_tags=[case_tag(case_id)],
             )
         return await bindings.http_client.get(
-            Endpoints.BASE_ALERT_URL.format(CASE_ID=case_id)
+            Endpoints.BASE_ALERT_URL.format(CASE_ID=case_id),
+            cache_tags=[case_tag(case_id)],
         )
 
     @mcp.tool()
@@ -198,9 +474,11 @@ def register_tools(mcp: FastMCP):
             return await bindings.http_client.get(
                 Endpoints.LIST_ALERT_GROUP_IDENTIFIERS_BY_CASE.format(CASE_ID=case_id),
                 params={"pageToken": next_page_token},
+                cache_tags=[case_tag(case_id)],
             )
         return await bindings.http_client.get(
-            Endpoints.LIST_ALERT_GROUP_IDENTIFIERS_BY_CASE.format(CASE_ID=case_id)
+            Endpoints.LIST_ALERT_GROUP_IDENTIFIERS_BY_CASE.format(CASE_ID=case_id),
+            cache_tags=[case_tag(case_id)],
         )
 
     @mcp.tool()
@@ -214,6 +492,13 @@ def register_tools(mcp: FastMCP):
                 description="The nextPageToken to fetch the next page of results.",
             ),
         ],
+        fields: Annotated[
+            Optional[List[str]],
+            Field(
+                default=None,
+                description="Only return these dotted field paths of each event (e.g. 'event.principal.ip').",
+            ),
+        ],
     ):
         """List the underlying security events associated with a specific alert within a given case.
 
@@ -226,11 +511,15 @@ def register_tools(mcp: FastMCP):
             case_id (str): The unique identifier (ID) of the case containing the alert. (Example: "523")
             alert_id (str): The unique identifier (ID) of the specific alert whose
                             associated events are to be listed. (Example: "751")
+            fields (Optional[List[str]]): Dotted paths of the event fields to keep. Raw events
+                                          can be very large; selecting fields decodes the response
+                                          incrementally and drops everything else.
+                                          (Example: ["event.metadata.eventType", "event.principal.ip"])
 
         Returns:
             dict: A dictionary representing the raw API response from the SOAR platform,
                   typically containing a list of event objects (potentially in UDM format)
-                  related to the specified alert.
+                  related to the specified alert, reduced to `fields` if given.
 
         **Workflow Integration:**
         - Use after identifying a specific alert of interest within a SOAR case (e.g., via `list_alerts_by_case`).
@@ -245,17 +534,22 @@ def register_tools(mcp: FastMCP):
         - Correlate event details with other related events using SIEM event search tools.
         - Document findings in the relevant case management system using a commenting tool.
         """
+        projection = Projection(tuple(fields)) if fields else None
         if next_page_token:
             return await bindings.http_client.get(
                 Endpoints.LIST_INVOLVED_EVENTS_BY_ALERT.format(
                     CASE_ID=case_id, ALERT_ID=alert_id
                 ),
                 params={"pageToken": next_page_token},
+                cache_tags=[case_tag(case_id)],
+                projection=projection,
             )
         return await bindings.http_client.get(
             Endpoints.LIST_INVOLVED_EVENTS_BY_ALERT.format(
                 CASE_ID=case_id, ALERT_ID=alert_id
-            )
+            ),
+            cache_tags=[case_tag(case_id)],
+            projection=projection,
         )
 
     @mcp.tool()
@@ -307,10 +601,13 @@ def register_tools(mcp: FastMCP):
         - Document the reason for the priority change using a case commenting tool.
         - Adjust investigation efforts based on the new priority level.
         """
-        return await bindings.http_client.patch(
+        response = await bindings.http_client.patch(
             Endpoints.BASE_SPECIFIC_CASE_URL.format(CASE_ID=case_id),
             req={"Priority": case_priority},
+            retry=True,
         )
+        bindings.http_client.invalidate(case_tag(case_id), CASES_TAG)
+        return response
 
     @mcp.tool()
     async def get_entities_by_alert_group_identifiers(
@@ -354,6 +651,7 @@ def register_tools(mcp: FastMCP):
         return await bindings.http_client.post(
             Endpoints.GET_ALERT_GROUP_IDENTIFIERS_ENTITIES,
             req={"caseId": case_id, "alertGroupIdentifiers": alert_group_identifiers},
+            retry=True,
         )
 
     @mcp.tool()
@@ -407,6 +705,7 @@ def register_tools(mcp: FastMCP):
                 "LastCaseType": 0,
                 "CaseDistributionType": 0,
             },
+            retry=True,
         )
 
     @mcp.tool()
@@ -507,11 +806,40 @@ def register_tools(mcp: FastMCP):
                 "NetworkName": network_name,
                 "EnvironmentName": environment_name,
             },
+            retry=True,
         )
 
     @mcp.tool()
     async def get_case_full_details(
         case_id: Annotated[str, Field(..., description="The ID of the case.")],
+        deep: Annotated[
+            bool,
+            Field(
+                default=False,
+                description="Also fetch the involved events of every alert and the entities of every alert group.",
+            ),
+        ],
+        max_concurrency: Annotated[
+            int,
+            Field(
+                default=10,
+                description=f"How many deep requests may be in progress at once (at most {MAX_FAN_OUT_CONCURRENCY}).",
+            ),
+        ],
+        deadline_seconds: Annotated[
+            float,
+            Field(
+                default=30.0,
+                description="Seconds to wait for the deep requests before returning what has arrived.",
+            ),
+        ],
+        event_fields: Annotated[
+            Optional[List[str]],
+            Field(
+                default=None,
+                description="In deep mode, only return these dotted field paths of each event.",
+            ),
+        ],
     ):
         """Retrieve comprehensive details for a specific case by aggregating its core information, associated alerts, and comments.
 
@@ -521,15 +849,31 @@ def register_tools(mcp: FastMCP):
         for getting a complete understanding of an incident's context, scope, investigation
         progress, and collaborative notes without making multiple separate API calls.
 
+        With `deep` enabled, the tool also fetches the involved events of every alert and
+        the entities of every alert group concurrently, so a whole case can be triaged in
+        one call instead of one `list_events_by_alert` and `get_entities_by_alert_group_identifiers`
+        call per alert.
+
         Args:
             case_id (str): The unique identifier (ID) of the case for which full details
                            are required. (Example: "523")
+            deep (bool): Also fetch events and entities for every alert. Defaults to False.
+            max_concurrency (int): How many deep requests may be in progress at once.
+            deadline_seconds (float): Seconds to wait for the deep requests. Requests still
+                                      running at the deadline are cancelled and reported in 'errors'.
+            event_fields (Optional[List[str]]): In deep mode, the dotted paths of the event fields
+                                                to keep (see `list_events_by_alert`).
 
         Returns:
             dict: A dictionary containing the aggregated results from three separate API calls:
                   - 'case_details': The raw API response for the basic case information.
                   - 'case_alerts': The raw API response containing the list of alerts associated with the case.
                   - 'case_comments': The raw API response containing the list of comments for the case.
+                  With `deep` enabled, it also contains:
+                  - 'alert_events': The first page of involved events, keyed by alert ID.
+                  - 'alert_group_entities': The involved entities, keyed by alert group identifier.
+                  - 'errors': The deep requests that failed or timed out. Results of the other
+                    requests are still returned.
                   **Triage Note:** Use the `priority` field as an initial guide only. Analyze the combined details (alerts, comments, entities involved, potential impact, related threat intelligence) gathered by this tool and others to determine the true importance and urgency of the case.
 
         **Workflow Integration:**
@@ -546,18 +890,32 @@ def register_tools(mcp: FastMCP):
         - Document investigation progress using a case commenting tool.
         - Consider adjusting case priority using a priority management tool based on findings.
         """
+        cache_tags = [case_tag(case_id)]
         case_coro = bindings.http_client.get(
-            Endpoints.BASE_SPECIFIC_CASE_URL.format(CASE_ID=case_id)
+            Endpoints.BASE_SPECIFIC_CASE_URL.format(CASE_ID=case_id),
+            cache_tags=cache_tags,
         )
         case_alerts_coro = bindings.http_client.get(
-            Endpoints.BASE_ALERT_URL.format(CASE_ID=case_id)
+            Endpoints.BASE_ALERT_URL.format(CASE_ID=case_id), cache_tags=cache_tags
         )
         case_comments_coro = bindings.http_client.get(
-            Endpoints.BASE_CASE_COMMENTS_URL.format(CASE_ID=case_id)
+            Endpoints.BASE_CASE_COMMENTS_URL.format(CASE_ID=case_id),
+            cache_tags=cache_tags,
         )
         results = await asyncio.gather(case_coro, case_alerts_coro, case_comments_coro)
-        return {
+        details = {
             "case_details:": results[0],
             "case_alerts": results[1],
             "case_comments": results[2],
         }
+        if deep:
+            details.update(
+                await _fan_out_alerts(
+                    case_id,
+                    results[1],
+                    max(1, min(max_concurrency, MAX_FAN_OUT_CONCURRENCY)),
+                    deadline_seconds,
+                    Projection(tuple(event_fields)) if event_fields else None,
+                )
+            )
+        return details
@@ -0,0 +1,138 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Per-integration circuit breakers for marketplace actions."""
+
+import time
+from typing import Any, Dict, Optional
+
+from logger_utils import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops calling an integration after repeated failures.
+
+    The breaker opens after `failure_threshold` consecutive failures and
+    rejects calls for `reset_timeout` seconds. It then lets up to
+    `half_open_max_calls` probe calls through: a successful probe closes it
+    again, a failed one reopens it.
+    """
+
+    def __init__(
+        self, failure_threshold: int, reset_timeout: float, half_open_max_calls: int = 1
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self.consecutive_failures = 0
+        self.failures = 0
+        self.successes = 0
+        self.rejected = 0
+        self.last_failure: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self.retry_after() == 0:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def retry_after(self) -> float:
+        """Returns the seconds until an open breaker lets a probe through."""
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Returns whether a call may proceed. Every allowed call must be
+        followed by `record_success`, `record_failure` or `release`."""
+        if not self.enabled:
+            return True
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.successes += 1
+        self.consecutive_failures = 0
+        if self._state == HALF_OPEN:
+            logger.info("Circuit closed after a successful probe")
+            self._state = CLOSED
+            self._probes = 0
+
+    def record_failure(self, reason: str):
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_failure = reason
+        if not self.enabled:
+            return
+        if self._state == HALF_OPEN or (
+            self._state == CLOSED
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+            self._probes = 0
+
+    def release(self):
+        """Ends an allowed call whose outcome says nothing about the integration."""
+        if self._state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_after_seconds": round(self.retry_after(), 1),
+            "failures": self.failures,
+            "successes": self.successes,
+            "rejected": self.rejected,
+            "last_failure": self.last_failure,
+        }
+
+
+class CircuitBreakers:
+    """The circuit breakers of all integrations, created on first use."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, integration_name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(integration_name)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            self._breakers[integration_name] = breaker
+        return breaker
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {name: breaker.status() for name, breaker in self._breakers.items()}
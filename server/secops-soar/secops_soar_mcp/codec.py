@@ -0,0 +1,111 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""JSON codecs used for SOAR request and response bodies.
+
+A codec turns request bodies (dicts or pydantic models) into bytes and
+response bodies back into Python objects. The pydantic codec uses
+pydantic-core, which is always installed with the server. The orjson codec
+is used when the optional `orjson` package is installed.
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+import pydantic_core
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+AUTO = "auto"
+
+
+class StdlibCodec:
+    """Codec based on the standard library `json` module."""
+
+    name = "stdlib"
+
+    def dumps(self, value: Any) -> bytes:
+        if isinstance(value, BaseModel):
+            value = value.model_dump()
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class PydanticCodec:
+    """Codec serializing pydantic models straight to bytes with pydantic-core."""
+
+    name = "pydantic"
+
+    def dumps(self, value: Any) -> bytes:
+        if isinstance(value, BaseModel):
+            return value.__pydantic_serializer__.to_json(value)
+        return pydantic_core.to_json(value)
+
+    def loads(self, data: bytes) -> Any:
+        return pydantic_core.from_json(data)
+
+
+class OrjsonCodec:
+    """Codec based on the optional `orjson` package."""
+
+    name = "orjson"
+
+    def dumps(self, value: Any) -> bytes:
+        if isinstance(value, BaseModel):
+            # Nested models and other pydantic types are left to pydantic-core.
+            return value.__pydantic_serializer__.to_json(value)
+        return orjson.dumps(value, default=_orjson_default)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+CODECS: Dict[str, type] = {
+    StdlibCodec.name: StdlibCodec,
+    PydanticCodec.name: PydanticCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+
+def get_codec(name: Optional[str] = AUTO):
+    """Returns a codec by name.
+
+    Args:
+        name: 'stdlib', 'pydantic', 'orjson' or 'auto' (or None), which picks
+            orjson when it is installed and pydantic otherwise.
+
+    Raises:
+        ValueError: If the codec is unknown or its package is not installed.
+    """
+    name = (name or AUTO).lower()
+    if name == AUTO:
+        name = OrjsonCodec.name if orjson is not None else PydanticCodec.name
+    if name not in CODECS:
+        raise ValueError(
+            f"Unknown JSON codec '{name}'. Use one of: {', '.join([AUTO, *CODECS])}"
+        )
+    if name == OrjsonCodec.name and orjson is None:
+        raise ValueError("The orjson JSON codec requires the 'orjson' package.")
+    return CODECS[name]()
@@ -0,0 +1,140 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tools that report on the health of the SOAR MCP server itself."""
+
+from secops_soar_mcp import bindings
+from mcp.server.fastmcp import FastMCP
+from logger_utils import get_logger
+from pydantic import Field
+from typing import Annotated, Optional
+
+logger = get_logger(__name__)
+
+
+def register_tools(mcp: FastMCP):
+    @mcp.tool()
+    async def get_server_diagnostics() -> dict:
+        """Report runtime statistics of this SOAR MCP server.
+
+        Useful for operators tuning the server, or for agents deciding whether slow
+        responses come from the SOAR platform or from this server.
+
+        Returns:
+            dict: A dictionary with the following sections:
+                  - 'http_pool': Connection pool limits and usage counters, including how
+                    many requests had to wait for a free connection (`queued_requests`)
+                    and for how long, and how many GETs were served by an identical request
+                    already in flight (`coalesced_gets`).
+                  - 'response_cache': Size, hit rate, evictions, expirations and
+                    invalidations of the short-lived cache for case, alert and comment reads.
+        """
+        return {
+            "http_pool": bindings.http_client.stats(),
+            "response_cache": bindings.http_client.response_cache.stats(),
+        }
+
+    @mcp.tool()
+    async def get_integration_health(
+        integration_name: Annotated[
+            Optional[str],
+            Field(
+                default=None,
+                description="The integration to report on (e.g. 'VirusTotalV3'). Reports all integrations if omitted.",
+            ),
+        ],
+    ) -> dict:
+        """Report the circuit breaker state of marketplace integrations.
+
+        Every integration used by a marketplace action has a circuit breaker. After repeated
+        failures or timeouts of an integration, its breaker opens and further actions of that
+        integration fail immediately instead of waiting on the unavailable vendor. After a
+        cool-down, a single probe action is let through (`half_open`); if it succeeds the
+        breaker closes again.
+
+        Args:
+            integration_name (Optional[str]): The integration to report on, as used by SOAR.
+                                              (Example: "VirusTotalV3")
+
+        Returns:
+            dict: A dictionary with:
+                  - 'integrations': The breaker of each integration that has run actions, with
+                    its `state` ('closed', 'open' or 'half_open'), `consecutive_failures`,
+                    `retry_after_seconds` until a probe is allowed, counters and `last_failure`.
+                  - 'unavailable': The integrations whose breaker is currently open.
+
+        **Workflow Integration:**
+        - Check before running marketplace actions (especially bulk actions) to route around
+          integrations that are currently failing, e.g. by using another enrichment source.
+        """
+        integrations = await bindings.circuit_breaker_status()
+        if integration_name is not None:
+            integrations = {
+                name: status
+                for name, status in integrations.items()
+                if name == integration_name
+            }
+        return {
+            "integrations": integrations,
+            "unavailable": sorted(
+                name
+                for name, status in integrations.items()
+                if status["state"] == "open"
+            ),
+        }
+
+    @mcp.tool()
+    async def get_request_metrics(
+        endpoint: Annotated[
+            Optional[str],
+            Field(
+                default=None,
+                description="Only report SOAR endpoints whose template contains this text (e.g. 'involvedEvents').",
+            ),
+        ],
+        integration: Annotated[
+            Optional[str],
+            Field(
+                default=None,
+                description="Only report requests made by actions of this integration (e.g. 'VirusTotalV3'). Use '' for requests not made by an action.",
+            ),
+        ],
+    ) -> dict:
+        """Report latency, status and size metrics of SOAR requests and of tool calls.
+
+        Requests are grouped by method, endpoint template and the integration whose action
+        made them. For each group, `time_to_headers` is how long SOAR took to start
+        responding, while `duration` also includes reading and decoding the response.
+        Comparing them with the tool call durations tells whether slow tools wait on SOAR
+        or spend their time in this server. Latency percentiles are estimated from
+        histogram buckets.
+
+        Args:
+            endpoint (Optional[str]): Text the endpoint template must contain. (Example: "cases")
+            integration (Optional[str]): The integration to report on. (Example: "VirusTotalV3")
+
+        Returns:
+            dict: A dictionary with:
+                  - 'requests': One entry per method, endpoint template and integration with
+                    the number of request attempts, `errors`, counts by status, requests
+                    `in_flight`, `time_to_headers` and `duration` latency summaries
+                    (count, mean and p50/p95/p99 in milliseconds) and bytes sent and received.
+                  - 'tools': For each tool called so far, its calls, failures, calls in flight
+                    and duration summary.
+                  - 'uptime_seconds': How long the metrics have been collected.
+
+        **Workflow Integration:**
+        - Use when tools are slow or failing, to find the endpoints or integrations responsible.
+        """
+        metrics = await bindings.request_metrics()
+        return metrics.summary(endpoint, integration)
@@ -13,28 +13,299 @@
 # limitations under the License.
 """HTTP client for making requests to the SecOps SOAR API."""
 
+import asyncio
+import email.utils
 import json
-from typing import Any, Dict
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Union
 
 import aiohttp
 from logger_utils import get_logger
+from pydantic import BaseModel
+from secops_soar_mcp.codec import get_codec
+from secops_soar_mcp.metrics import Metrics
+from secops_soar_mcp.response_cache import ResponseCache
+from secops_soar_mcp.streaming import CHUNK_SIZE, Projection, decode_projected
+from secops_soar_mcp.utils import consts
 
 logger = get_logger(__name__)
 
+# Status codes worth retrying for requests that are safe to repeat. 429 is
+# retried for every request because SOAR did not process it.
+RETRYABLE_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+def error_result(
+    endpoint: str,
+    status_code: Optional[int],
+    message: str,
+    retryable: bool,
+    attempts: int,
+    retry_after: Optional[float] = None,
+    transient: bool = False,
+) -> Dict[str, Any]:
+    """Builds the result returned to tools when a request fails.
+
+    `transient` marks failures caused by an unavailable or overloaded
+    service (timeouts, connection errors, 429 and 5xx responses), as opposed
+    to requests SOAR rejected.
+    """
+    error = {
+        "Endpoint": endpoint,
+        "StatusCode": status_code,
+        "Retryable": retryable,
+        "Transient": transient,
+        "Attempts": attempts,
+    }
+    if retry_after is not None:
+        error["RetryAfterSeconds"] = retry_after
+    return {
+        "Status": "Failed",
+        "Message": f"SOAR request failed: {message}",
+        "Error": error,
+    }
+
+
+def is_error_result(response: Any) -> bool:
+    """Returns whether a response returned by HttpClient is a failure."""
+    return (
+        isinstance(response, dict)
+        and response.get("Status") == "Failed"
+        and "Error" in response
+    )
+
+
+def is_transient_error(response: Any) -> bool:
+    """Returns whether a response is a failure caused by an unavailable service."""
+    return is_error_result(response) and bool(response["Error"].get("Transient"))
+
+
+def request_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Returns a key identifying a request by endpoint and query parameters."""
+    if not params:
+        return endpoint
+    return endpoint + "?" + json.dumps(params, sort_keys=True, default=str)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _env_float(name: str, default: Optional[float]) -> Optional[float]:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    value = float(value)
+    # Zero or a negative value disables the limit.
+    return value if value > 0 else None
+
+
+@dataclass
+class HttpClientConfig:
+    """Connection pool and timeout settings for the SOAR HTTP client.
+
+    Timeouts are in seconds; None disables a limit. A pool size of 0 means
+    no limit.
+    """
+
+    pool_size: int = 100
+    pool_size_per_host: int = 20
+    dns_cache_ttl: Optional[float] = 300.0
+    keepalive_timeout: Optional[float] = 30.0
+    connect_timeout: Optional[float] = 10.0
+    read_timeout: Optional[float] = 60.0
+    total_timeout: Optional[float] = 120.0
+    # Retries: attempts include the first request. Delays are in seconds.
+    max_attempts: int = 4
+    backoff_base: float = 0.5
+    backoff_max: float = 10.0
+    # Give up rather than wait when SOAR asks for a longer pause than this.
+    max_retry_after: float = 60.0
+    # Share one upstream request between identical concurrent GETs.
+    coalesce_gets: bool = True
+    # Short-lived cache for GETs that opt in with cache tags.
+    response_cache_ttl: float = 15.0
+    response_cache_max_entries: int = 1024
+    # 'auto', 'orjson', 'pydantic' or 'stdlib' (see codec.get_codec).
+    json_codec: str = "auto"
+
+    @classmethod
+    def from_env(cls) -> "HttpClientConfig":
+        """Builds a config from the SOAR_HTTP_* environment variables."""
+        default = cls()
+        return cls(
+            pool_size=int(os.getenv(consts.ENV_SOAR_HTTP_POOL_SIZE, default.pool_size)),
+            pool_size_per_host=int(
+                os.getenv(
+                    consts.ENV_SOAR_HTTP_POOL_SIZE_PER_HOST, default.pool_size_per_host
+                )
+            ),
+            dns_cache_ttl=_env_float(
+                consts.ENV_SOAR_HTTP_DNS_CACHE_TTL, default.dns_cache_ttl
+            ),
+            keepalive_timeout=_env_float(
+                consts.ENV_SOAR_HTTP_KEEPALIVE_TIMEOUT, default.keepalive_timeout
+            ),
+            connect_timeout=_env_float(
+                consts.ENV_SOAR_HTTP_CONNECT_TIMEOUT, default.connect_timeout
+            ),
+            read_timeout=_env_float(
+                consts.ENV_SOAR_HTTP_READ_TIMEOUT, default.read_timeout
+            ),
+            total_timeout=_env_float(
+                consts.ENV_SOAR_HTTP_TOTAL_TIMEOUT, default.total_timeout
+            ),
+            max_attempts=max(
+                1, int(os.getenv(consts.ENV_SOAR_HTTP_MAX_ATTEMPTS, default.max_attempts))
+            ),
+            backoff_base=float(
+                os.getenv(consts.ENV_SOAR_HTTP_BACKOFF_BASE, default.backoff_base)
+            ),
+            backoff_max=float(
+                os.getenv(consts.ENV_SOAR_HTTP_BACKOFF_MAX, default.backoff_max)
+            ),
+            max_retry_after=float(
+                os.getenv(consts.ENV_SOAR_HTTP_MAX_RETRY_AFTER, default.max_retry_after)
+            ),
+            coalesce_gets=os.getenv(
+                consts.ENV_SOAR_HTTP_COALESCE_GETS, str(default.coalesce_gets)
+            ).lower()
+            in ("1", "true", "yes"),
+            response_cache_ttl=float(
+                os.getenv(
+                    consts.ENV_SOAR_RESPONSE_CACHE_TTL, default.response_cache_ttl
+                )
+            ),
+            response_cache_max_entries=int(
+                os.getenv(
+                    consts.ENV_SOAR_RESPONSE_CACHE_MAX_ENTRIES,
+                    default.response_cache_max_entries,
+                )
+            ),
+            json_codec=os.getenv(consts.ENV_SOAR_JSON_CODEC, default.json_codec),
+        )
+
+
+class PoolStats:
+    """Counters describing how the connection pool is used."""
+
+    def __init__(self):
+        self.connections_created = 0
+        self.connections_reused = 0
+        # Requests that had to wait because the pool was saturated.
+        self.queued_requests = 0
+        self.queued_seconds_total = 0.0
+        self.max_queued_seconds = 0.0
+        self.requests_in_flight = 0
+        self.max_requests_in_flight = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Returns an aiohttp trace config that feeds these counters."""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.requests_in_flight += 1
+            self.max_requests_in_flight = max(
+                self.max_requests_in_flight, self.requests_in_flight
+            )
+
+        async def on_request_done(session, context, params):
+            self.requests_in_flight -= 1
+
+        async def on_connection_queued_start(session, context, params):
+            context.queued_at = time.monotonic()
+            self.queued_requests += 1
+
+        async def on_connection_queued_end(session, context, params):
+            waited = time.monotonic() - context.queued_at
+            self.queued_seconds_total += waited
+            self.max_queued_seconds = max(self.max_queued_seconds, waited)
+
+        async def on_connection_create_end(session, context, params):
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.connections_reused += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_done)
+        trace_config.on_request_exception.append(on_request_done)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(on_connection_queued_end)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
 
 class HttpClient:
     """HTTP client for making requests to the SecOps SOAR API."""
 
-    def __init__(self, base_url: str, app_key: str):
+    def __init__(
+        self, base_url: str, app_key: str, config: Optional[HttpClientConfig] = None
+    ):
         self.base_url = base_url
         self.app_key = app_key
+        self.config = config or HttpClientConfig()
+        self.codec = get_codec(self.config.json_codec)
+        self.pool_stats = PoolStats()
+        self.metrics = Metrics()
+        self.coalesced_gets = 0
+        self.response_cache = ResponseCache(
+            self.config.response_cache_max_entries, self.config.response_cache_ttl
+        )
+        self._inflight_gets: Dict[str, asyncio.Future] = {}
         self._session = None
 
     def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None:
-            self._session = aiohttp.ClientSession()
+            connector_kwargs = {
+                "limit": self.config.pool_size,
+                "limit_per_host": self.config.pool_size_per_host,
+                "ttl_dns_cache": self.config.dns_cache_ttl,
+                "use_dns_cache": self.config.dns_cache_ttl is not None,
+            }
+            if self.config.keepalive_timeout is None:
+                connector_kwargs["force_close"] = True
+            else:
+                connector_kwargs["keepalive_timeout"] = self.config.keepalive_timeout
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(**connector_kwargs),
+                timeout=aiohttp.ClientTimeout(
+                    total=self.config.total_timeout,
+                    connect=self.config.connect_timeout,
+                    sock_read=self.config.read_timeout,
+                ),
+                trace_configs=[self.pool_stats.trace_config()],
+            )
         return self._session
 
+    def stats(self) -> Dict[str, Any]:
+        """Returns connection pool counters and the configured limits."""
+        return {
+            "pool_size": self.config.pool_size,
+            "pool_size_per_host": self.config.pool_size_per_host,
+            **self.pool_stats.as_dict(),
+            "coalesced_gets": self.coalesced_gets,
+            "json_codec": self.codec.name,
+        }
+
     async def _get_headers(self):
         headers = {}
         if self.app_key:
@@ -45,88 +316,244 @@ class HttpClient:
         self,
         endpoint: str,
         params: Dict[str, Any] = None,
+        cache_tags: Optional[Iterable[str]] = None,
+        projection: Optional[Projection] = None,
     ):
         """Makes a GET request to the specified endpoint.
 
+        Transient failures are retried with backoff. Concurrent calls for the
+        same endpoint and parameters share one upstream request and receive the
+        same decoded response, which callers must treat as read-only.
+
         Args:
             endpoint: The API endpoint to send the request to.
             params: Query parameters as a dictionary.
+            cache_tags: If given, the response may be served from and stored in
+                the response cache. Writes invalidate cached responses by tag
+                (see `invalidate`).
+            projection: If given, the response is decoded incrementally and
+                only the selected fields of its top-level array items are
+                kept (see `streaming.decode_projected`).
 
         Returns:
-            The response as a JSON object, or None if an error occurred.
+            The response as a JSON object, or an error result (see
+            `is_error_result`) if the request failed.
         """
-        headers = await self._get_headers()
-        try:
-            async with self._get_session().get(
-                self.base_url + endpoint, params=params, headers=headers
-            ) as response:
-                response.raise_for_status()  # Raise an exception for 4xx/5xx responses
-                return await response.json()
-        except aiohttp.ClientResponseError as e:
-            logger.debug("HTTP error occurred: %s", e)
-        except Exception as e:
-            logger.debug("An error occurred: %s", e)
-        return None
+        key = request_key(endpoint, params)
+        if projection is not None:
+            key += "#" + projection.key()
+        use_cache = cache_tags is not None and self.response_cache.enabled
+        if use_cache:
+            cache_tags = tuple(cache_tags)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return cached
+            versions = self.response_cache.versions(cache_tags)
+        response = await self._coalesced_get(key, endpoint, params, projection)
+        if use_cache and not is_error_result(response):
+            self.response_cache.put(key, response, cache_tags, versions)
+        return response
+
+    def invalidate(self, *tags: str):
+        """Drops cached responses carrying any of the given tags."""
+        self.response_cache.invalidate(*tags)
+
+    async def _coalesced_get(
+        self,
+        key: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        projection: Optional[Projection] = None,
+    ):
+        if not self.config.coalesce_gets:
+            return await self._request(
+                "GET", endpoint, params=params, retry=True, projection=projection
+            )
+        task = self._inflight_gets.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._request(
+                    "GET", endpoint, params=params, retry=True, projection=projection
+                )
+            )
+            self._inflight_gets[key] = task
+            task.add_done_callback(lambda _: self._forget_inflight_get(key, task))
+        else:
+            self.coalesced_gets += 1
+        # Shielded so a cancelled caller does not cancel the shared request.
+        return await asyncio.shield(task)
+
+    def _forget_inflight_get(self, key: str, task: asyncio.Future):
+        if self._inflight_gets.get(key) is task:
+            del self._inflight_gets[key]
 
     async def post(
         self,
         endpoint: str,
-        req: Dict[str, Any] = None,
+        req: Union[Dict[str, Any], BaseModel] = None,
         params: Dict[str, Any] = None,
+        retry: bool = False,
     ):
         """Makes a POST request to the specified endpoint.
 
         Args:
             endpoint: The API endpoint to send the request to.
-            req: The request body as a dictionary.
+            req: The request body as a dictionary or pydantic model.
             params: Query parameters as a dictionary.
+            retry: Whether the request is safe to repeat. If False, it is only
+                retried when SOAR rejected it with 429 Too Many Requests.
 
         Returns:
-            The response as a JSON object, or None if an error occurred.
+            The response as a JSON object, or an error result (see
+            `is_error_result`) if the request failed.
         """
-        headers = await self._get_headers()
-        try:
-            async with self._get_session().post(
-                self.base_url + endpoint, json=req, params=params, headers=headers
-            ) as response:
-                response.raise_for_status()
-                data = await response.content.read()
-                decoded_data = data.decode("utf-8")
-                return json.loads(decoded_data)
-        except aiohttp.ClientResponseError as e:
-            logger.debug("HTTP error occurred: %s", e)
-        except Exception as e:
-            logger.debug("An error occurred: %s", e)
-        return None
+        return await self._request("POST", endpoint, req=req, params=params, retry=retry)
 
     async def patch(
         self,
         endpoint: str,
-        req: Dict[str, Any] = None,
+        req: Union[Dict[str, Any], BaseModel] = None,
         params: Dict[str, Any] = None,
+        retry: bool = False,
     ):
         """Makes a PATCH request to the specified endpoint.
 
         Args:
             endpoint: The API endpoint to send the request to.
-            req: The request body as a dictionary.
+            req: The request body as a dictionary or pydantic model.
             params: Query parameters as a dictionary.
+            retry: Whether the request is safe to repeat. If False, it is only
+                retried when SOAR rejected it with 429 Too Many Requests.
 
         Returns:
-            The response as a JSON object, or None if an error occurred.
+            The response as a JSON object, or an error result (see
+            `is_error_result`) if the request failed.
         """
+        return await self._request(
+            "PATCH", endpoint, req=req, params=params, retry=retry
+        )
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        req: Union[Dict[str, Any], BaseModel] = None,
+        params: Dict[str, Any] = None,
+        retry: bool = False,
+        projection: Optional[Projection] = None,
+    ):
         headers = await self._get_headers()
-        try:
-            async with self._get_session().patch(
-                self.base_url + endpoint, json=req, params=params, headers=headers
-            ) as response:
-                response.raise_for_status()
-                return await response.json()
-        except aiohttp.ClientResponseError as e:
-            logger.debug("HTTP error occurred: %s", e)
-        except Exception as e:
-            logger.debug("An error occurred: %s", e)
-        return None
+        # Serialized once, outside the retry loop.
+        data = None
+        if req is not None:
+            try:
+                data = self.codec.dumps(req)
+            except Exception as e:
+                logger.debug("Could not serialize the request body: %s", e)
+                return error_result(endpoint, None, str(e), False, 0)
+            headers["Content-Type"] = "application/json"
+        series = self.metrics.request_series(method, endpoint)
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after = None
+            status = None
+            response_bytes = 0
+            started = time.perf_counter()
+            series.in_flight += 1
+            try:
+                async with self._get_session().request(
+                    method,
+                    self.base_url + endpoint,
+                    data=data,
+                    params=params,
+                    headers=headers,
+                ) as response:
+                    status = response.status
+                    series.time_to_headers.observe(time.perf_counter() - started)
+                    if response.status < 400:
+                        result = await self._decode(response, projection)
+                        response_bytes = response.content.total_bytes
+                        return result
+                    retry_after = parse_retry_after(
+                        response.headers.get("Retry-After")
+                    )
+                    message = f"{response.status} {response.reason}"
+                    retryable = status == 429 or (
+                        retry and status in RETRYABLE_STATUSES
+                    )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                status = None
+                message = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+                retryable = retry
+            except asyncio.CancelledError:
+                status = "cancelled"
+                raise
+            except Exception as e:
+                logger.debug("An error occurred: %s", e)
+                return error_result(endpoint, None, str(e), False, attempt)
+            finally:
+                series.in_flight -= 1
+                series.record(
+                    status,
+                    time.perf_counter() - started,
+                    len(data) if data else 0,
+                    response_bytes,
+                )
+
+            delay = self._backoff_delay(attempt, retry_after)
+            if not retryable or attempt >= self.config.max_attempts or delay is None:
+                logger.debug(
+                    "%s %s failed after %d attempt(s): %s",
+                    method,
+                    endpoint,
+                    attempt,
+                    message,
+                )
+                return error_result(
+                    endpoint,
+                    status,
+                    message,
+                    retryable,
+                    attempt,
+                    retry_after,
+                    transient=status is None or status in RETRYABLE_STATUSES,
+                )
+            logger.debug(
+                "%s %s failed (%s); retrying in %.2fs", method, endpoint, message, delay
+            )
+            await asyncio.sleep(delay)
+
+    async def _decode(
+        self,
+        response: aiohttp.ClientResponse,
+        projection: Optional[Projection] = None,
+    ):
+        if projection is not None:
+            return await decode_projected(
+                response.content.iter_chunked(CHUNK_SIZE), projection
+            )
+        body = await response.read()
+        if not body.strip():
+            # Successful requests without content, e.g. 204 No Content.
+            return {}
+        return self.codec.loads(body)
+
+    def _backoff_delay(
+        self, attempt: int, retry_after: Optional[float]
+    ) -> Optional[float]:
+        """Returns how long to wait before the next attempt, or None to give up."""
+        if retry_after is not None:
+            if retry_after > self.config.max_retry_after:
+                return None
+            return retry_after
+        # Exponential backoff with full jitter.
+        ceiling = min(
+            self.config.backoff_max, self.config.backoff_base * 2 ** (attempt - 1)
+        )
+        return random.uniform(0, ceiling)
 
     async def close(self):
-        await self._get_session().close()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
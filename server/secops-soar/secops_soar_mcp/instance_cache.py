@@ -0,0 +1,118 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Cache of integration instance identifiers used by marketplace actions."""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from logger_utils import get_logger
+from secops_soar_mcp.http_client import HttpClient, is_error_result
+from secops_soar_mcp.utils.consts import Endpoints
+
+logger = get_logger(__name__)
+
+
+class IntegrationInstanceCache:
+    """Caches the integration instances response per integration.
+
+    Entries are fetched on first use and served until they expire. Once an
+    entry is older than `refresh_after` seconds it is still served, but a
+    background refresh is started so callers rarely wait on the lookup.
+    Invalidating an integration discards the result of any fetch that was
+    already running, so an instance reported missing is not cached again.
+    """
+
+    def __init__(self, http_client: HttpClient, ttl: float, refresh_after: float):
+        self.http_client = http_client
+        self.ttl = ttl
+        self.refresh_after = min(refresh_after, ttl)
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._fetches: Dict[str, asyncio.Task] = {}
+        # Bumped on invalidation; a fetch only stores its result if the
+        # generation it started in is still current.
+        self._generations: Dict[str, int] = {}
+
+    async def get(self, integration_name: str) -> Optional[Dict[str, Any]]:
+        """Returns the integration instances response for an integration.
+
+        Args:
+            integration_name: The integration name as known to SOAR.
+
+        Returns:
+            The raw API response, or an error result if it could not be fetched.
+        """
+        entry = self._entries.get(integration_name)
+        if entry is not None and self.ttl > 0:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                if age >= self.refresh_after:
+                    self._start_fetch(integration_name)
+                return entry[1]
+        return await asyncio.shield(self._start_fetch(integration_name))
+
+    def invalidate(self, integration_name: str):
+        """Drops the cached instances of an integration."""
+        self._generations[integration_name] = (
+            self._generations.get(integration_name, 0) + 1
+        )
+        # Later lookups must not join a fetch whose result is now stale.
+        self._fetches.pop(integration_name, None)
+        if self._entries.pop(integration_name, None) is not None:
+            logger.debug("Invalidated integration instances of %s", integration_name)
+
+    def clear(self):
+        """Drops every cached entry and cancels pending refreshes."""
+        self._entries.clear()
+        for task in self._fetches.values():
+            task.cancel()
+        self._fetches.clear()
+        self._generations.clear()
+
+    def _start_fetch(self, integration_name: str) -> asyncio.Task:
+        # Concurrent misses and refreshes for one integration share a request.
+        task = self._fetches.get(integration_name)
+        if task is None:
+            generation = self._generations.get(integration_name, 0)
+            task = asyncio.create_task(self._fetch(integration_name, generation))
+            self._fetches[integration_name] = task
+            task.add_done_callback(
+                lambda done: self._forget_fetch(integration_name, done)
+            )
+        return task
+
+    def _forget_fetch(self, integration_name: str, task: asyncio.Task):
+        # An invalidation may already have replaced this fetch with a newer one.
+        if self._fetches.get(integration_name) is task:
+            del self._fetches[integration_name]
+
+    async def _fetch(
+        self, integration_name: str, generation: int
+    ) -> Optional[Dict[str, Any]]:
+        response = await self.http_client.get(
+            Endpoints.LIST_INTEGRATION_INSTANCES.format(
+                INTEGRATION_NAME=integration_name
+            )
+        )
+        if is_error_result(response):
+            # Keep serving a previous entry until it expires.
+            logger.debug("Failed to fetch instances of %s", integration_name)
+        elif generation != self._generations.get(integration_name, 0):
+            logger.debug(
+                "Discarding instances of %s fetched before an invalidation",
+                integration_name,
+            )
+        else:
+            self._entries[integration_name] = (time.monotonic(), response)
+        return response
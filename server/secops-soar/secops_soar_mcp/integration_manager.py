@@ -0,0 +1,298 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Enabling and unloading marketplace integrations while the server runs."""
+
+import sys
+import weakref
+from typing import Annotated, Dict, Iterable, List, Optional
+
+from logger_utils import get_logger
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.server.lowlevel.server import NotificationOptions
+from pydantic import Field
+from secops_soar_mcp.manifest import (
+    list_integration_modules,
+    load_integration_tools,
+    load_manifest,
+    register_from_manifest,
+)
+from secops_soar_mcp.utils.utils import normalize_integration_name
+
+logger = get_logger(__name__)
+
+
+class DynamicToolsMCP(FastMCP):
+    """FastMCP server whose tool list changes while it runs.
+
+    It advertises `tools.listChanged` and remembers the sessions that listed
+    tools, so they can be notified when integrations are enabled or disabled.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.tool_list_sessions = weakref.WeakSet()
+        super().__init__(*args, **kwargs)
+        create_options = self._mcp_server.create_initialization_options
+
+        def create_initialization_options(
+            notification_options=None, experimental_capabilities=None
+        ):
+            return create_options(
+                notification_options or NotificationOptions(tools_changed=True),
+                experimental_capabilities,
+            )
+
+        self._mcp_server.create_initialization_options = create_initialization_options
+
+    async def list_tools(self):
+        try:
+            self.tool_list_sessions.add(self.get_context().session)
+        except ValueError:
+            # Listed outside of a client request.
+            pass
+        return await super().list_tools()
+
+
+class IntegrationManager:
+    """Tracks which marketplace integrations are enabled and the tools of each.
+
+    Integrations are registered from the tool manifest when possible and
+    imported otherwise. Unloading an integration removes its tools and drops
+    its module, so a later enable starts from a fresh import. When `shards`
+    is set (see `shards.ShardPool`), integrations are hosted by worker
+    processes instead and their tools forward calls to them.
+
+    Integrations are enabled for the whole server, so every client sees the
+    same tools. When `read_only` holds a reason, such as the server running
+    as several worker processes whose tool lists could not be kept in step,
+    the integrations cannot be changed at runtime.
+    """
+
+    def __init__(self, mcp: FastMCP, use_manifest: bool = True):
+        self.mcp = mcp
+        self.use_manifest = use_manifest
+        self.shards = None
+        self.read_only: Optional[str] = None
+        self._tool_names: Dict[str, List[str]] = {}
+
+    @property
+    def enabled(self) -> Dict[str, int]:
+        """Returns the number of tools of each enabled integration."""
+        return {stem: len(names) for stem, names in sorted(self._tool_names.items())}
+
+    def resolve(self, names: Iterable[str]) -> Dict[str, List[str]]:
+        """Maps integration names to module stems.
+
+        Returns:
+            A dict with the 'found' module stems and the 'unknown' names.
+        """
+        available = set(list_integration_modules())
+        found, unknown = [], []
+        for name in names:
+            module_stem = normalize_integration_name(name)
+            if module_stem in available:
+                if module_stem not in found:
+                    found.append(module_stem)
+            else:
+                unknown.append(name)
+        return {"found": found, "unknown": unknown}
+
+    async def enable(self, module_stems: Iterable[str]) -> Dict[str, List[str]]:
+        """Registers the tools of integrations that are not enabled yet.
+
+        Returns:
+            The names of the tools registered for each newly enabled integration.
+        """
+        tools = self.mcp._tool_manager._tools
+        module_stems = [stem for stem in module_stems if stem not in self._tool_names]
+        if self.shards is not None:
+            registered = await self.shards.enable(module_stems)
+            self._tool_names.update(registered)
+            return registered
+        # Loaded per call rather than kept, as it describes every integration.
+        manifest = load_manifest() if self.use_manifest and module_stems else None
+        registered = {}
+        for module_stem in module_stems:
+            before = set(tools)
+            if manifest is None or register_from_manifest(
+                self.mcp, manifest, [module_stem]
+            ):
+                self._import_module_tools(module_stem)
+            names = [name for name in tools if name not in before]
+            self._tool_names[module_stem] = names
+            registered[module_stem] = names
+        return registered
+
+    async def disable(self, module_stems: Iterable[str]) -> Dict[str, int]:
+        """Removes the tools of enabled integrations and drops their modules.
+
+        Returns:
+            The number of tools removed for each disabled integration.
+        """
+        tools = self.mcp._tool_manager._tools
+        removed = {}
+        for module_stem in module_stems:
+            names = self._tool_names.pop(module_stem, None)
+            if names is None:
+                continue
+            for name in names:
+                tools.pop(name, None)
+            sys.modules.pop(f"secops_soar_mcp.marketplace.{module_stem}", None)
+            removed[module_stem] = len(names)
+            logger.info("Unloaded %s (%d tools)", module_stem, len(names))
+        if self.shards is not None and removed:
+            await self.shards.disable(list(removed))
+        return removed
+
+    async def notify_tools_changed(self, ctx: Context = None):
+        """Sends tools/list_changed to every session that listed tools."""
+        listed = getattr(self.mcp, "tool_list_sessions", weakref.WeakSet())
+        sessions = set(listed)
+        if ctx is not None:
+            sessions.add(ctx.session)
+        for session in sessions:
+            try:
+                await session.send_tool_list_changed()
+            except Exception as e:
+                # The client went away; it will list tools again on reconnect.
+                logger.debug("Could not notify a session of tool changes: %s", e)
+                listed.discard(session)
+
+    def _import_module_tools(self, module_stem: str):
+        tools = self.mcp._tool_manager._tools
+        try:
+            logger.debug("  Attempting to import module: %s", module_stem)
+            for tool in load_integration_tools(module_stem):
+                tools[tool.name] = tool
+        except ImportError as e:
+            logger.error(
+                "  * Failed to import module %s. Error: %s",
+                module_stem,
+                e,
+                exc_info=True,
+            )
+        except Exception as e:
+            logger.error(
+                "  * Failed during registration call for module %s. Error: %s",
+                module_stem,
+                e,
+                exc_info=True,
+            )
+
+
+def register_tools(mcp: FastMCP, manager: IntegrationManager):
+    @mcp.tool()
+    async def list_integrations() -> dict:
+        """List the marketplace integrations this server can load, and which are enabled.
+
+        Only the tools of enabled integrations are offered. Use this to find an integration
+        for a vendor before enabling it with `enable_integrations`.
+
+        Returns:
+            dict: A dictionary with:
+                  - 'enabled': The enabled integrations and their number of tools.
+                  - 'available': The names of all integrations that can be enabled.
+                  - 'shards': When integrations are hosted by worker processes, the
+                    integrations and state of each worker.
+        """
+        result = {"enabled": manager.enabled, "available": list_integration_modules()}
+        if manager.shards is not None:
+            result["shards"] = manager.shards.status()
+        return result
+
+    @mcp.tool()
+    async def enable_integrations(
+        integrations: Annotated[
+            List[str],
+            Field(
+                ...,
+                description="Integration names to enable (e.g. 'VirusTotalV3', 'CrowdStrikeFalcon').",
+            ),
+        ],
+        ctx: Context,
+    ) -> dict:
+        """Enable marketplace integrations so their action tools become available.
+
+        The tools of the enabled integrations are added to this server's tool list and
+        clients are notified that the list changed. Enable only the integrations a task
+        needs, to keep the tool list small. Integrations are enabled for every client
+        of this server, not only the calling one.
+
+        Args:
+            integrations (List[str]): Integration names, case- and space-insensitive.
+                                      (Example: ["VirusTotalV3"])
+
+        Returns:
+            dict: A dictionary with:
+                  - 'enabled': The tools added for each newly enabled integration.
+                  - 'already_enabled': Requested integrations that were enabled before.
+                  - 'unknown': Requested names that match no integration (see `list_integrations`).
+                  Or 'Status' Failed with a 'Message' when the server does not allow
+                  integrations to change while it runs.
+
+        **Next Steps (using MCP-enabled tools):**
+        - Refresh the tool list if your client does not do so automatically, then call the new tools.
+        - Disable the integrations with `disable_integrations` when they are no longer needed.
+        """
+        if manager.read_only:
+            return {"Status": "Failed", "Message": manager.read_only}
+        resolved = manager.resolve(integrations)
+        already_enabled = [
+            stem for stem in resolved["found"] if stem in manager.enabled
+        ]
+        registered = await manager.enable(resolved["found"])
+        if registered:
+            await manager.notify_tools_changed(ctx)
+        return {
+            "enabled": registered,
+            "already_enabled": already_enabled,
+            "unknown": resolved["unknown"],
+        }
+
+    @mcp.tool()
+    async def disable_integrations(
+        integrations: Annotated[
+            List[str],
+            Field(..., description="Integration names to disable and unload."),
+        ],
+        ctx: Context,
+    ) -> dict:
+        """Disable marketplace integrations and unload their tools.
+
+        The tools of the integrations are removed from this server's tool list, their
+        modules are unloaded and clients are notified that the list changed. This
+        affects every client of this server, not only the calling one.
+
+        Args:
+            integrations (List[str]): Integration names, case- and space-insensitive.
+                                      (Example: ["VirusTotalV3"])
+
+        Returns:
+            dict: A dictionary with:
+                  - 'disabled': The number of tools removed for each disabled integration.
+                  - 'not_enabled': Requested integrations that were not enabled.
+                  - 'unknown': Requested names that match no integration.
+                  Or 'Status' Failed with a 'Message' when the server does not allow
+                  integrations to change while it runs.
+        """
+        if manager.read_only:
+            return {"Status": "Failed", "Message": manager.read_only}
+        resolved = manager.resolve(integrations)
+        removed = await manager.disable(resolved["found"])
+        if removed:
+            await manager.notify_tools_changed(ctx)
+        return {
+            "disabled": removed,
+            "not_enabled": [stem for stem in resolved["found"] if stem not in removed],
+            "unknown": resolved["unknown"],
+        }
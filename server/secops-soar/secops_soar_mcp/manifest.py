@@ -0,0 +1,572 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Precomputed tool manifest for the marketplace integrations.
+
+Importing a marketplace module builds a pydantic model for every action it
+declares, which makes enabling many integrations slow. The manifest records
+each integration's tool names, descriptions and parameter schemas so the
+server can advertise the tools without importing anything.
+
+For every generated action the manifest also records an `ActionSpec`, so
+calls are served by the generic executor in `secops_soar_mcp.actions`
+without ever importing the module. Tools without a spec import their module
+the first time they are called. Integrations that are imported instead
+(stale manifest entries, `--no-manifest`) are served by the same executor;
+their generated functions only provide the argument validation.
+
+Rebuild the manifest after regenerating the marketplace modules:
+
+    python -m secops_soar_mcp.manifest build
+
+and verify it in CI with:
+
+    python -m secops_soar_mcp.manifest check
+"""
+
+import argparse
+import ast
+import functools
+import hashlib
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Type, Union
+
+from logger_utils import get_logger
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.tools import Tool
+from mcp.server.fastmcp.utilities.func_metadata import ArgModelBase, FuncMetadata
+from pydantic import BaseModel, Field, create_model
+from secops_soar_mcp.actions import ActionParameter, ActionSpec, run_action
+from secops_soar_mcp.utils.models import EmailContent, TargetEntity
+
+logger = get_logger(__name__)
+
+MANIFEST_VERSION = 2
+MARKETPLACE_DIR = Path(__file__).parent.resolve() / "marketplace"
+MANIFEST_PATH = Path(__file__).parent.resolve() / "marketplace_manifest.json"
+
+
+def list_integration_modules(marketplace_dir: Path = MARKETPLACE_DIR) -> List[str]:
+    """Returns the module stems of all marketplace integrations."""
+    return sorted(
+        py_file.stem
+        for py_file in marketplace_dir.glob("*.py")
+        if py_file.name != "__init__.py" and py_file.is_file()
+    )
+
+
+def source_digest(module_stem: str, marketplace_dir: Path = MARKETPLACE_DIR) -> str:
+    """Returns the SHA-256 digest of a marketplace module's source file."""
+    return hashlib.sha256(
+        (marketplace_dir / f"{module_stem}.py").read_bytes()
+    ).hexdigest()
+
+
+def load_integration_module(
+    module_stem: str, marketplace_dir: Path = MARKETPLACE_DIR
+) -> ModuleType:
+    """Imports a marketplace module from its file.
+
+    Loading by path rather than by dotted name also works for stems that are
+    not valid identifiers, such as "any.run" or "awselasticcomputecloud(ec2)".
+    """
+    module_name = f"secops_soar_mcp.marketplace.{module_stem}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(
+        module_name, marketplace_dir / f"{module_stem}.py"
+    )
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load marketplace module {module_stem}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+
+class _ToolCollector:
+    """Stands in for FastMCP so a module's tools can be captured, not served."""
+
+    def __init__(self):
+        self.tools: List[Tool] = []
+
+    def tool(self, name: Optional[str] = None, description: Optional[str] = None, **kwargs):
+        def decorator(fn):
+            self.tools.append(Tool.from_function(fn, name=name, description=description))
+            return fn
+
+        return decorator
+
+
+def collect_module_tools(module_stem: str) -> List[Tool]:
+    """Imports a marketplace module and returns the tools it registers."""
+    module = load_integration_module(module_stem)
+    register_function = getattr(module, "register_tools", None)
+    if not callable(register_function):
+        raise ImportError(
+            f"Module {module_stem} has no callable 'register_tools' function."
+        )
+    collector = _ToolCollector()
+    register_function(collector)
+    return collector.tools
+
+
+def load_integration_tools(module_stem: str) -> List[Tool]:
+    """Imports a marketplace module and returns the tools to serve for it.
+
+    Generated actions become `ActionTool`s that validate arguments with the
+    generated function's model but run through the action executor, so they
+    behave exactly like the tools served from the manifest. Other tools run
+    their own function.
+    """
+    action_specs = extract_action_specs(module_stem)
+    tools = []
+    for tool in collect_module_tools(module_stem):
+        spec = action_specs.get(tool.name)
+        if spec is not None:
+            tool = ActionTool(
+                fn=functools.partial(run_action, spec),
+                name=tool.name,
+                description=tool.description,
+                parameters=tool.parameters,
+                fn_metadata=tool.fn_metadata,
+                is_async=True,
+                spec=spec,
+                module_stem=module_stem,
+            )
+        tools.append(tool)
+    return tools
+
+
+# Arguments shared by every generated action; handled by execute_action itself.
+COMMON_ACTION_ARGUMENTS = frozenset(
+    ["case_id", "alert_group_identifiers", "target_entities", "scope"]
+)
+
+
+class _ActionSpecExtractor(ast.NodeVisitor):
+    """Reads the ActionSpec out of one generated action function.
+
+    Only the exact shape emitted by the marketplace generator is understood;
+    anything else marks the function as unsupported.
+    """
+
+    def __init__(self):
+        self.integration: Optional[str] = None
+        self.action_name: Optional[str] = None
+        self.parameters: List[ActionParameter] = []
+        self.supported = True
+        self._optional_argument: Optional[str] = None
+
+    def visit_If(self, node: ast.If):
+        test = node.test
+        if (
+            isinstance(test, ast.Compare)
+            and isinstance(test.left, ast.Name)
+            and len(test.ops) == 1
+            and isinstance(test.ops[0], ast.IsNot)
+            and isinstance(test.comparators[0], ast.Constant)
+            and test.comparators[0].value is None
+        ):
+            self._optional_argument = test.left.id
+            for statement in node.body:
+                self.visit(statement)
+            self._optional_argument = None
+            for statement in node.orelse:
+                self.visit(statement)
+        else:
+            self.generic_visit(node)
+
+    def visit_Assign(self, node: ast.Assign):
+        target = node.targets[0]
+        if (
+            isinstance(target, ast.Subscript)
+            and isinstance(target.value, ast.Name)
+            and target.value.id == "script_params"
+        ):
+            key = target.slice
+            if not (
+                isinstance(key, ast.Constant)
+                and isinstance(key.value, str)
+                and isinstance(node.value, ast.Name)
+            ):
+                self.supported = False
+                return
+            optional = self._optional_argument is not None
+            if optional and self._optional_argument != node.value.id:
+                self.supported = False
+                return
+            self.parameters.append(
+                ActionParameter(node.value.id, key.value, optional)
+            )
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        if (
+            isinstance(func, ast.Attribute)
+            and func.attr == "format"
+            and isinstance(func.value, ast.Attribute)
+            and func.value.attr == "LIST_INTEGRATION_INSTANCES"
+        ):
+            # Endpoints.LIST_INTEGRATION_INSTANCES.format(INTEGRATION_NAME="...")
+            for keyword in node.keywords:
+                if keyword.arg == "INTEGRATION_NAME":
+                    self.integration = _constant_string(keyword.value)
+        elif isinstance(func, ast.Name) and func.id == "ApiManualActionDataModel":
+            for keyword in node.keywords:
+                if keyword.arg == "actionName":
+                    self.action_name = _constant_string(keyword.value)
+        self.generic_visit(node)
+
+
+def _constant_string(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def extract_action_specs(
+    module_stem: str, marketplace_dir: Path = MARKETPLACE_DIR
+) -> Dict[str, ActionSpec]:
+    """Extracts the ActionSpec of every generated action in a module.
+
+    Returns:
+        A mapping from tool name to spec. Functions that do not follow the
+        generated shape are left out and keep being served by their module.
+    """
+    tree = ast.parse((marketplace_dir / f"{module_stem}.py").read_text("utf-8"))
+    specs = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.AsyncFunctionDef):
+            continue
+        extractor = _ActionSpecExtractor()
+        for statement in node.body:
+            extractor.visit(statement)
+        arguments = {arg.arg for arg in node.args.args}
+        mapped = {parameter.argument for parameter in extractor.parameters}
+        if (
+            extractor.supported
+            and extractor.integration
+            and extractor.action_name
+            and COMMON_ACTION_ARGUMENTS <= arguments
+            and mapped <= arguments - COMMON_ACTION_ARGUMENTS
+        ):
+            specs[node.name] = ActionSpec(
+                extractor.integration,
+                extractor.action_name,
+                tuple(extractor.parameters),
+            )
+        else:
+            logger.debug("No action spec for %s.%s", module_stem, node.name)
+    return specs
+
+
+def build_manifest(marketplace_dir: Path = MARKETPLACE_DIR) -> Dict[str, Any]:
+    """Imports every marketplace module and records the tools it declares."""
+    integrations = {}
+    for module_stem in list_integration_modules(marketplace_dir):
+        logger.debug("Collecting tools from %s", module_stem)
+        action_specs = extract_action_specs(module_stem, marketplace_dir)
+        tools = []
+        for tool in collect_module_tools(module_stem):
+            tool_entry = {
+                "name": tool.name,
+                "description": tool.description,
+                "parameters": tool.parameters,
+            }
+            if tool.name in action_specs:
+                tool_entry["action"] = action_specs[tool.name].to_json()
+            tools.append(tool_entry)
+        integrations[module_stem] = {
+            "source_sha256": source_digest(module_stem, marketplace_dir),
+            "tools": tools,
+        }
+    return {"version": MANIFEST_VERSION, "integrations": integrations}
+
+
+def write_manifest(manifest: Dict[str, Any], path: Path = MANIFEST_PATH):
+    """Writes the manifest as compact JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"), sort_keys=True)
+        f.write("\n")
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Optional[Dict[str, Any]]:
+    """Loads the manifest, or returns None if it is missing or unusable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read tool manifest %s: %s", path, e)
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        logger.warning(
+            "Ignoring tool manifest %s with unsupported version %s",
+            path,
+            manifest.get("version"),
+        )
+        return None
+    return manifest
+
+
+def find_stale_integrations(
+    manifest: Dict[str, Any], marketplace_dir: Path = MARKETPLACE_DIR
+) -> List[str]:
+    """Returns integrations whose manifest entry does not match the source."""
+    recorded = manifest.get("integrations", {})
+    on_disk = set(list_integration_modules(marketplace_dir))
+    stale = sorted(set(recorded) ^ on_disk)
+    for module_stem in sorted(on_disk & set(recorded)):
+        if recorded[module_stem].get("source_sha256") != source_digest(
+            module_stem, marketplace_dir
+        ):
+            stale.append(module_stem)
+    return sorted(stale)
+
+
+# Metadata of tools whose arguments are validated by the callable they
+# forward to. Like the generated `-> dict` functions, results are unstructured.
+_FORWARDING_TOOL_METADATA = FuncMetadata(arg_model=ArgModelBase)
+
+
+async def call_integration_tool(
+    tools_by_name: Dict[str, Tool],
+    module_stem: str,
+    tool_name: str,
+    arguments: Dict[str, Any],
+    context: Any = None,
+    convert_result: bool = False,
+) -> Any:
+    """Imports an integration on first use and runs one of its tools."""
+    tool = resolve_integration_tool(tools_by_name, module_stem, tool_name)
+    return await tool.run(arguments, context, convert_result)
+
+
+class LazyIntegrationTool(Tool):
+    """A marketplace tool advertised from the manifest.
+
+    The owning module is imported on the first call. Its real tools then
+    replace every lazy tool of the module in the tool manager, so later calls
+    go straight to them.
+    """
+
+    module_stem: str
+
+    async def run(self, arguments: Dict[str, Any], *args, **kwargs) -> Any:
+        return await self.fn(arguments, *args, **kwargs)
+
+
+class ActionTool(Tool):
+    """A marketplace tool served by the generic action executor.
+
+    Arguments are validated by `fn_metadata.arg_model`, the model FastMCP
+    builds for the generated function. Tools registered from the manifest
+    build it from the recorded schema on their first call instead, since
+    building a model for every advertised tool would cost what the manifest
+    saves.
+    """
+
+    spec: ActionSpec
+    module_stem: str
+
+    async def run(
+        self,
+        arguments: Dict[str, Any],
+        context: Any = None,
+        convert_result: bool = False,
+    ) -> Any:
+        if self.fn_metadata.arg_model is ArgModelBase:
+            self.fn_metadata = FuncMetadata(
+                arg_model=arg_model_from_schema(self.name, self.parameters)
+            )
+        return await super().run(arguments, context, convert_result)
+
+
+_SCHEMA_TYPES = {
+    "string": str,
+    "boolean": bool,
+    "integer": int,
+    "number": float,
+    "null": type(None),
+}
+# Models the generated actions take as arguments, by schema title.
+_SCHEMA_MODELS = {model.__name__: model for model in (TargetEntity, EmailContent)}
+
+
+def schema_annotation(schema: Dict[str, Any], definitions: Dict[str, Any]) -> Any:
+    """Returns the type annotation a generated action declares for a JSON schema."""
+    if "$ref" in schema:
+        schema = definitions.get(schema["$ref"].rsplit("/", 1)[-1], {})
+    if "anyOf" in schema:
+        return Union[
+            tuple(schema_annotation(option, definitions) for option in schema["anyOf"])
+        ]
+    schema_type = schema.get("type")
+    if schema_type == "array":
+        return List[schema_annotation(schema.get("items", {}), definitions)]
+    if schema_type == "object":
+        return _SCHEMA_MODELS.get(schema.get("title"), Dict[str, Any])
+    return _SCHEMA_TYPES.get(schema_type, Any)
+
+
+def arg_model_from_schema(name: str, schema: Dict[str, Any]) -> Type[ArgModelBase]:
+    """Rebuilds the argument model of a generated action from its schema.
+
+    Mirrors FastMCP's `func_metadata`: the model validates and converts the
+    same arguments as the one built from the generated function.
+    """
+    definitions = schema.get("$defs", {})
+    required = set(schema.get("required", []))
+    fields = {}
+    for argument, property_schema in schema.get("properties", {}).items():
+        field_name, field_kwargs = argument, {}
+        # Same aliasing as func_metadata for names that shadow BaseModel methods.
+        if callable(getattr(BaseModel, argument, None)):
+            field_name, field_kwargs = f"field_{argument}", {"alias": argument}
+        default = ... if argument in required else property_schema.get("default")
+        fields[field_name] = (
+            schema_annotation(property_schema, definitions),
+            Field(default, **field_kwargs),
+        )
+    return create_model(f"{name}Arguments", __base__=ArgModelBase, **fields)
+
+
+def resolve_integration_tool(
+    tools_by_name: Dict[str, Tool], module_stem: str, tool_name: str
+) -> Tool:
+    """Imports a module and swaps its lazy tools for the real ones."""
+    logger.info("Importing marketplace module %s on first use", module_stem)
+    real_tools = {tool.name: tool for tool in load_integration_tools(module_stem)}
+    for name, tool in real_tools.items():
+        current = tools_by_name.get(name)
+        if isinstance(current, LazyIntegrationTool) and current.module_stem == module_stem:
+            tools_by_name[name] = tool
+    if tool_name not in real_tools:
+        raise ValueError(
+            f"Tool {tool_name} is listed in the manifest but not defined by {module_stem}."
+        )
+    return real_tools[tool_name]
+
+
+def register_from_manifest(
+    mcp: FastMCP, manifest: Dict[str, Any], module_stems: List[str]
+) -> List[str]:
+    """Registers manifest-backed tools for the given integrations.
+
+    Integrations that are absent from the manifest or whose source no longer
+    matches it are skipped and returned, so the caller can import them eagerly.
+
+    Returns:
+        The module stems that could not be served from the manifest.
+    """
+    tools_by_name = mcp._tool_manager._tools
+    recorded = manifest.get("integrations", {})
+    not_served = []
+    for module_stem in module_stems:
+        entry = recorded.get(module_stem)
+        if entry is None:
+            not_served.append(module_stem)
+            continue
+        if entry.get("source_sha256") != source_digest(module_stem):
+            logger.warning(
+                "Tool manifest is stale for %s; importing it instead. "
+                "Run 'python -m secops_soar_mcp.manifest build' to refresh it.",
+                module_stem,
+            )
+            not_served.append(module_stem)
+            continue
+        for tool_spec in entry["tools"]:
+            if "action" in tool_spec:
+                spec = ActionSpec.from_json(tool_spec["action"])
+                tool = ActionTool(
+                    fn=functools.partial(run_action, spec),
+                    name=tool_spec["name"],
+                    description=tool_spec["description"],
+                    parameters=tool_spec["parameters"],
+                    fn_metadata=_FORWARDING_TOOL_METADATA,
+                    is_async=True,
+                    spec=spec,
+                    module_stem=module_stem,
+                )
+            else:
+                tool = LazyIntegrationTool(
+                    fn=functools.partial(
+                        call_integration_tool,
+                        tools_by_name,
+                        module_stem,
+                        tool_spec["name"],
+                    ),
+                    name=tool_spec["name"],
+                    description=tool_spec["description"],
+                    parameters=tool_spec["parameters"],
+                    fn_metadata=_FORWARDING_TOOL_METADATA,
+                    is_async=True,
+                    module_stem=module_stem,
+                )
+            tools_by_name[tool_spec["name"]] = tool
+        logger.debug(
+            "Registered %d tools for %s from the manifest",
+            len(entry["tools"]),
+            module_stem,
+        )
+    return not_served
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Builds or checks the marketplace tool manifest."""
+    manifest_parser = argparse.ArgumentParser(
+        description="Build or check the SOAR marketplace tool manifest"
+    )
+    manifest_parser.add_argument("command", choices=["build", "check"])
+    manifest_parser.add_argument(
+        "--path", type=Path, default=MANIFEST_PATH, help="Manifest file location"
+    )
+    args = manifest_parser.parse_args(argv)
+
+    if args.command == "build":
+        manifest = build_manifest()
+        write_manifest(manifest, args.path)
+        tool_count = sum(
+            len(entry["tools"]) for entry in manifest["integrations"].values()
+        )
+        print(
+            f"Wrote {tool_count} tools from {len(manifest['integrations'])} "
+            f"integrations to {args.path}"
+        )
+        return 0
+
+    manifest = load_manifest(args.path)
+    if manifest is None:
+        print(f"No usable manifest at {args.path}")
+        return 1
+    stale = find_stale_integrations(manifest)
+    if stale:
+        print("Manifest is out of date for: " + ", ".join(stale))
+        return 1
+    print("Manifest is up to date.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,463 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Latency, status, size and concurrency metrics of SOAR requests and tool calls.
+
+Requests are labelled by method, endpoint template (e.g.
+`/api/1p/external/v1/cases/{CASE_ID}/comments`, never the concrete URL) and
+the integration whose marketplace action made them, so label values stay
+bounded. Each request attempt records two latencies: the time until the
+response headers arrived, which is SOAR's own latency, and the time until
+the body was read and decoded. Tool call durations are recorded as well, so
+the time spent in this server can be told apart from the time spent waiting
+on SOAR.
+
+The metrics can be rendered in the Prometheus text format or summarized.
+Worker processes hosting integrations send theirs as JSON snapshots, which
+are merged into those of the server.
+"""
+
+import bisect
+import contextlib
+import contextvars
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from secops_soar_mcp.utils.consts import Endpoints
+
+# Upper bounds in seconds of the latency histogram buckets.
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+OTHER_ENDPOINT = "other"
+# The integration whose marketplace action is running in the current task.
+current_integration: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_integration", default=""
+)
+
+
+@contextlib.contextmanager
+def integration_scope(integration: str) -> Iterator[None]:
+    """Labels the SOAR requests made inside the block with an integration."""
+    token = current_integration.set(integration)
+    try:
+        yield
+    finally:
+        current_integration.reset(token)
+
+
+def _compile_templates() -> List[Tuple[re.Pattern, str]]:
+    templates = {
+        value.split("?", 1)[0]
+        for name, value in vars(Endpoints).items()
+        if not name.startswith("_") and isinstance(value, str)
+    }
+    patterns = []
+    for template in templates:
+        pattern = re.sub(r"\\\{[A-Z_]+\\\}", "[^/]+", re.escape(template))
+        patterns.append((re.compile(pattern + "$"), template))
+    # Literal templates win over templates with placeholders.
+    patterns.sort(key=lambda item: (item[1].count("{"), -len(item[1])))
+    return patterns
+
+
+_TEMPLATES = _compile_templates()
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Returns the `Endpoints` template a concrete endpoint was formatted from."""
+    path = endpoint.split("?", 1)[0]
+    for pattern, template in _TEMPLATES:
+        if pattern.match(path):
+            return template
+    return OTHER_ENDPOINT
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations in seconds."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # The last count is for observations above every bucket.
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimates a quantile by interpolating within its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        """Yields the Prometheus `le` label and cumulative count of each bucket."""
+        total = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            yield ("+Inf" if bound == float("inf") else f"{bound:g}"), total
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"counts": list(self.counts), "sum": self.sum}
+
+    def merge(self, data: Dict[str, Any]):
+        for i, count in enumerate(data["counts"]):
+            self.counts[i] += count
+        self.count += sum(data["counts"])
+        self.sum += data["sum"]
+
+    def summary(self) -> Dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.sum / self.count) if self.count else None,
+            "p50_ms": ms(self.quantile(0.5)),
+            "p95_ms": ms(self.quantile(0.95)),
+            "p99_ms": ms(self.quantile(0.99)),
+        }
+
+
+class RequestSeries:
+    """The metrics of the requests sharing one method, endpoint and integration."""
+
+    def __init__(self):
+        self.time_to_headers = Histogram()
+        self.duration = Histogram()
+        # Keyed by HTTP status, 'error' for requests that got no response and
+        # 'cancelled' for requests abandoned by their caller.
+        self.statuses: Counter = Counter()
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.in_flight = 0
+
+    def record(
+        self,
+        status: Union[int, str, None],
+        duration: float,
+        request_bytes: int,
+        response_bytes: int,
+    ):
+        self.duration.observe(duration)
+        self.statuses[str(status) if status is not None else "error"] += 1
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "time_to_headers": self.time_to_headers.to_json(),
+            "duration": self.duration.to_json(),
+            "statuses": dict(self.statuses),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "in_flight": self.in_flight,
+        }
+
+    def merge(self, data: Dict[str, Any]):
+        self.time_to_headers.merge(data["time_to_headers"])
+        self.duration.merge(data["duration"])
+        self.statuses.update(data["statuses"])
+        self.request_bytes += data["request_bytes"]
+        self.response_bytes += data["response_bytes"]
+        self.in_flight += data["in_flight"]
+
+    def summary(self) -> Dict[str, Any]:
+        errors = sum(
+            count
+            for status, count in self.statuses.items()
+            if not status.isdigit() or int(status) >= 400
+        )
+        return {
+            "requests": self.duration.count,
+            "errors": errors,
+            "statuses": dict(self.statuses),
+            "in_flight": self.in_flight,
+            "time_to_headers": self.time_to_headers.summary(),
+            "duration": self.duration.summary(),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+        }
+
+
+class ToolSeries:
+    """The metrics of the calls of one tool."""
+
+    def __init__(self):
+        self.duration = Histogram()
+        self.failures = 0
+        self.in_flight = 0
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "duration": self.duration.to_json(),
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+        }
+
+    def merge(self, data: Dict[str, Any]):
+        self.duration.merge(data["duration"])
+        self.failures += data["failures"]
+        self.in_flight += data["in_flight"]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "calls": self.duration.count,
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+            "duration": self.duration.summary(),
+        }
+
+
+class Metrics:
+    """The request and tool call metrics of one server process."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests: Dict[Tuple[str, str, str], RequestSeries] = {}
+        self.tools: Dict[str, ToolSeries] = {}
+
+    def request_series(self, method: str, endpoint: str) -> RequestSeries:
+        """Returns the series of a request, labelled with the current integration."""
+        key = (method, endpoint_template(endpoint), current_integration.get())
+        series = self.requests.get(key)
+        if series is None:
+            series = self.requests[key] = RequestSeries()
+        return series
+
+    def tool_series(self, tool_name: str) -> ToolSeries:
+        series = self.tools.get(tool_name)
+        if series is None:
+            series = self.tools[tool_name] = ToolSeries()
+        return series
+
+    def to_json(self) -> Dict[str, Any]:
+        """Returns a snapshot of the metrics that `merge` can add to others."""
+        return {
+            "started": self.started,
+            "requests": [
+                [method, template, integration, series.to_json()]
+                for (method, template, integration), series in self.requests.items()
+            ],
+            "tools": {name: series.to_json() for name, series in self.tools.items()},
+        }
+
+    def merge(self, data: Dict[str, Any]):
+        """Adds a snapshot of the metrics of another process to these."""
+        self.started = min(self.started, data["started"])
+        for method, template, integration, series_data in data["requests"]:
+            key = (method, template, integration)
+            series = self.requests.get(key)
+            if series is None:
+                series = self.requests[key] = RequestSeries()
+            series.merge(series_data)
+        for name, series_data in data["tools"].items():
+            self.tool_series(name).merge(series_data)
+
+    @classmethod
+    def merged(cls, snapshots: List[Dict[str, Any]]) -> "Metrics":
+        """Returns the sum of metric snapshots."""
+        metrics = cls()
+        for snapshot in snapshots:
+            metrics.merge(snapshot)
+        return metrics
+
+    def summary(
+        self, endpoint: Optional[str] = None, integration: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Summarizes the metrics, optionally of one endpoint or integration.
+
+        Args:
+            endpoint: Only include endpoint templates containing this text.
+            integration: Only include requests made for this integration.
+        """
+        requests = []
+        for (method, template, series_integration), series in sorted(
+            self.requests.items()
+        ):
+            if endpoint and endpoint not in template:
+                continue
+            if integration is not None and series_integration != integration:
+                continue
+            requests.append(
+                {
+                    "method": method,
+                    "endpoint": template,
+                    "integration": series_integration or None,
+                    **series.summary(),
+                }
+            )
+        tools = {name: series.summary() for name, series in sorted(self.tools.items())}
+        return {
+            "uptime_seconds": round(time.time() - self.started),
+            "requests": requests,
+            "tools": tools,
+        }
+
+    def render_prometheus(self) -> str:
+        """Renders the metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name: str, labels: str, values: Histogram):
+            for le, count in values.cumulative():
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {values.sum:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {values.count}")
+
+        request_series = [
+            (
+                f'method="{method}",endpoint="{_escape(template)}",'
+                f'integration="{_escape(integration)}"',
+                series,
+            )
+            for (method, template, integration), series in sorted(
+                self.requests.items()
+            )
+        ]
+        family(
+            "soar_http_time_to_headers_seconds",
+            "histogram",
+            "Time until SOAR sent the response headers, per attempt.",
+        )
+        for labels, series in request_series:
+            histogram(
+                "soar_http_time_to_headers_seconds", labels, series.time_to_headers
+            )
+        family(
+            "soar_http_request_duration_seconds",
+            "histogram",
+            "Time until the response was read and decoded, per attempt.",
+        )
+        for labels, series in request_series:
+            histogram("soar_http_request_duration_seconds", labels, series.duration)
+        family(
+            "soar_http_responses_total",
+            "counter",
+            "Request attempts by response status, 'error' or 'cancelled'.",
+        )
+        for labels, series in request_series:
+            for status, count in sorted(series.statuses.items()):
+                lines.append(
+                    f'soar_http_responses_total{{{labels},status="{status}"}} {count}'
+                )
+        family("soar_http_request_bytes_total", "counter", "Request body bytes sent.")
+        for labels, series in request_series:
+            lines.append(
+                f"soar_http_request_bytes_total{{{labels}}} {series.request_bytes}"
+            )
+        family(
+            "soar_http_response_bytes_total", "counter", "Response body bytes received."
+        )
+        for labels, series in request_series:
+            lines.append(
+                f"soar_http_response_bytes_total{{{labels}}} {series.response_bytes}"
+            )
+        family("soar_http_in_flight_requests", "gauge", "Requests awaiting a response.")
+        for labels, series in request_series:
+            lines.append(f"soar_http_in_flight_requests{{{labels}}} {series.in_flight}")
+
+        tool_series = [
+            (f'tool="{_escape(name)}"', series)
+            for name, series in sorted(self.tools.items())
+        ]
+        family("soar_tool_call_duration_seconds", "histogram", "Duration of tool calls.")
+        for labels, series in tool_series:
+            histogram("soar_tool_call_duration_seconds", labels, series.duration)
+        family(
+            "soar_tool_call_failures_total",
+            "counter",
+            "Tool calls that raised or returned a failure.",
+        )
+        for labels, series in tool_series:
+            lines.append(f"soar_tool_call_failures_total{{{labels}}} {series.failures}")
+        family("soar_tool_calls_in_flight", "gauge", "Tool calls in progress.")
+        for labels, series in tool_series:
+            lines.append(f"soar_tool_calls_in_flight{{{labels}}} {series.in_flight}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def instrument_tool_calls(mcp, metrics_of) -> None:
+    """Records the duration and outcome of every tool call of a FastMCP server.
+
+    Args:
+        mcp: The server whose tool manager is wrapped.
+        metrics_of: Returns the `Metrics` to record into, or None to skip
+            recording (e.g. before the SOAR client is bound).
+    """
+    tool_manager = mcp._tool_manager
+    call_tool = tool_manager.call_tool
+
+    async def timed_call_tool(
+        name: str,
+        arguments: Dict[str, Any],
+        context: Any = None,
+        convert_result: bool = False,
+    ) -> Any:
+        metrics = metrics_of()
+        tool = tool_manager.get_tool(name)
+        if metrics is None or tool is None:
+            return await call_tool(
+                name, arguments, context=context, convert_result=convert_result
+            )
+        series = metrics.tool_series(name)
+        series.in_flight += 1
+        started = time.perf_counter()
+        failed = True
+        try:
+            # Converted after the fact, to see failures returned as dicts.
+            result = await call_tool(name, arguments, context=context)
+            failed = isinstance(result, dict) and result.get("Status") == "Failed"
+            if convert_result:
+                result = tool.fn_metadata.convert_result(result)
+            return result
+        finally:
+            series.in_flight -= 1
+            series.duration.observe(time.perf_counter() - started)
+            series.failures += failed
+
+    tool_manager.call_tool = timed_call_tool
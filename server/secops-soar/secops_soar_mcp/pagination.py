@@ -0,0 +1,76 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Server-side pagination over SOAR list endpoints."""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+from secops_soar_mcp.http_client import HttpClient, is_error_result
+
+NEXT_PAGE_TOKEN = "nextPageToken"
+
+
+async def iter_pages(
+    http_client: HttpClient,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    page_token: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    cache_tags: Optional[Iterable[str]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yields the pages of a paginated SOAR endpoint.
+
+    The next page is requested as soon as the current one arrives, so it is
+    usually ready by the time the caller has processed the current page.
+    Iteration stops after the last page, after `max_pages` pages, or after a
+    failed request, whose error result is yielded as the final page.
+    Callers that may stop early should iterate inside
+    `contextlib.aclosing(iter_pages(...))`: breaking out of the loop then
+    closes the generator, which cancels the prefetched request. Without it
+    the request stays in flight until the generator is garbage collected.
+
+    Args:
+        http_client: The client used to fetch pages.
+        endpoint: The API endpoint to page through.
+        params: Query parameters sent with every page.
+        page_token: A page token to resume from.
+        max_pages: The maximum number of pages to fetch.
+        cache_tags: Cache tags for the page requests (see `HttpClient.get`).
+    """
+
+    def fetch(token: Optional[str]) -> asyncio.Task:
+        page_params = dict(params or {})
+        if token:
+            page_params["pageToken"] = token
+        return asyncio.ensure_future(
+            http_client.get(endpoint, params=page_params or None, cache_tags=cache_tags)
+        )
+
+    pending = fetch(page_token)
+    pages = 0
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            pages += 1
+            if is_error_result(page):
+                yield page
+                return
+            next_token = page.get(NEXT_PAGE_TOKEN)
+            if next_token and (max_pages is None or pages < max_pages):
+                pending = fetch(next_token)
+            yield page
+    finally:
+        if pending is not None:
+            pending.cancel()
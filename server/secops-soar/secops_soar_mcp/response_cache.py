@@ -0,0 +1,146 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Bounded LRU + TTL cache for SOAR read responses."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Set
+
+# Tag of every cached response that lists cases.
+CASES_TAG = "cases"
+
+
+def case_tag(case_id: Any) -> str:
+    """Returns the tag of cached responses that belong to a case."""
+    return f"case:{case_id}"
+
+
+class _Entry(NamedTuple):
+    expires_at: float
+    value: Any
+    tags: frozenset
+
+
+class ResponseCache:
+    """Caches decoded responses by request key for a short time.
+
+    Entries carry tags (for example the case they belong to) so a write can
+    invalidate every cached read it affects. The least recently used entry is
+    evicted once `max_entries` is reached.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        # Bumped on invalidation so responses fetched before a write are not
+        # stored after it.
+        self._tag_versions: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value for a key, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def versions(self, tags: Iterable[str]) -> tuple:
+        """Snapshots the invalidation versions of tags before a fetch."""
+        return tuple(self._tag_versions.get(tag, 0) for tag in tags)
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        tags: Iterable[str] = (),
+        versions: Optional[tuple] = None,
+    ):
+        """Stores a value, evicting the least recently used entries if full.
+
+        Args:
+            key: The request key.
+            value: The decoded response.
+            tags: Tags used to invalidate the entry.
+            versions: The result of `versions(tags)` taken before the value
+                was fetched. The value is dropped if a tag was invalidated
+                in the meantime.
+        """
+        tags = tuple(tags)
+        if not self.enabled:
+            return
+        if versions is not None and versions != self.versions(tags):
+            return
+        if key in self._entries:
+            self._remove(key)
+        entry = _Entry(time.monotonic() + self.ttl, value, frozenset(tags))
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, *tags: str):
+        """Drops every entry carrying any of the given tags."""
+        for tag in tags:
+            self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
@@ -14,21 +14,50 @@
 """Main entry point for the SOAR MCP server."""
 
 import asyncio
-import importlib
-from pathlib import Path
+import contextlib
+import hmac
+import multiprocessing
+import os
+import socket
+import uvicorn
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
 from secops_soar_mcp import bindings
-from mcp.server.fastmcp import FastMCP
+from mcp.server.transport_security import TransportSecuritySettings
 from logger_utils import get_logger, setup_logging
 from secops_soar_mcp.case_management import (
     register_tools as register_tools_case_management,
 )
+from secops_soar_mcp.bulk_actions import register_tools as register_tools_bulk_actions
+from secops_soar_mcp.case_export import register_tools as register_tools_case_export
+from secops_soar_mcp.diagnostics import register_tools as register_tools_diagnostics
+from secops_soar_mcp.integration_manager import DynamicToolsMCP, IntegrationManager
+from secops_soar_mcp.integration_manager import (
+    register_tools as register_tools_integration_manager,
+)
+from secops_soar_mcp.manifest import MARKETPLACE_DIR, list_integration_modules
+from secops_soar_mcp.metrics import instrument_tool_calls
+from secops_soar_mcp.shards import ShardPool
+from secops_soar_mcp.utils.consts import ENV_SOAR_MCP_AUTH_TOKEN
 from secops_soar_mcp.utils.utils import normalize_integration_name
 import argparse
 
 logger = get_logger(__name__)
-mcp = FastMCP("SecOps SOAR")
+mcp = DynamicToolsMCP("SecOps SOAR")
+
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+METRICS_PATH = "/metrics"
 
 register_tools_case_management(mcp)
+register_tools_diagnostics(mcp)
+register_tools_bulk_actions(mcp)
+register_tools_case_export(mcp)
+
+integrations = IntegrationManager(mcp)
+register_tools_integration_manager(mcp, integrations)
+instrument_tool_calls(
+    mcp, lambda: bindings.http_client.metrics if bindings.http_client else None
+)
 
 parser = argparse.ArgumentParser(description="SecOps SOAR MCP Server")
 parser.add_argument(
@@ -38,6 +67,44 @@ parser.add_argument(
 parser.add_argument(
     "--verbose", action="store_true", help="Enable verbose (debug) logging"
 )
+parser.add_argument(
+    "--no-manifest",
+    action="store_true",
+    help="Import every enabled integration at startup instead of serving tools from the precomputed manifest",
+)
+parser.add_argument(
+    "--transport",
+    choices=["stdio", "streamable-http", "sse"],
+    default="stdio",
+    help="How MCP clients connect. The HTTP transports serve many clients from one process.",
+)
+parser.add_argument(
+    "--host", default="127.0.0.1", help="Address the HTTP transports listen on"
+)
+parser.add_argument(
+    "--port", type=int, default=8000, help="Port the HTTP transports listen on"
+)
+parser.add_argument(
+    "--allow-remote",
+    action="store_true",
+    help=f"Allow --host to be a non-loopback address. Clients must then send the token in {ENV_SOAR_MCP_AUTH_TOKEN} as a bearer token.",
+)
+parser.add_argument(
+    "--allowed-hosts",
+    help="Comma-separated Host header values accepted from remote clients, such as soar-mcp.example.com:8000. Defaults to <host>:<port>.",
+)
+parser.add_argument(
+    "--workers",
+    type=int,
+    default=1,
+    help="Worker processes sharing the port of the streamable-http transport. Workers serve requests statelessly.",
+)
+parser.add_argument(
+    "--shards",
+    type=int,
+    default=0,
+    help="Host the enabled integrations in this many worker processes and forward their tool calls. 0 hosts them in the server process.",
+)
 
 
 def get_enabled_integrations_set(integrations_arg: str) -> set:
@@ -67,83 +134,59 @@ def get_enabled_integrations_set(integrations_arg: str) -> set:
     return set()
 
 
-def register_tools(integrations_arg: str):
+async def register_tools(
+    integrations_arg: str,
+    use_manifest: bool = True,
+    shards: int = 0,
+    verbose: bool = False,
+):
     """Register tools for the MCP server.
 
+    Integrations recorded in an up-to-date tool manifest are registered without
+    importing their modules; the rest are imported eagerly.
+
     Args:
-        args: Parsed command line arguments."""
+        integrations_arg: Comma-separated integration names to enable.
+        use_manifest: Whether to serve tools from the precomputed manifest.
+        shards: The number of worker processes hosting the integrations, or 0
+            to host them in this process.
+        verbose: Whether the worker processes log debug messages."""
     enabled_integrations_set = get_enabled_integrations_set(integrations_arg)
 
     logger.info("Starting dynamic tool registration...")
     try:
-        script_dir = Path(__file__).parent.resolve()
-
-        marketplace_dir = script_dir / "marketplace"
+        if MARKETPLACE_DIR.is_dir():
+            logger.debug("Scanning for tools in: %s", MARKETPLACE_DIR)
 
-        if marketplace_dir.is_dir():
-            logger.debug("Scanning for tools in: %s", marketplace_dir)
-
-            init_file = marketplace_dir / "__init__.py"
+            init_file = MARKETPLACE_DIR / "__init__.py"
             if not init_file.exists():
                 logger.warning(
                     "Marketplace directory '%s' is missing __init__.py. Tool registration might fail.",
-                    marketplace_dir,
+                    MARKETPLACE_DIR,
                 )
 
-            for py_file in marketplace_dir.glob("*.py"):
-                if py_file.name == "__init__.py" or not py_file.is_file():
-                    continue
-
-                module_stem = py_file.stem  # The filename without .py (e.g., "csv")
-                if module_stem not in enabled_integrations_set:
-                    continue
-                module_import_path = f"marketplace.{module_stem}"  # The import path (e.g., "marketplace.csv")
-
-                try:
-                    logger.debug(
-                        "  Attempting to import module: %s", module_import_path
-                    )
-                    module = importlib.import_module(module_import_path)
-
-                    if hasattr(module, "register_tools") and callable(
-                        getattr(module, "register_tools")
-                    ):
-                        logger.info(
-                            "    Found register_tools in %s. Registering...",
-                            module_stem,
-                        )
-                        register_function = getattr(module, "register_tools")
-                        register_function(mcp)
-                        logger.debug(
-                            "    Successfully called register_tools for %s.",
-                            module_stem,
-                        )
-                    else:
-                        logger.warning(
-                            "    Module %s found, but it has no callable 'register_tools' function.",
-                            module_stem,
-                        )
-
-                except ImportError as e:
-                    logger.error(
-                        "  * Failed to import module %s. Error: %s",
-                        module_import_path,
-                        e,
-                        exc_info=True,
-                    )
-                except Exception as e:
-                    logger.error(
-                        "  * Failed during registration call for module %s. Error: %s",
-                        module_import_path,
-                        e,
-                        exc_info=True,
-                    )
+            module_stems = [
+                module_stem
+                for module_stem in list_integration_modules()
+                if module_stem in enabled_integrations_set
+            ]
+
+            integrations.use_manifest = use_manifest
+            if shards > 0:
+                integrations.shards = ShardPool(mcp, shards, use_manifest, verbose)
+                await integrations.shards.start()
+            registered = await integrations.enable(module_stems)
+            logger.info(
+                "Registered %d tools for %d integrations.",
+                sum(len(names) for names in registered.values()),
+                len(registered),
+            )
 
             logger.info("Finished scanning marketplace directory.")
         else:
             logger.warning(
                 "Marketplace directory not found at %s. No tools dynamically registered.",
-                marketplace_dir,
+                MARKETPLACE_DIR,
             )
 
     except Exception as e:
@@ -154,18 +197,202 @@ def register_tools(integrations_arg: str):
         )
 
 
+async def stop_shards():
+    """Stops the worker processes hosting integrations, if any."""
+    if integrations.shards is not None:
+        await integrations.shards.stop()
+
+
+class BearerTokenMiddleware:
+    """Rejects HTTP requests without the configured bearer token."""
+
+    def __init__(self, app, token: str):
+        self.app = app
+        self.expected = f"Bearer {token}".encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            authorization = dict(scope["headers"]).get(b"authorization", b"")
+            if not hmac.compare_digest(authorization, self.expected):
+                response = PlainTextResponse(
+                    "Unauthorized\n",
+                    status_code=401,
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+def http_exposure_error(args: argparse.Namespace):
+    """Returns why the HTTP transport must not listen on args.host, if so."""
+    if args.host in LOOPBACK_HOSTS:
+        return None
+    if not args.allow_remote:
+        return (
+            f"Refusing to listen on non-loopback address {args.host} "
+            "without --allow-remote"
+        )
+    if not os.environ.get(ENV_SOAR_MCP_AUTH_TOKEN):
+        return f"--allow-remote requires a bearer token in {ENV_SOAR_MCP_AUTH_TOKEN}"
+    return None
+
+
+def remote_transport_security(args: argparse.Namespace) -> TransportSecuritySettings:
+    """Host and Origin checks for clients of a non-loopback address."""
+    allowed_hosts = [f"{args.host}:{args.port}"]
+    if args.allowed_hosts:
+        allowed_hosts = [
+            host.strip() for host in args.allowed_hosts.split(",") if host.strip()
+        ]
+    return TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=allowed_hosts,
+        allowed_origins=[
+            f"{scheme}://{host}" for host in allowed_hosts for scheme in ("http", "https")
+        ],
+    )
+
+
+def create_http_app(args: argparse.Namespace):
+    """Builds the ASGI app serving MCP over HTTP.
+
+    SOAR is bound and the integrations are registered once when the app
+    starts, so every client of the process shares the HTTP connection pool
+    and caches. Request metrics are served in the Prometheus text format at
+    /metrics.
+
+    Non-loopback addresses need --allow-remote and a bearer token in
+    SOAR_MCP_AUTH_TOKEN; the token is also enforced on loopback if set.
+
+    Raises:
+        ValueError: If args.host must not be listened on."""
+    error = http_exposure_error(args)
+    if error:
+        raise ValueError(error)
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+    # Sessions cannot be pinned to one of several workers.
+    mcp.settings.stateless_http = args.workers > 1
+    if args.workers > 1:
+        integrations.read_only = (
+            "Integrations cannot be enabled or disabled while the server runs "
+            "with --workers; restart it with the integrations in --integrations"
+        )
+    if args.host not in LOOPBACK_HOSTS:
+        # FastMCP only accepts loopback Host headers by default.
+        mcp.settings.transport_security = remote_transport_security(args)
+
+    @mcp.custom_route(METRICS_PATH, methods=["GET"])
+    async def metrics(request: Request) -> Response:
+        if bindings.http_client is None:
+            return PlainTextResponse("SOAR is not bound yet\n", status_code=503)
+        metrics = await bindings.request_metrics()
+        return PlainTextResponse(
+            metrics.render_prometheus(),
+            media_type="text/plain; version=0.0.4",
+        )
+
+    if args.transport == "sse":
+        app = mcp.sse_app()
+    else:
+        app = mcp.streamable_http_app()
+    server_lifespan = app.router.lifespan_context
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        await bindings.bind()
+        try:
+            await register_tools(
+                args.integrations,
+                use_manifest=not args.no_manifest,
+                shards=args.shards,
+                verbose=args.verbose,
+            )
+            async with server_lifespan(app):
+                yield
+        finally:
+            await stop_shards()
+            await bindings.cleanup()
+
+    app.router.lifespan_context = lifespan
+    token = os.environ.get(ENV_SOAR_MCP_AUTH_TOKEN)
+    if token:
+        app.add_middleware(BearerTokenMiddleware, token=token)
+    return app
+
+
+async def serve_http(args: argparse.Namespace, sockets=None):
+    """Serves MCP over HTTP until the process is stopped."""
+    config = uvicorn.Config(
+        create_http_app(args),
+        host=args.host,
+        port=args.port,
+        log_level="debug" if args.verbose else "info",
+    )
+    await uvicorn.Server(config).serve(sockets=sockets)
+
+
+def _run_http_worker(args: argparse.Namespace, sock: socket.socket):
+    setup_logging(args.verbose)
+    asyncio.run(serve_http(args, sockets=[sock]))
+
+
+async def run_http_workers(args: argparse.Namespace):
+    """Serves MCP over HTTP from several processes sharing one socket."""
+    sock = socket.create_server(
+        (args.host, args.port),
+        family=socket.AF_INET6 if ":" in args.host else socket.AF_INET,
+    )
+    sock.set_inheritable(True)
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_run_http_worker, args=(args, sock), daemon=True)
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    logger.info(
+        "Started %d workers on http://%s:%d", len(workers), args.host, args.port
+    )
+    try:
+        await asyncio.gather(*(asyncio.to_thread(worker.join) for worker in workers))
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        sock.close()
+
+
 async def main():
     """Main function."""
     args = parser.parse_args()
     setup_logging(args.verbose)
     logger.info("Starting SecOps SOAR MCP server")
+    if args.transport != "stdio":
+        error = http_exposure_error(args)
+        if error:
+            logger.error(error)
+        elif args.workers > 1 and args.transport != "streamable-http":
+            logger.error("--workers requires the streamable-http transport")
+        elif args.workers > 1:
+            await run_http_workers(args)
+        else:
+            await serve_http(args)
+        return
     try:
         await bindings.bind()
-        register_tools(args.integrations)
+        await register_tools(
+            args.integrations,
+            use_manifest=not args.no_manifest,
+            shards=args.shards,
+            verbose=args.verbose,
+        )
         await mcp.run_stdio_async()
     except Exception as e:
         logger.error("Error: %s", e)
     finally:
+        await stop_shards()
         await bindings.cleanup()
 
 
@@ -0,0 +1,473 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Hosting marketplace integrations in a pool of worker processes.
+
+The front-end server keeps the core tools and advertises the tools of every
+enabled integration, but the integrations themselves are imported by worker
+processes (shards), each hosting a subset. Calls are forwarded to the owning
+shard over a Unix socket pair as newline-delimited JSON:
+
+    request:  {"id": 1, "method": "call", "name": "...", "arguments": {...}}
+    response: {"id": 1, "result": ...} or {"id": 1, "error": "..."}
+    event:    {"event": "invalidate_case", "case_id": "..."}
+
+Workers are started in parallel, import their integrations in parallel, and
+a worker that exits is restarted with its integrations on the next call. A
+worker that does not answer within SOAR_SHARD_REQUEST_TIMEOUT seconds is
+killed and restarted.
+
+Workers send their SOAR requests with their own HTTP client, so they tell
+the server which cases their actions may have changed, before answering the
+call, and report their circuit breakers and request metrics on demand
+(`bindings.circuit_breaker_status` and `bindings.request_metrics`).
+
+Run as `python -m secops_soar_mcp.shards --fd <fd>` by `ShardPool` only.
+"""
+
+import argparse
+import asyncio
+import functools
+import itertools
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from logger_utils import get_logger, setup_logging
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.server.fastmcp.tools import Tool
+from mcp.server.fastmcp.utilities.func_metadata import ArgModelBase, FuncMetadata
+from secops_soar_mcp import bindings
+from secops_soar_mcp.codec import PydanticCodec
+from secops_soar_mcp.integration_manager import IntegrationManager
+from secops_soar_mcp.manifest import MARKETPLACE_DIR
+from secops_soar_mcp.utils import consts
+
+logger = get_logger(__name__)
+
+# Tool results can be large; the default stream line limit is 64 KiB.
+MAX_MESSAGE_SIZE = 256 * 1024 * 1024
+# Seconds diagnostics wait for the breakers and metrics of a shard.
+SNAPSHOT_TIMEOUT = 5.0
+_codec = PydanticCodec()
+
+
+# Arguments are validated by the worker, against the tool's own model.
+_SHARD_TOOL_METADATA = FuncMetadata(arg_model=ArgModelBase)
+
+
+async def call_shard_tool(shard: "Shard", tool_name: str, arguments: Dict[str, Any]):
+    """Forwards a tool call to the shard hosting the tool."""
+    return await shard.request("call", name=tool_name, arguments=arguments)
+
+
+class ShardTool(Tool):
+    """A marketplace tool whose calls are forwarded to the shard hosting it."""
+
+    module_stem: str
+
+    async def run(
+        self,
+        arguments: Dict[str, Any],
+        context: Any = None,
+        convert_result: bool = False,
+    ) -> Any:
+        try:
+            result = await self.fn(arguments)
+        except Exception as e:
+            raise ToolError(f"Error executing tool {self.name}: {e}") from e
+        if convert_result:
+            result = self.fn_metadata.convert_result(result)
+        return result
+
+
+class Shard:
+    """A worker process hosting some integrations, and the connection to it."""
+
+    def __init__(
+        self,
+        index: int,
+        use_manifest: bool,
+        verbose: bool,
+        timeout: float = consts.DEFAULT_SHARD_REQUEST_TIMEOUT,
+    ):
+        self.index = index
+        self.use_manifest = use_manifest
+        self.verbose = verbose
+        self.timeout = timeout
+        self.integrations: List[str] = []
+        self.restarts = 0
+        self.timeouts = 0
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._restart_task: Optional[asyncio.Task] = None
+        # Requests awaiting an answer from the current process.
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self):
+        """Starts the worker process and connects to it."""
+        parent, child = socket.socketpair()
+        package_root = str(Path(__file__).resolve().parents[1])
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [package_root, env.get("PYTHONPATH")])
+        )
+        args = [
+            sys.executable,
+            "-m",
+            "secops_soar_mcp.shards",
+            "--fd",
+            str(child.fileno()),
+        ]
+        if not self.use_manifest:
+            args.append("--no-manifest")
+        if self.verbose:
+            args.append("--verbose")
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                *args, pass_fds=[child.fileno()], env=env, stdout=sys.stderr
+            )
+        finally:
+            child.close()
+        reader, self._writer = await asyncio.open_unix_connection(
+            sock=parent, limit=MAX_MESSAGE_SIZE
+        )
+        self._pending = {}
+        self._reader_task = asyncio.create_task(
+            self._read_responses(reader, self._pending)
+        )
+        logger.info("Started shard %d (pid %d)", self.index, self._process.pid)
+
+    async def request(self, method: str, **payload) -> Any:
+        """Sends a request to the worker and returns its result.
+
+        A worker that is not running is restarted with its integrations first.
+        """
+        await self._ensure_running()
+        return await self._send(method, **payload)
+
+    async def stop(self):
+        if self._restart_task is not None:
+            self._restart_task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+        if self._process is not None and self._process.returncode is None:
+            try:
+                await asyncio.wait_for(self._process.wait(), timeout=10)
+            except asyncio.TimeoutError:
+                self._process.kill()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pid": self._process.pid if self.running else None,
+            "running": self.running,
+            "integrations": list(self.integrations),
+            "in_flight": len(self._pending),
+            "restarts": self.restarts,
+            "timeouts": self.timeouts,
+        }
+
+    async def _ensure_running(self):
+        if self.running:
+            return
+        async with self._start_lock:
+            if not self.running:
+                self.restarts += 1
+                logger.warning("Restarting shard %d", self.index)
+                await self.start()
+                if self.integrations:
+                    await self._send("enable", integrations=self.integrations)
+
+    async def _send(self, method: str, **payload) -> Any:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        process, pending = self._process, self._pending
+        pending[request_id] = future
+        try:
+            self._writer.write(
+                _codec.dumps({"id": request_id, "method": method, **payload}) + b"\n"
+            )
+            await self._writer.drain()
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.error(
+                "Shard %d did not answer %s within %gs, restarting it",
+                self.index,
+                method,
+                self.timeout,
+            )
+            await self._kill(process)
+            if self._restart_task is None or self._restart_task.done():
+                self._restart_task = asyncio.create_task(self._restart())
+            raise TimeoutError(
+                f"Shard {self.index} did not answer within {self.timeout:g}s"
+            ) from None
+        finally:
+            pending.pop(request_id, None)
+
+    async def _kill(self, process: asyncio.subprocess.Process):
+        if process is self._process and process.returncode is None:
+            process.kill()
+            await process.wait()
+
+    async def _restart(self):
+        try:
+            await self._ensure_running()
+        except Exception as e:
+            # Retried by the next call to one of its tools.
+            logger.error("Failed to restart shard %d: %s", self.index, e)
+
+    async def _read_responses(
+        self, reader: asyncio.StreamReader, pending: Dict[int, asyncio.Future]
+    ):
+        try:
+            while line := await reader.readline():
+                response = _codec.loads(line)
+                if "event" in response:
+                    self._handle_event(response)
+                    continue
+                future = pending.get(response["id"])
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(RuntimeError(response["error"]))
+                else:
+                    future.set_result(response.get("result"))
+        except Exception as e:
+            logger.error("Lost connection to shard %d: %s", self.index, e)
+        finally:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError(f"Shard {self.index} exited")
+                    )
+
+    def _handle_event(self, event: Dict[str, Any]):
+        if event["event"] == "invalidate_case" and bindings.http_client is not None:
+            bindings.invalidate_case_cache(event["case_id"])
+
+
+class ShardPool:
+    """Spreads integrations over worker processes and registers proxy tools."""
+
+    def __init__(
+        self, mcp: FastMCP, size: int, use_manifest: bool = True, verbose: bool = False
+    ):
+        self.mcp = mcp
+        timeout = float(
+            os.getenv(
+                consts.ENV_SOAR_SHARD_REQUEST_TIMEOUT,
+                consts.DEFAULT_SHARD_REQUEST_TIMEOUT,
+            )
+        )
+        self.shards = [
+            Shard(i, use_manifest, verbose, timeout) for i in range(max(1, size))
+        ]
+        self._owners: Dict[str, Shard] = {}
+
+    async def start(self):
+        """Starts every worker process in parallel."""
+        await asyncio.gather(*(shard.start() for shard in self.shards))
+        bindings.worker_snapshots = self.snapshots
+
+    async def stop(self):
+        if bindings.worker_snapshots == self.snapshots:
+            bindings.worker_snapshots = None
+        await asyncio.gather(*(shard.stop() for shard in self.shards))
+
+    async def snapshots(self) -> List[Dict[str, Any]]:
+        """Returns the breakers and metrics of the running shards."""
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(shard._send("snapshot"), SNAPSHOT_TIMEOUT)
+                for shard in self.shards
+                if shard.running
+            ),
+            return_exceptions=True,
+        )
+        return [result for result in results if isinstance(result, dict)]
+
+    async def enable(self, module_stems: List[str]) -> Dict[str, List[str]]:
+        """Assigns integrations to shards and registers their tools.
+
+        Integrations are placed on the shard with the least source code to
+        import, largest first, so import work is spread evenly.
+
+        Returns:
+            The names of the tools registered for each integration.
+        """
+        load = {shard: self._source_size(shard.integrations) for shard in self.shards}
+        assignments: Dict[Shard, List[str]] = {}
+        for module_stem in sorted(
+            module_stems, key=lambda stem: self._source_size([stem]), reverse=True
+        ):
+            shard = min(self.shards, key=lambda shard: (load[shard], shard.index))
+            load[shard] += self._source_size([module_stem])
+            assignments.setdefault(shard, []).append(module_stem)
+
+        results = await asyncio.gather(
+            *(
+                shard.request("enable", integrations=stems)
+                for shard, stems in assignments.items()
+            ),
+            return_exceptions=True,
+        )
+        tools = self.mcp._tool_manager._tools
+        registered = {}
+        for (shard, stems), result in zip(assignments.items(), results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Shard %d failed to enable %s: %s", shard.index, stems, result
+                )
+                continue
+            for module_stem, tool_specs in result.items():
+                shard.integrations.append(module_stem)
+                self._owners[module_stem] = shard
+                for tool_spec in tool_specs:
+                    tools[tool_spec["name"]] = ShardTool(
+                        fn=functools.partial(call_shard_tool, shard, tool_spec["name"]),
+                        name=tool_spec["name"],
+                        description=tool_spec["description"],
+                        parameters=tool_spec["parameters"],
+                        fn_metadata=_SHARD_TOOL_METADATA,
+                        is_async=True,
+                        module_stem=module_stem,
+                    )
+                registered[module_stem] = [spec["name"] for spec in tool_specs]
+        return registered
+
+    async def disable(self, module_stems: List[str]):
+        """Unloads integrations from the shards hosting them."""
+        by_shard: Dict[Shard, List[str]] = {}
+        for module_stem in module_stems:
+            shard = self._owners.pop(module_stem, None)
+            if shard is not None:
+                shard.integrations.remove(module_stem)
+                by_shard.setdefault(shard, []).append(module_stem)
+        await asyncio.gather(
+            *(
+                shard.request("disable", integrations=stems)
+                for shard, stems in by_shard.items()
+            ),
+            return_exceptions=True,
+        )
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [shard.status() for shard in self.shards]
+
+    @staticmethod
+    def _source_size(module_stems: List[str]) -> int:
+        return sum(
+            (MARKETPLACE_DIR / f"{module_stem}.py").stat().st_size
+            for module_stem in module_stems
+        )
+
+
+async def _handle_request(
+    manager: IntegrationManager, request: Dict[str, Any]
+) -> Any:
+    method = request["method"]
+    if method == "call":
+        return await manager.mcp._tool_manager.call_tool(
+            request["name"], request["arguments"]
+        )
+    if method == "enable":
+        registered = await manager.enable(request["integrations"])
+        tools = manager.mcp._tool_manager._tools
+        return {
+            module_stem: [
+                {
+                    "name": name,
+                    "description": tools[name].description,
+                    "parameters": tools[name].parameters,
+                }
+                for name in names
+            ]
+            for module_stem, names in registered.items()
+        }
+    if method == "disable":
+        return await manager.disable(request["integrations"])
+    if method == "snapshot":
+        return {
+            "breakers": bindings.circuit_breakers.status(),
+            "metrics": bindings.http_client.metrics.to_json(),
+        }
+    raise ValueError(f"Unknown method {method}")
+
+
+async def serve_worker(fd: int, use_manifest: bool):
+    """Serves requests of the front end until it closes the connection."""
+    manager = IntegrationManager(FastMCP("SecOps SOAR shard"), use_manifest)
+    await bindings.bind()
+    reader, writer = await asyncio.open_unix_connection(
+        sock=socket.socket(fileno=fd), limit=MAX_MESSAGE_SIZE
+    )
+
+    def case_invalidated(case_id):
+        # Written before the response of the call that caused it.
+        writer.write(
+            _codec.dumps({"event": "invalidate_case", "case_id": case_id}) + b"\n"
+        )
+
+    bindings.on_case_invalidated = case_invalidated
+
+    async def respond(request: Dict[str, Any]):
+        response = {"id": request["id"]}
+        try:
+            response["result"] = await _handle_request(manager, request)
+        except Exception as e:
+            response["error"] = str(e)
+        try:
+            line = _codec.dumps(response)
+        except Exception as e:
+            line = _codec.dumps({"id": request["id"], "error": str(e)})
+        writer.write(line + b"\n")
+        await writer.drain()
+
+    tasks = set()
+    try:
+        while line := await reader.readline():
+            task = asyncio.create_task(respond(_codec.loads(line)))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await bindings.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SecOps SOAR integration shard")
+    parser.add_argument("--fd", type=int, required=True)
+    parser.add_argument("--no-manifest", action="store_true")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    setup_logging(args.verbose)
+    asyncio.run(serve_worker(args.fd, use_manifest=not args.no_manifest))
+
+
+if __name__ == "__main__":
+    main()
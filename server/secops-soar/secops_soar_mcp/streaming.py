@@ -0,0 +1,280 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Incremental decoding of large JSON responses with field projection.
+
+Responses such as the involved events of an alert can be megabytes of raw
+events of which the caller needs a handful of fields. `decode_projected`
+walks the response body chunk by chunk and decodes the items of its
+arrays one at a time, keeping only the requested fields of each item, so
+the full payload is never held in memory.
+
+The end of each item is found by scanning its structure incrementally as
+chunks arrive; the item is then decoded once, so large items cost time
+linear in their size.
+"""
+
+import codecs
+import json
+import re
+from typing import (
+    Any,
+    AsyncIterable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+CHUNK_SIZE = 64 * 1024
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+# Characters that change the nesting of a value, and the contents of a string.
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_SCALAR_END = re.compile(r"[,\]}\s]")
+
+
+class Projection(NamedTuple):
+    """Selects the fields kept from the items of a response's top-level arrays."""
+
+    # Dotted field paths, e.g. "event.principal.ip". Lists along a path are
+    # projected element by element.
+    fields: Tuple[str, ...]
+    # Only project the array stored under this key, or under this dotted path
+    # of object keys (e.g. "data.events"). None projects every top-level
+    # array, or the response itself if it is an array.
+    array_key: Optional[str] = None
+
+    def key(self) -> str:
+        """Returns a string identifying the projection in request keys."""
+        return json.dumps([self.array_key, sorted(self.fields)])
+
+
+def _field_tree(fields: Iterable[str]) -> Dict[str, Any]:
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        node = tree
+        parts = [part for part in field.split(".") if part]
+        for i, part in enumerate(parts):
+            if i == len(parts) - 1:
+                node[part] = None
+            elif node.get(part, {}) is not None:
+                node = node.setdefault(part, {})
+            else:
+                # A parent path was already selected as a whole.
+                break
+    return tree
+
+
+def _apply(value: Any, tree: Optional[Dict[str, Any]]) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_apply(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {
+            name: _apply(value[name], subtree)
+            for name, subtree in tree.items()
+            if name in value
+        }
+    return value
+
+
+def project(value: Any, fields: Iterable[str]) -> Any:
+    """Returns a copy of `value` containing only the given dotted field paths."""
+    return _apply(value, _field_tree(fields))
+
+
+class _Buffer:
+    """Text buffer over an async stream of byte chunks."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self, at_least: int = 1) -> bool:
+        """Appends at least `at_least` bytes of input, or what is left of it.
+
+        Returns False if the stream had already ended.
+        """
+        if self.eof:
+            return False
+        parts = []
+        size = 0
+        while size < at_least:
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self.eof = True
+                break
+            parts.append(chunk)
+            size += len(chunk)
+        if not parts and self.eof:
+            self.text += self._utf8.decode(b"", final=True)
+            return False
+        # Drop consumed text so memory stays bounded by the chunk and item size.
+        self.text = self.text[self.pos :] + self._utf8.decode(
+            b"".join(parts), final=self.eof
+        )
+        self.pos = 0
+        return True
+
+    async def peek(self) -> str:
+        """Skips whitespace and returns the next character ('' at the end)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not await self.fill():
+                return ""
+
+    async def expect(self, chars: str) -> str:
+        char = await self.peek()
+        if not char or char not in chars:
+            raise ValueError(
+                f"Malformed JSON: expected one of {chars!r}, got {char or 'end of input'!r}"
+            )
+        self.pos += 1
+        return char
+
+    async def value(self) -> Any:
+        """Decodes the next complete JSON value."""
+        if await self.peek() in ("[", "{", '"'):
+            end = await self._scan_to_end()
+            value, _ = _decoder.raw_decode(self.text, self.pos)
+            self.pos = end
+            return value
+        # Numbers and literals are short, but may be cut off by a chunk.
+        while not _SCALAR_END.search(self.text, self.pos) and await self.fill():
+            pass
+        value, self.pos = _decoder.raw_decode(self.text, self.pos)
+        return value
+
+    async def _scan_to_end(self) -> int:
+        """Returns the end of the array, object or string starting at `pos`.
+
+        Only brackets, braces, quotes and escapes are looked at, resuming
+        where the previous chunk left off. Input is read in doubling steps, so
+        an item spanning many chunks is re-buffered a logarithmic number of
+        times.
+        """
+        depth = 0
+        in_string = False
+        # Kept relative to `pos`, which `fill` moves.
+        offset = 0
+        while True:
+            i = self.pos + offset
+            while True:
+                if in_string:
+                    # Stops at the closing quote, the end of the text, or an
+                    # escape whose character is in the next chunk.
+                    i = _STRING_BODY.match(self.text, i).end()
+                    if i == len(self.text) or self.text[i] != '"':
+                        break
+                    i += 1
+                    in_string = False
+                    if depth == 0:
+                        return i
+                    continue
+                match = _STRUCTURE.search(self.text, i)
+                if match is None:
+                    i = len(self.text)
+                    break
+                i = match.end()
+                char = match.group()
+                if char == '"':
+                    in_string = True
+                elif char in "[{":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return i
+            offset = i - self.pos
+            if not await self.fill(max(CHUNK_SIZE, len(self.text) - self.pos)):
+                raise ValueError("Malformed JSON: unexpected end of input")
+
+
+async def _decode_array(buffer: _Buffer, tree: Optional[Dict[str, Any]]) -> list:
+    await buffer.expect("[")
+    items = []
+    if await buffer.peek() == "]":
+        buffer.pos += 1
+        return items
+    while True:
+        items.append(_apply(await buffer.value(), tree))
+        if await buffer.expect(",]") == "]":
+            return items
+
+
+async def _decode_object(
+    buffer: _Buffer, tree: Optional[Dict[str, Any]], path: Optional[List[str]]
+) -> dict:
+    """Decodes an object, projecting the arrays selected by `path`.
+
+    With no path every array member is projected; otherwise only the member
+    named by the first key, descending into objects for the remaining keys.
+    """
+    await buffer.expect("{")
+    document = {}
+    if await buffer.peek() == "}":
+        buffer.pos += 1
+        return document
+    while True:
+        name = await buffer.value()
+        await buffer.expect(":")
+        selected = path is None or name == path[0]
+        rest = path[1:] if path else None
+        next_char = await buffer.peek()
+        if selected and next_char == "[" and not rest:
+            document[name] = await _decode_array(buffer, tree)
+        elif selected and next_char == "{" and rest:
+            document[name] = await _decode_object(buffer, tree, rest)
+        else:
+            document[name] = await buffer.value()
+        if await buffer.expect(",}") == "}":
+            return document
+
+
+async def decode_projected(
+    chunks: AsyncIterable[bytes], projection: Projection
+) -> Any:
+    """Decodes a JSON document from byte chunks, projecting array items.
+
+    Args:
+        chunks: The response body, e.g. `response.content.iter_chunked(CHUNK_SIZE)`.
+        projection: The fields to keep from each array item, and which
+            arrays to project.
+
+    Returns:
+        The decoded document, or an empty dict for an empty body. Values
+        outside the projected arrays are kept as is.
+    """
+    buffer = _Buffer(chunks)
+    tree = _field_tree(projection.fields)
+    path = projection.array_key.split(".") if projection.array_key else None
+    first = await buffer.peek()
+    if not first:
+        return {}
+    if first == "[" and path is None:
+        return await _decode_array(buffer, tree)
+    if first != "{":
+        return await buffer.value()
+    return await _decode_object(buffer, tree, path)
@@ -15,6 +15,43 @@
 
 ENV_SOAR_URL = "SOAR_URL"
 ENV_SOAR_APP_KEY = "SOAR_APP_KEY"
+ENV_SOAR_INSTANCE_CACHE_TTL = "SOAR_INSTANCE_CACHE_TTL"
+ENV_SOAR_INSTANCE_CACHE_REFRESH_AFTER = "SOAR_INSTANCE_CACHE_REFRESH_AFTER"
+ENV_SOAR_HTTP_POOL_SIZE = "SOAR_HTTP_POOL_SIZE"
+ENV_SOAR_HTTP_POOL_SIZE_PER_HOST = "SOAR_HTTP_POOL_SIZE_PER_HOST"
+ENV_SOAR_HTTP_DNS_CACHE_TTL = "SOAR_HTTP_DNS_CACHE_TTL"
+ENV_SOAR_HTTP_KEEPALIVE_TIMEOUT = "SOAR_HTTP_KEEPALIVE_TIMEOUT"
+ENV_SOAR_HTTP_CONNECT_TIMEOUT = "SOAR_HTTP_CONNECT_TIMEOUT"
+ENV_SOAR_HTTP_READ_TIMEOUT = "SOAR_HTTP_READ_TIMEOUT"
+ENV_SOAR_HTTP_TOTAL_TIMEOUT = "SOAR_HTTP_TOTAL_TIMEOUT"
+ENV_SOAR_HTTP_MAX_ATTEMPTS = "SOAR_HTTP_MAX_ATTEMPTS"
+ENV_SOAR_HTTP_BACKOFF_BASE = "SOAR_HTTP_BACKOFF_BASE"
+ENV_SOAR_HTTP_BACKOFF_MAX = "SOAR_HTTP_BACKOFF_MAX"
+ENV_SOAR_HTTP_MAX_RETRY_AFTER = "SOAR_HTTP_MAX_RETRY_AFTER"
+ENV_SOAR_HTTP_COALESCE_GETS = "SOAR_HTTP_COALESCE_GETS"
+ENV_SOAR_RESPONSE_CACHE_TTL = "SOAR_RESPONSE_CACHE_TTL"
+ENV_SOAR_RESPONSE_CACHE_MAX_ENTRIES = "SOAR_RESPONSE_CACHE_MAX_ENTRIES"
+ENV_SOAR_ACTION_RATE_LIMIT = "SOAR_ACTION_RATE_LIMIT"
+ENV_SOAR_JSON_CODEC = "SOAR_JSON_CODEC"
+ENV_SOAR_CIRCUIT_BREAKER_FAILURE_THRESHOLD = "SOAR_CIRCUIT_BREAKER_FAILURE_THRESHOLD"
+ENV_SOAR_CIRCUIT_BREAKER_RESET_TIMEOUT = "SOAR_CIRCUIT_BREAKER_RESET_TIMEOUT"
+ENV_SOAR_SHARD_REQUEST_TIMEOUT = "SOAR_SHARD_REQUEST_TIMEOUT"
+ENV_SOAR_EXPORT_DIR = "SOAR_EXPORT_DIR"
+# Bearer token HTTP clients must send; required to listen on other interfaces.
+ENV_SOAR_MCP_AUTH_TOKEN = "SOAR_MCP_AUTH_TOKEN"
+
+DEFAULT_INSTANCE_CACHE_TTL = 600.0
+DEFAULT_INSTANCE_CACHE_REFRESH_AFTER = 300.0
+# Marketplace actions started per second and integration by bulk runs.
+DEFAULT_ACTION_RATE_LIMIT = 5.0
+# Consecutive failures that open an integration's circuit, and how long it
+# stays open before a probe is let through.
+DEFAULT_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+DEFAULT_CIRCUIT_BREAKER_RESET_TIMEOUT = 30.0
+# Seconds to wait for a worker hosting integrations before restarting it.
+DEFAULT_SHARD_REQUEST_TIMEOUT = 600.0
+# Directory the export_cases tool writes into, relative to the working directory.
+DEFAULT_EXPORT_DIR = "exports"
 
 
 class Endpoints:
@@ -14,6 +14,7 @@
 from enum import StrEnum
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional, Any
+from secops_soar_mcp.utils.pydantic_list_field import PydanticListField
 
 
 class CasePriority(StrEnum):
@@ -30,6 +31,17 @@ class TargetEntity(BaseModel):
     EntityType: str
 
 
+class BulkActionTarget(BaseModel):
+    case_id: str = Field(..., description="The ID of the case.")
+    alert_group_identifiers: List[str] = Field(
+        ..., description="Identifiers for the alert groups."
+    )
+    target_entities: List[TargetEntity] = PydanticListField(
+        TargetEntity,
+        description="Optional list of specific target entities (Identifier, EntityType) to run the action on.",
+    )
+
+
 class ApiManualActionDataModel(BaseModel):
     caseId: int
     targetEntities: List[Any] = Field(default_factory=list)
@@ -21,6 +21,7 @@ setup(
     name="secops-soar-mcp",
     version="0.1.0",
     packages=setuptools.find_packages(),
+    package_data={"secops_soar_mcp": ["marketplace_manifest.json"]},
     entry_points={
         "console_scripts": [
             "secops-soar-mcp=secops_soar_mcp.server:main",
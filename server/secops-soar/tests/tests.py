@@ -39,6 +39,11 @@ from tests.conftest import setup_bindings
     argnames=["tool_name", "tool_arguments", "expected_substring"],
     argvalues=[
         ("list_cases", None, "cases"),
+        ("search_cases", {"max_results": 1, "max_pages": 2}, "pages_scanned"),
+        ("get_server_diagnostics", None, "http_pool"),
+        ("get_integration_health", None, "unavailable"),
+        ("get_request_metrics", None, "requests"),
+        ("list_integrations", None, "available"),
     ],
 )
 async def test_tool(tool_name, tool_arguments, expected_substring):
@@ -0,0 +1,65 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Fixtures for the offline unit tests, backed by the local fake SOAR API."""
+
+from typing import Any, Dict, List
+
+import pytest
+import pytest_asyncio
+from benchmarks import fake_soar
+from secops_soar_mcp import bindings
+from secops_soar_mcp.utils import consts
+
+
+@pytest.fixture
+def fake_soar_config() -> fake_soar.FakeSoarConfig:
+    """Configuration of the fake SOAR API; override to change its data or faults."""
+    return fake_soar.FakeSoarConfig(latency_ms=0, cases=20, page_size=5)
+
+
+@pytest_asyncio.fixture
+async def fake_soar_url(fake_soar_config: fake_soar.FakeSoarConfig):
+    """Starts the fake SOAR API and returns its base URL."""
+    runner, url = await fake_soar.start(fake_soar_config)
+    yield url
+    await runner.cleanup()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def setup_bindings(fake_soar_url: str, monkeypatch: pytest.MonkeyPatch):
+    """Binds the SOAR client to the fake API instead of a tenant."""
+    monkeypatch.setenv(consts.ENV_SOAR_URL, fake_soar_url)
+    monkeypatch.setenv(consts.ENV_SOAR_APP_KEY, "fake")
+    await bindings.bind()
+    yield
+    await bindings.cleanup()
+
+
+@pytest.fixture
+def executed_actions(
+    setup_bindings, monkeypatch: pytest.MonkeyPatch
+) -> List[Dict[str, Any]]:
+    """Records the bodies of ExecuteManualAction requests instead of sending them."""
+    recorded = []
+    client = bindings.http_client
+    post = client.post
+
+    async def recording_post(endpoint, req=None, *args, **kwargs):
+        if endpoint != consts.Endpoints.EXECUTE_MANUAL_ACTION:
+            return await post(endpoint, req, *args, **kwargs)
+        recorded.append(client.codec.loads(client.codec.dumps(req)))
+        return {"status": "Completed"}
+
+    monkeypatch.setattr(client, "post", recording_post)
+    return recorded
@@ -0,0 +1,42 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for running one marketplace action across many targets."""
+
+import copy
+
+from mcp.server.fastmcp import FastMCP
+from secops_soar_mcp import manifest
+from secops_soar_mcp.bulk_actions import integration_of
+
+
+def test_rate_limiter_key_does_not_depend_on_how_tools_are_served():
+    module_stem = "any.run"
+    recorded = manifest.load_manifest()
+    lazy_manifest = copy.deepcopy(recorded)
+    for tool_spec in lazy_manifest["integrations"][module_stem]["tools"]:
+        tool_spec.pop("action")
+    served = []
+    for entries in (recorded, lazy_manifest):
+        server = FastMCP("bulk")
+        manifest.register_from_manifest(server, entries, [module_stem])
+        served.extend(server._tool_manager._tools.values())
+    served.extend(manifest.load_integration_tools(module_stem))
+    served.extend(manifest.collect_module_tools(module_stem))
+
+    assert {type(tool).__name__ for tool in served} == {
+        "ActionTool",
+        "LazyIntegrationTool",
+        "Tool",
+    }
+    assert {integration_of(tool) for tool in served} == {module_stem}
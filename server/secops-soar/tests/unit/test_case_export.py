@@ -0,0 +1,121 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for exporting cases to NDJSON."""
+
+import gzip
+import json
+
+import pytest
+from benchmarks.fake_soar import FakeSoarConfig
+from secops_soar_mcp.case_export import CaseExporter, resolve_export_path
+from secops_soar_mcp.utils import consts
+
+
+@pytest.fixture
+def fake_soar_config():
+    # Alerts, comments and events span several pages.
+    return FakeSoarConfig(
+        latency_ms=0,
+        cases=4,
+        page_size=2,
+        list_page_size=2,
+        alerts_per_case=3,
+        events_per_alert=5,
+    )
+
+
+def read_records(path):
+    with gzip.open(path, "rt") as file:
+        return [json.loads(line) for line in file]
+
+
+@pytest.mark.parametrize(
+    "output_path", ["/tmp/cases.ndjson.gz", "../cases.ndjson.gz", "a/../../b", "", "."]
+)
+def test_export_paths_stay_in_the_export_directory(
+    output_path, tmp_path, monkeypatch
+):
+    monkeypatch.setenv(consts.ENV_SOAR_EXPORT_DIR, str(tmp_path))
+    with pytest.raises(ValueError):
+        resolve_export_path(output_path)
+
+
+def test_export_paths_do_not_follow_symlinks_out(tmp_path, monkeypatch):
+    export_dir = tmp_path / "exports"
+    export_dir.mkdir()
+    (export_dir / "outside").symlink_to(tmp_path)
+    monkeypatch.setenv(consts.ENV_SOAR_EXPORT_DIR, str(export_dir))
+    assert resolve_export_path("may/cases.ndjson.gz") == (
+        export_dir.resolve() / "may" / "cases.ndjson.gz"
+    )
+    with pytest.raises(ValueError):
+        resolve_export_path("outside/cases.ndjson.gz")
+
+
+@pytest.mark.asyncio
+async def test_existing_files_are_not_overwritten(tmp_path):
+    output = tmp_path / "cases.ndjson.gz"
+    output.write_bytes(b"keep")
+    for resume in (True, False):
+        with pytest.raises(ValueError, match="already exists"):
+            await CaseExporter(output).run(resume=resume)
+    assert output.read_bytes() == b"keep"
+
+    summary = await CaseExporter(output, include_events=False).run(overwrite=True)
+    assert summary["cases_exported"] == 4
+
+
+@pytest.mark.asyncio
+async def test_alerts_comments_and_events_are_paginated(tmp_path):
+    output = tmp_path / "cases.ndjson.gz"
+    summary = await CaseExporter(output, event_fields=["id"]).run()
+
+    assert summary["complete"] and summary["cases_with_errors"] == 0
+    records = read_records(output)
+    assert len(records) == 4
+    for record in records:
+        assert len(record["alerts"]["caseAlerts"]) == 3
+        assert len(record["comments"]["comments"]) == 2
+        assert "nextPageToken" not in record["alerts"]
+        assert len(record["alert_events"]) == 3
+        for events in record["alert_events"].values():
+            assert [set(event) for event in events["involvedEvents"]] == [{"id"}] * 5
+
+
+@pytest.mark.asyncio
+async def test_interrupted_export_resumes_from_its_checkpoint(tmp_path):
+    output = tmp_path / "cases.ndjson.gz"
+    first = await CaseExporter(output, include_events=False).run(max_pages=1)
+    assert (first["pages"], first["complete"]) == (1, False)
+    # A page the interrupted run had started writing.
+    with open(output, "ab") as file:
+        file.write(b"\x1f\x8bpartial")
+
+    summary = await CaseExporter(output, include_events=False).run()
+
+    assert summary["complete"]
+    assert (summary["pages"], summary["cases_exported"]) == (2, 4)
+    ids = [record["case"]["id"] for record in read_records(output)]
+    assert sorted(ids) == [1, 2, 3, 4]
+    # A complete export is not repeated.
+    again = await CaseExporter(output, include_events=False).run()
+    assert again == summary
+
+
+@pytest.mark.asyncio
+async def test_resume_with_other_filters_is_refused(tmp_path):
+    output = tmp_path / "cases.ndjson.gz"
+    await CaseExporter(output, include_events=False).run(max_pages=1)
+    with pytest.raises(ValueError, match="other filters"):
+        await CaseExporter(output, include_events=False, status=["OPEN"]).run()
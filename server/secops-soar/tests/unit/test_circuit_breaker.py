@@ -0,0 +1,134 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the per-integration circuit breakers."""
+
+import pytest
+from benchmarks import fake_soar
+from secops_soar_mcp import bindings, circuit_breaker
+from secops_soar_mcp.actions import ActionSpec, execute_action
+from secops_soar_mcp.circuit_breaker import CircuitBreaker, CircuitBreakers
+
+SPEC = ActionSpec("Alexa", "Alexa_Ping", ())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def test_opens_after_threshold_and_probes_after_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure("boom")
+    assert breaker.state == circuit_breaker.OPEN
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+    assert breaker.retry_after() == 30
+
+    clock.now += 30
+    assert breaker.state == circuit_breaker.HALF_OPEN
+    assert breaker.allow()
+    # Only one probe at a time.
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == circuit_breaker.CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+def test_failed_probe_reopens_and_released_probe_frees_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.allow()
+    breaker.record_failure("boom")
+    clock.now += 10
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    breaker.record_failure("still down")
+    assert breaker.state == circuit_breaker.OPEN
+    assert breaker.last_failure == "still down"
+
+
+def test_disabled_breaker_never_opens():
+    breaker = CircuitBreaker(failure_threshold=0, reset_timeout=10)
+    for _ in range(5):
+        assert breaker.allow()
+        breaker.record_failure("boom")
+    assert breaker.state == circuit_breaker.CLOSED
+
+
+@pytest.fixture
+def breakers(monkeypatch: pytest.MonkeyPatch) -> CircuitBreakers:
+    breakers = CircuitBreakers(failure_threshold=2, reset_timeout=60)
+    monkeypatch.setattr(bindings, "circuit_breakers", breakers)
+    return breakers
+
+
+async def run_action() -> dict:
+    return await execute_action(SPEC, "1", ["group"], None, "All entities", {})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "fake_soar_config",
+    [fake_soar.FakeSoarConfig(latency_ms=0, action_failure_rate=1.0)],
+)
+async def test_failed_execution_results_open_the_breaker(breakers):
+    for _ in range(2):
+        assert (await run_action())["status"] == "Failed"
+    result = await run_action()
+    assert result["CircuitBreaker"]["state"] == circuit_breaker.OPEN
+    assert breakers.get("Alexa").failures == 2
+
+
+@pytest.mark.asyncio
+async def test_server_errors_open_the_breaker(
+    breakers, fake_soar_config, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(bindings.http_client.config, "max_attempts", 1)
+    fake_soar_config.error_rate = 1.0
+    # The instance lookups fail with 500s, which are transient failures.
+    for _ in range(2):
+        result = await run_action()
+        assert result["Error"]["Transient"]
+    assert breakers.get("Alexa").state == circuit_breaker.OPEN
+
+
+@pytest.mark.asyncio
+async def test_empty_and_completed_results_count_as_successes(
+    breakers, executed_actions, monkeypatch: pytest.MonkeyPatch
+):
+    assert (await run_action()) == {"status": "Completed"}
+    post = bindings.http_client.post
+
+    async def empty_post(endpoint, req=None, *args, **kwargs):
+        await post(endpoint, req, *args, **kwargs)
+        return {}
+
+    monkeypatch.setattr(bindings.http_client, "post", empty_post)
+    for _ in range(3):
+        assert await run_action() == {}
+    breaker = breakers.get("Alexa")
+    assert breaker.state == circuit_breaker.CLOSED
+    assert (breaker.successes, breaker.failures) == (4, 0)
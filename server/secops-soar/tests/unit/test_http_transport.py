@@ -0,0 +1,72 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for exposing the HTTP transports beyond loopback."""
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from secops_soar_mcp import server
+from secops_soar_mcp.utils.consts import ENV_SOAR_MCP_AUTH_TOKEN
+
+
+def http_args(*argv):
+    return server.parser.parse_args(["--transport", "streamable-http", *argv])
+
+
+def test_non_loopback_host_needs_allow_remote_and_token(monkeypatch):
+    monkeypatch.delenv(ENV_SOAR_MCP_AUTH_TOKEN, raising=False)
+    assert server.http_exposure_error(http_args()) is None
+    assert "--allow-remote" in server.http_exposure_error(http_args("--host", "0.0.0.0"))
+    remote = http_args("--host", "0.0.0.0", "--allow-remote")
+    assert ENV_SOAR_MCP_AUTH_TOKEN in server.http_exposure_error(remote)
+    with pytest.raises(ValueError):
+        server.create_http_app(remote)
+
+    monkeypatch.setenv(ENV_SOAR_MCP_AUTH_TOKEN, "secret")
+    assert server.http_exposure_error(remote) is None
+
+
+def test_remote_clients_are_checked_by_host_and_origin():
+    settings = server.remote_transport_security(
+        http_args(
+            "--host",
+            "0.0.0.0",
+            "--allow-remote",
+            "--allowed-hosts",
+            "soar-mcp.example.com:8000, 10.0.0.5:8000",
+        )
+    )
+    assert settings.enable_dns_rebinding_protection
+    assert settings.allowed_hosts == ["soar-mcp.example.com:8000", "10.0.0.5:8000"]
+    assert "https://soar-mcp.example.com:8000" in settings.allowed_origins
+
+
+@pytest.mark.asyncio
+async def test_requests_need_the_bearer_token():
+    async def ok(request):
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/mcp", ok)])
+    app.add_middleware(server.BearerTokenMiddleware, token="secret")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/mcp")).status_code == 401
+        wrong = await client.get("/mcp", headers={"Authorization": "Bearer nope"})
+        assert wrong.status_code == 401
+        assert wrong.headers["WWW-Authenticate"] == "Bearer"
+        right = await client.get("/mcp", headers={"Authorization": "Bearer secret"})
+        assert right.status_code == 200
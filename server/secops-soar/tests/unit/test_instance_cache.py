@@ -0,0 +1,59 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the cache of integration instance identifiers."""
+
+import asyncio
+
+import pytest
+from secops_soar_mcp.instance_cache import IntegrationInstanceCache
+
+
+class ControlledClient:
+    """Answers instance lookups with the current instances, when released."""
+
+    def __init__(self):
+        self.instances = ["instance-1"]
+        self.release = asyncio.Event()
+        self.release.set()
+        self.requests = 0
+
+    async def get(self, endpoint):
+        self.requests += 1
+        instances = list(self.instances)
+        await self.release.wait()
+        return {"integration_instances": instances}
+
+
+@pytest.mark.asyncio
+async def test_refresh_started_before_invalidation_is_discarded():
+    client = ControlledClient()
+    cache = IntegrationInstanceCache(client, ttl=600, refresh_after=0)
+    assert await cache.get("CSV") == {"integration_instances": ["instance-1"]}
+
+    # A background refresh reads the old instance list, then stalls.
+    client.release.clear()
+    await cache.get("CSV")
+    await asyncio.sleep(0)
+    assert client.requests == 2
+
+    client.instances = ["instance-2"]
+    cache.invalidate("CSV")
+    lookup = asyncio.ensure_future(cache.get("CSV"))
+    await asyncio.sleep(0)
+    client.release.set()
+
+    # The lookup after the invalidation does not join the stale refresh.
+    assert await lookup == {"integration_instances": ["instance-2"]}
+    assert client.requests == 3
+    assert cache._entries["CSV"][1] == {"integration_instances": ["instance-2"]}
@@ -0,0 +1,71 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for enabling and disabling integrations while the server runs."""
+
+import json
+
+import mcp.types as types
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+from secops_soar_mcp.integration_manager import (
+    DynamicToolsMCP,
+    IntegrationManager,
+    register_tools,
+)
+
+
+def new_server():
+    server = DynamicToolsMCP("integrations")
+    manager = IntegrationManager(server)
+    register_tools(server, manager)
+    return server, manager
+
+
+@pytest.mark.asyncio
+async def test_sessions_that_listed_tools_hear_of_changes():
+    server, _ = new_server()
+    notifications = []
+
+    async def message_handler(message):
+        if isinstance(message, types.ServerNotification):
+            notifications.append(message.root)
+
+    async with create_connected_server_and_client_session(
+        server._mcp_server, message_handler=message_handler
+    ) as client:
+        initialized = await client.initialize()
+        assert initialized.capabilities.tools.listChanged
+        before = {tool.name for tool in (await client.list_tools()).tools}
+        result = await client.call_tool("enable_integrations", {"integrations": ["CSV"]})
+        assert not result.isError
+        after = {tool.name for tool in (await client.list_tools()).tools}
+
+    assert after > before
+    assert any(
+        isinstance(notification, types.ToolListChangedNotification)
+        for notification in notifications
+    )
+
+
+@pytest.mark.asyncio
+async def test_read_only_server_rejects_changes():
+    server, manager = new_server()
+    manager.read_only = "not while serving with --workers"
+    for tool in ("enable_integrations", "disable_integrations"):
+        content = await server.call_tool(tool, {"integrations": ["CSV"]})
+        assert json.loads(content[0].text) == {
+            "Status": "Failed",
+            "Message": "not while serving with --workers",
+        }
+    assert manager.enabled == {}
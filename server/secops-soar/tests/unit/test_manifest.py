@@ -0,0 +1,119 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for serving marketplace actions from the manifest."""
+
+import json
+from typing import Any, Dict
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from secops_soar_mcp import manifest
+
+MANIFEST = manifest.load_manifest()
+INTEGRATIONS = sorted(MANIFEST["integrations"]) if MANIFEST else []
+
+_SAMPLE_MODELS = {
+    "EmailContent": {
+        "Content": "Hello",
+        "ContentTemplateName": None,
+        "HtmlTemplateName": None,
+    },
+    "TargetEntity": {"Identifier": "HOST-1", "EntityType": "HOSTNAME"},
+}
+_SAMPLE_VALUES = {"string": "value", "boolean": True, "integer": 1, "number": 1.5}
+
+
+def sample_value(schema: Dict[str, Any], definitions: Dict[str, Any]) -> Any:
+    """Returns a valid argument value for a parameter schema."""
+    if "$ref" in schema:
+        schema = definitions[schema["$ref"].rsplit("/", 1)[-1]]
+    if "anyOf" in schema:
+        return sample_value(schema["anyOf"][0], definitions)
+    if schema.get("type") == "array":
+        return [sample_value(schema.get("items", {}), definitions)]
+    if schema.get("type") == "object":
+        return _SAMPLE_MODELS.get(schema.get("title"), {"key": "value"})
+    return _SAMPLE_VALUES.get(schema.get("type"), "value")
+
+
+def sample_arguments(parameters: Dict[str, Any], everything: bool) -> Dict[str, Any]:
+    """Returns arguments for the required parameters, or for all of them.
+
+    Model-typed parameters are always given: the generated functions call
+    `model_dump()` on them unconditionally.
+    """
+    definitions = parameters.get("$defs", {})
+    required = set(parameters.get("required", []))
+    arguments = {
+        name: sample_value(schema, definitions)
+        for name, schema in parameters["properties"].items()
+        if everything or name in required or "$ref" in schema
+    }
+    arguments["case_id"] = "42"
+    return arguments
+
+
+def normalized(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Decodes the script parameters, which are sent as a JSON string."""
+    properties = dict(payload["properties"])
+    properties["ScriptParametersEntityFields"] = json.loads(
+        properties["ScriptParametersEntityFields"]
+    )
+    return {**payload, "properties": properties}
+
+
+@pytest.mark.skipif(MANIFEST is None, reason="No tool manifest")
+@pytest.mark.asyncio
+@pytest.mark.parametrize("module_stem", INTEGRATIONS)
+async def test_executor_payloads_match_generated_functions(
+    module_stem, executed_actions
+):
+    server = FastMCP("manifest")
+    assert manifest.register_from_manifest(server, MANIFEST, [module_stem]) == []
+    from_manifest = server._tool_manager._tools
+    from_module = {
+        tool.name: tool for tool in manifest.load_integration_tools(module_stem)
+    }
+    for generated in manifest.collect_module_tools(module_stem):
+        for everything in (False, True):
+            arguments = sample_arguments(generated.parameters, everything)
+            await generated.run(dict(arguments))
+            await from_manifest[generated.name].run(dict(arguments))
+            await from_module[generated.name].run(dict(arguments))
+            expected, *actual = map(normalized, executed_actions[-3:])
+            assert actual == [expected, expected], generated.name
+
+
+@pytest.mark.asyncio
+async def test_manifest_and_module_tools_validate_arguments(executed_actions):
+    server = FastMCP("manifest")
+    manifest.register_from_manifest(server, MANIFEST, ["emailv2"])
+    module_tools = {tool.name: tool for tool in manifest.load_integration_tools("emailv2")}
+    for tool in (
+        server._tool_manager._tools["email_v2_send_thread_reply"],
+        module_tools["email_v2_send_thread_reply"],
+    ):
+        assert isinstance(tool, manifest.ActionTool)
+        arguments = sample_arguments(tool.parameters, everything=False)
+        with pytest.raises(ToolError):
+            await tool.run({**arguments, "reply_all": "maybe"})
+        with pytest.raises(ToolError):
+            await tool.run({**arguments, "content": {"Content": "Hello"}})
+        await tool.run({**arguments, "reply_all": "true"})
+        script_parameters = json.loads(
+            executed_actions[-1]["properties"]["ScriptParametersEntityFields"]
+        )
+        assert script_parameters["Reply All"] is True
+        assert script_parameters["Content"] == _SAMPLE_MODELS["EmailContent"]
@@ -0,0 +1,52 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for paging through SOAR list endpoints."""
+
+import asyncio
+from contextlib import aclosing
+
+import pytest
+from secops_soar_mcp.pagination import NEXT_PAGE_TOKEN, iter_pages
+
+
+class SlowSecondPageClient:
+    """Serves a first page at once and never finishes the second."""
+
+    def __init__(self):
+        self.cancelled = []
+
+    async def get(self, endpoint, params=None, cache_tags=None):
+        token = (params or {}).get("pageToken")
+        if token is None:
+            return {"cases": [{"id": 1}], NEXT_PAGE_TOKEN: "page-2"}
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled.append(token)
+            raise
+
+
+@pytest.mark.asyncio
+async def test_breaking_out_cancels_the_prefetched_page():
+    client = SlowSecondPageClient()
+    page_iterator = iter_pages(client, "/cases")
+    async with aclosing(page_iterator):
+        async for page in page_iterator:
+            assert page["cases"] == [{"id": 1}]
+            break
+        # The second page is already being fetched.
+        await asyncio.sleep(0)
+        assert client.cancelled == []
+    await asyncio.sleep(0)
+    assert client.cancelled == ["page-2"]
@@ -0,0 +1,91 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the cache of SOAR read responses."""
+
+import time
+
+import pytest
+from secops_soar_mcp import bindings
+from secops_soar_mcp.response_cache import ResponseCache, case_tag
+from secops_soar_mcp.utils.consts import Endpoints
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list:
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(max_entries=10, ttl=15)
+    cache.put("a", {"id": 1})
+    clock[0] += 14.9
+    assert cache.get("a") == {"id": 1}
+    clock[0] += 0.1
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResponseCache(max_entries=2, ttl=15)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.evictions == 1
+
+
+def test_invalidation_drops_tagged_entries_and_stale_fetches(clock):
+    cache = ResponseCache(max_entries=10, ttl=15)
+    cache.put("case", 1, tags=[case_tag(7)])
+    cache.put("list", 2, tags=["cases"])
+    cache.put("other", 3, tags=[case_tag(8)])
+    # A fetch that started before the write below.
+    versions = cache.versions([case_tag(7)])
+
+    cache.invalidate(case_tag(7), "cases")
+
+    assert cache.get("case") is None and cache.get("list") is None
+    assert cache.get("other") == 3
+    assert cache.invalidations == 2
+    cache.put("case", "stale", tags=[case_tag(7)], versions=versions)
+    assert cache.get("case") is None
+    cache.put("case", "fresh", tags=[case_tag(7)], versions=cache.versions([case_tag(7)]))
+    assert cache.get("case") == "fresh"
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResponseCache(max_entries=10, ttl=0)
+    cache.put("a", 1)
+    assert not cache.enabled
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_case_reads_are_cached_until_the_case_changes():
+    client = bindings.http_client
+    endpoint = Endpoints.BASE_SPECIFIC_CASE_URL.format(CASE_ID=3)
+
+    first = await client.get(endpoint, cache_tags=[case_tag(3)])
+    assert await client.get(endpoint, cache_tags=[case_tag(3)]) is first
+    bindings.invalidate_case_cache(3)
+    refetched = await client.get(endpoint, cache_tags=[case_tag(3)])
+
+    assert refetched == first and refetched is not first
+    stats = client.response_cache.stats()
+    assert (stats["hits"], stats["invalidations"]) == (1, 1)
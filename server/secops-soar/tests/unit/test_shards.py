@@ -0,0 +1,66 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for hosting integrations in worker processes."""
+
+import pytest
+import pytest_asyncio
+from mcp.server.fastmcp.exceptions import ToolError
+from secops_soar_mcp import bindings
+from secops_soar_mcp.integration_manager import DynamicToolsMCP
+from secops_soar_mcp.response_cache import case_tag
+from secops_soar_mcp.shards import ShardPool
+
+PING_ARGUMENTS = {"case_id": "7", "alert_group_identifiers": ["group"]}
+
+
+@pytest_asyncio.fixture
+async def pool():
+    server = DynamicToolsMCP("shards")
+    pool = ShardPool(server, 1)
+    await pool.start()
+    await pool.enable(["csv"])
+    yield pool
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_worker_actions_reach_the_server_state(pool):
+    versions = bindings.http_client.response_cache.versions([case_tag("7")])
+
+    await pool.mcp._tool_manager.call_tool("csv_ping", PING_ARGUMENTS)
+
+    assert bindings.http_client.response_cache.versions([case_tag("7")]) != versions
+    breakers = await bindings.circuit_breaker_status()
+    assert breakers["CSV"]["successes"] == 1
+    metrics = await bindings.request_metrics()
+    assert metrics.summary(integration="CSV")["requests"]
+
+
+@pytest.mark.asyncio
+async def test_unresponsive_worker_is_restarted(pool, fake_soar_config):
+    shard = pool.shards[0]
+    shard.timeout = 0.5
+    fake_soar_config.latency_ms = 5000
+    fake_soar_config.latency_distribution = "fixed"
+
+    with pytest.raises(ToolError, match="did not answer"):
+        await pool.mcp._tool_manager.call_tool("csv_ping", PING_ARGUMENTS)
+
+    fake_soar_config.latency_ms = 0
+    shard.timeout = 30
+    await shard._restart_task
+    assert shard.status()["timeouts"] == 1
+    assert shard.restarts == 1
+    result = await pool.mcp._tool_manager.call_tool("csv_ping", PING_ARGUMENTS)
+    assert result["status"] == "Completed"
@@ -0,0 +1,81 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for incremental decoding with field projection."""
+
+import json
+
+import pytest
+from secops_soar_mcp.streaming import Projection, decode_projected
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def decode(document, projection: Projection, chunk_size: int = 3):
+    data = json.dumps(document, ensure_ascii=False).encode()
+    return await decode_projected(chunked(data, chunk_size), projection)
+
+
+EVENT = {
+    "id": "e-1",
+    "event": {"principal": {"ip": ["10.0.0.1"], "hostname": "h"}, "port": -1.5e3},
+    "rawLog": 'quote " backslash \\ braces }{ ][ unicode é 😀',
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64 * 1024])
+async def test_projects_top_level_arrays_across_chunk_boundaries(chunk_size):
+    document = {"involvedEvents": [EVENT, EVENT], "total": 2, "next": None}
+    result = await decode(
+        document, Projection(("id", "event.principal.ip")), chunk_size
+    )
+    assert result == {
+        "involvedEvents": [
+            {"id": "e-1", "event": {"principal": {"ip": ["10.0.0.1"]}}}
+        ]
+        * 2,
+        "total": 2,
+        "next": None,
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 5])
+async def test_projects_arrays_under_nested_paths(chunk_size):
+    document = {
+        "data": {"events": [EVENT], "other": [EVENT]},
+        "events": [EVENT],
+    }
+    result = await decode(document, Projection(("id",), "data.events"), chunk_size)
+    assert result == {
+        "data": {"events": [{"id": "e-1"}], "other": [EVENT]},
+        "events": [EVENT],
+    }
+
+
+@pytest.mark.asyncio
+async def test_decodes_empty_bodies_and_scalars():
+    assert await decode_projected(chunked(b"  ", 1), Projection(("id",))) == {}
+    assert await decode([], Projection(("id",))) == []
+    assert await decode(12345.5e-3, Projection(("id",)), chunk_size=1) == 12.3455
+
+
+@pytest.mark.asyncio
+async def test_rejects_truncated_documents():
+    with pytest.raises(ValueError):
+        await decode_projected(chunked(b'{"events": [{"id": "e', 4), Projection(()))
+
@@ -0,0 +1,205 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Pool of reusable Chronicle clients keyed by tenant.
+
+Credentials are discovered once and shared by every client, together with
+the authorized HTTP session and its connection pool. One Chronicle client is
+kept per (project_id, customer_id, region), so MSSP deployments serving many
+customers reuse a warm client for each of them.
+
+The pool is sized and aged through the environment:
+
+- SECOPS_MCP_CLIENT_POOL_SIZE: Maximum number of tenants kept (default 32).
+  The least recently used client is evicted beyond that.
+- SECOPS_MCP_CLIENT_IDLE_SECONDS: Seconds a client may go unused before it
+  is evicted (default 1800, 0 disables idle eviction).
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import google.auth.transport.requests
+from secops import SecOpsClient
+
+logger = logging.getLogger('secops-mcp')
+
+CLIENT_POOL_SIZE_ENV = 'SECOPS_MCP_CLIENT_POOL_SIZE'
+CLIENT_IDLE_SECONDS_ENV = 'SECOPS_MCP_CLIENT_IDLE_SECONDS'
+DEFAULT_CLIENT_POOL_SIZE = 32
+DEFAULT_CLIENT_IDLE_SECONDS = 1800.0
+# Access tokens expiring within this window are refreshed before a client is
+# handed out, so tool calls do not pay for the refresh mid-request.
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+TenantKey = Tuple[str, str, str]
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f'Ignoring invalid {name}={value!r}, using {default:g}')
+        return default
+
+
+class ChronicleClientPool:
+    """Thread-safe LRU cache of Chronicle clients with idle eviction."""
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        idle_seconds: Optional[float] = None,
+    ):
+        """Initialize the pool.
+
+        Args:
+            max_size: Maximum number of tenants kept. Defaults to
+                SECOPS_MCP_CLIENT_POOL_SIZE.
+            idle_seconds: Seconds after which an unused client is evicted, 0
+                to keep clients until the pool is full. Defaults to
+                SECOPS_MCP_CLIENT_IDLE_SECONDS.
+        """
+        if max_size is None:
+            max_size = int(_env_number(CLIENT_POOL_SIZE_ENV, DEFAULT_CLIENT_POOL_SIZE))
+        if idle_seconds is None:
+            idle_seconds = _env_number(CLIENT_IDLE_SECONDS_ENV, DEFAULT_CLIENT_IDLE_SECONDS)
+        self.max_size = max(1, max_size)
+        self.idle_seconds = idle_seconds
+        self._secops_client: Optional[SecOpsClient] = None
+        # Tenant -> (client, monotonic time of last use), least recent first.
+        self._clients: 'OrderedDict[TenantKey, Tuple[Any, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._secops_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.token_refreshes = 0
+
+    def get(self, project_id: str, customer_id: str, region: str) -> Any:
+        """Returns the Chronicle client of a tenant, creating it if needed.
+
+        Blocks on credential discovery, client creation and token refresh,
+        so call it from the SDK thread pool. Clients are created outside the
+        pool lock, so other tenants are served meanwhile.
+        """
+        key = (project_id, customer_id, region)
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            client = self._checkout(key)
+            secops_client = self._secops_client
+        if client is None:
+            if secops_client is None:
+                secops_client = self._shared_secops_client()
+            created = secops_client.chronicle(
+                customer_id=customer_id, project_id=project_id, region=region
+            )
+            with self._lock:
+                # Another thread may have created the tenant's client meanwhile.
+                client = self._checkout(key)
+                if client is None:
+                    self.misses += 1
+                    client = created
+                    self._clients[key] = (client, time.monotonic())
+                    while len(self._clients) > self.max_size:
+                        self._clients.popitem(last=False)
+                        self.evictions += 1
+                    logger.info(
+                        f'Created Chronicle client for project {project_id}, '
+                        f'customer {customer_id}, region {region}'
+                    )
+        self._refresh_token(secops_client.auth.credentials)
+        return client
+
+    def clear(self) -> None:
+        """Drops every client and the shared credentials."""
+        with self._lock:
+            self._clients.clear()
+            self._secops_client = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'clients': len(self._clients),
+                'max_size': self.max_size,
+                'idle_seconds': self.idle_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'token_refreshes': self.token_refreshes,
+            }
+
+    def _checkout(self, key: TenantKey) -> Any:
+        """Returns a pooled client and marks it used, or None. Hold the lock."""
+        entry = self._clients.get(key)
+        if entry is None:
+            return None
+        self.hits += 1
+        self._clients[key] = (entry[0], time.monotonic())
+        self._clients.move_to_end(key)
+        return entry[0]
+
+    def _shared_secops_client(self) -> SecOpsClient:
+        # Credentials are discovered once, without holding the pool lock.
+        with self._secops_lock:
+            if self._secops_client is None:
+                self._secops_client = SecOpsClient()
+            return self._secops_client
+
+    def _evict_idle(self, now: float) -> None:
+        if self.idle_seconds <= 0:
+            return
+        idle = [
+            key
+            for key, (_, last_used) in self._clients.items()
+            if now - last_used > self.idle_seconds
+        ]
+        for key in idle:
+            del self._clients[key]
+            self.evictions += 1
+
+    def _refresh_token(self, credentials: Any) -> None:
+        if not self._needs_refresh(credentials):
+            return
+        with self._refresh_lock:
+            # Another thread may have refreshed while this one waited.
+            if not self._needs_refresh(credentials):
+                return
+            try:
+                credentials.refresh(google.auth.transport.requests.Request())
+                self.token_refreshes += 1
+            except Exception as e:
+                # The authorized session retries the refresh on the next request.
+                logger.warning(f'Failed to refresh Chronicle credentials: {e}')
+
+    @staticmethod
+    def _needs_refresh(credentials: Any) -> bool:
+        if not hasattr(credentials, 'refresh'):
+            return False
+        if not getattr(credentials, 'token', None):
+            return True
+        expiry = getattr(credentials, 'expiry', None)
+        if expiry is None:
+            return False
+        # google-auth keeps expiry as a naive UTC datetime.
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return expiry - now <= TOKEN_REFRESH_MARGIN
@@ -0,0 +1,241 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Shaping of UDM search results into compact rows or a per-field summary.
+
+Raw UDM events are deeply nested and full of empty fields. Events can
+instead be returned as flat rows keyed by UDM field path (e.g.
+`principal.ip`), optionally projected onto a few paths, with empty values
+dropped and repeated events removed. Or they can be reduced to a summary of
+each field: how many events have it, its most common values, and when each
+of those values was first and last seen.
+
+Field paths are relative to the event's `udm` object. Paths through lists,
+such as `about.ip`, collect the values of every list element.
+"""
+
+import json
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from secops_mcp.udm_search import event_timestamp
+
+OUTPUT_FORMATS = ('raw', 'compact', 'summary')
+DEFAULT_TOP_VALUES = 5
+# Fields reported by a summary without explicit fields, most common first.
+MAX_SUMMARY_FIELDS = 40
+TIMESTAMP_FIELD = 'metadata.eventTimestamp'
+# Result sets with more events are shaped in a worker thread, off the event loop.
+THREAD_THRESHOLD = 1000
+
+
+def _is_empty(value: Any) -> bool:
+    # False and 0 are values; None, '' and empty containers are not.
+    return value is None or (not value and isinstance(value, (str, list, dict)))
+
+
+def _compact(value: Any) -> Any:
+    """Recursively drops empty values from dicts and lists."""
+    if isinstance(value, dict):
+        compacted = {key: _compact(item) for key, item in value.items()}
+        return {key: item for key, item in compacted.items() if not _is_empty(item)}
+    if isinstance(value, list):
+        compacted = [
+            _compact(item) if isinstance(item, (dict, list)) else item
+            for item in value
+        ]
+        return [item for item in compacted if not _is_empty(item)]
+    return value
+
+
+def _udm(event: Dict[str, Any]) -> Dict[str, Any]:
+    return event.get('udm', event)
+
+
+def _normalize_path(path: str) -> str:
+    path = path.strip()
+    return path[len('udm.'):] if path.startswith('udm.') else path
+
+
+def flatten_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Flattens the non-empty values of a UDM event into field paths.
+
+    Nested objects become dotted paths; lists are kept as values, with
+    empty values inside them dropped.
+    """
+    row: Dict[str, Any] = {}
+
+    def walk(value: Any, prefix: str):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                walk(item, f'{prefix}.{key}' if prefix else key)
+            return
+        if isinstance(value, list):
+            value = _compact(value)
+        if not _is_empty(value):
+            row[prefix] = value
+
+    walk(_udm(event), '')
+    return row
+
+
+def get_path(event: Dict[str, Any], path: str) -> Any:
+    """Returns the value at a UDM field path, or None if it is missing."""
+    values = [_udm(event)]
+    for part in _normalize_path(path).split('.'):
+        found = []
+        for value in values:
+            if isinstance(value, list):
+                value = [item.get(part) for item in value if isinstance(item, dict)]
+                found.extend(item for item in value if item is not None)
+            elif isinstance(value, dict) and value.get(part) is not None:
+                found.append(value[part])
+        if not found:
+            return None
+        values = found
+    if len(values) == 1:
+        return _compact(values[0])
+    # Values collected from list elements.
+    flat = []
+    for value in values:
+        flat.extend(value if isinstance(value, list) else [value])
+    return _compact(flat)
+
+
+def project_event(event: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Returns an event as a flat row of its non-empty field values."""
+    if not fields:
+        return flatten_event(event)
+    row = {}
+    for path in fields:
+        value = get_path(event, path)
+        if not _is_empty(value):
+            row[_normalize_path(path)] = value
+    return row
+
+
+def compact_events(
+    events: Iterable[Dict[str, Any]], fields: Optional[List[str]] = None
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Projects events onto flat rows and removes repeated rows.
+
+    Args:
+        events: UDM events as returned by the search.
+        fields: Field paths to keep. Defaults to every non-empty field.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], int]: The unique rows, in event order,
+        and the number of repeated rows removed.
+    """
+    rows = []
+    seen = set()
+    duplicates = 0
+    for event in events:
+        row = project_event(event, fields)
+        key = json.dumps(row, sort_keys=True, default=str)
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        rows.append(row)
+    return rows, duplicates
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+
+def _isoformat(timestamp: Optional[datetime]) -> Optional[str]:
+    return timestamp.isoformat().replace('+00:00', 'Z') if timestamp else None
+
+
+def summarize_events(
+    events: List[Dict[str, Any]],
+    fields: Optional[List[str]] = None,
+    top_values: int = DEFAULT_TOP_VALUES,
+) -> Dict[str, Any]:
+    """Reduces events to per-field value counts.
+
+    The values of each field are gathered into one column and counted, and
+    first/last seen times are tracked only for the values that make the top
+    list. This is plain Python; callers shaping large result sets run it in
+    a worker thread.
+
+    Args:
+        events: UDM events as returned by the search.
+        fields: Field paths to summarize. Defaults to the most common fields.
+        top_values: Number of most common values reported per field.
+
+    Returns:
+        Dict[str, Any]: The event count, time range and, per field, the
+        number of events having it, its distinct value count and its top
+        values with their counts and first/last seen times.
+    """
+    timestamps = [event_timestamp(event) for event in events]
+    seen_times = [timestamp for timestamp in timestamps if timestamp is not None]
+
+    # Columns of (event index, value); list values contribute every element.
+    columns: Dict[str, List[Tuple[int, Any]]] = {}
+    present: Counter = Counter()
+    paths = [_normalize_path(path) for path in fields] if fields else None
+    for index, event in enumerate(events):
+        row = project_event(event, paths)
+        for path, value in row.items():
+            if path == TIMESTAMP_FIELD:
+                continue
+            present[path] += 1
+            column = columns.setdefault(path, [])
+            if isinstance(value, list):
+                column.extend((index, _hashable(item)) for item in value)
+            else:
+                column.append((index, _hashable(value)))
+
+    if paths is None:
+        paths = [path for path, _ in present.most_common(MAX_SUMMARY_FIELDS)]
+    summary_fields = {}
+    for path in paths:
+        column = columns.get(path, [])
+        counts = Counter(value for _, value in column)
+        top = dict(counts.most_common(top_values))
+        first_seen: Dict[Any, datetime] = {}
+        last_seen: Dict[Any, datetime] = {}
+        for index, value in column:
+            timestamp = timestamps[index]
+            if value not in top or timestamp is None:
+                continue
+            if value not in first_seen or timestamp < first_seen[value]:
+                first_seen[value] = timestamp
+            if value not in last_seen or timestamp > last_seen[value]:
+                last_seen[value] = timestamp
+        summary_fields[path] = {
+            'events': present[path],
+            'distinct_values': len(counts),
+            'top_values': [
+                {
+                    'value': value,
+                    'count': count,
+                    'first_seen': _isoformat(first_seen.get(value)),
+                    'last_seen': _isoformat(last_seen.get(value)),
+                }
+                for value, count in top.items()
+            ],
+        }
+    return {
+        'events': len(events),
+        'first_seen': _isoformat(min(seen_times)) if seen_times else None,
+        'last_seen': _isoformat(max(seen_times)) if seen_times else None,
+        'fields': summary_fields,
+    }
@@ -0,0 +1,134 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Bounded thread pool for the synchronous Chronicle SDK.
+
+The `secops` SDK performs blocking HTTP requests. Tools are coroutines served
+by a single event loop, so every SDK call is dispatched to a thread pool with
+`run_sdk` to keep one slow search from stalling unrelated tool calls.
+
+The pool size and the per-call timeout are read from the environment:
+
+- SECOPS_MCP_SDK_WORKERS: Maximum number of concurrent SDK calls (default 16).
+- SECOPS_MCP_SDK_TIMEOUT: Seconds a call may take, including the time spent
+  waiting for a free worker, before it fails (default 300, 0 disables).
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger('secops-mcp')
+
+SDK_WORKERS_ENV = 'SECOPS_MCP_SDK_WORKERS'
+SDK_TIMEOUT_ENV = 'SECOPS_MCP_SDK_TIMEOUT'
+DEFAULT_SDK_WORKERS = 16
+DEFAULT_SDK_TIMEOUT = 300.0
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def sdk_workers() -> int:
+    """Returns the configured number of SDK worker threads."""
+    value = os.environ.get(SDK_WORKERS_ENV)
+    if not value:
+        return DEFAULT_SDK_WORKERS
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(
+            f'Ignoring invalid {SDK_WORKERS_ENV}={value!r}, '
+            f'using {DEFAULT_SDK_WORKERS}'
+        )
+        return DEFAULT_SDK_WORKERS
+
+
+def sdk_timeout() -> Optional[float]:
+    """Returns the configured per-call timeout in seconds, or None for none."""
+    value = os.environ.get(SDK_TIMEOUT_ENV)
+    if not value:
+        return DEFAULT_SDK_TIMEOUT
+    try:
+        timeout = float(value)
+    except ValueError:
+        logger.warning(
+            f'Ignoring invalid {SDK_TIMEOUT_ENV}={value!r}, '
+            f'using {DEFAULT_SDK_TIMEOUT}'
+        )
+        return DEFAULT_SDK_TIMEOUT
+    return timeout if timeout > 0 else None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Returns the shared SDK thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = sdk_workers()
+                _executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix='secops-sdk'
+                )
+                logger.info(f'Started Chronicle SDK thread pool with {workers} workers')
+    return _executor
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Shuts the SDK thread pool down; the next call starts a new one."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+async def run_sdk(
+    fn: Callable[..., Any],
+    *args: Any,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> Any:
+    """Runs a blocking SDK callable on the SDK thread pool.
+
+    Args:
+        fn: The callable, usually a bound method of a Chronicle client.
+        *args: Positional arguments for `fn`.
+        timeout: Seconds to wait for the result. Defaults to the value of
+            SECOPS_MCP_SDK_TIMEOUT.
+        **kwargs: Keyword arguments for `fn`.
+
+    Returns:
+        Any: The return value of `fn`.
+
+    Raises:
+        TimeoutError: If the call did not finish in time. A call that already
+            started keeps its worker thread until the SDK returns, but its
+            result is discarded; a call still queued is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(fn, *args, **kwargs)
+    future = loop.run_in_executor(get_executor(), call)
+    if timeout is None:
+        timeout = sdk_timeout()
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        name = getattr(fn, '__name__', repr(fn))
+        raise TimeoutError(
+            f'Chronicle call {name} did not finish within {timeout:g} seconds'
+        ) from None
@@ -0,0 +1,501 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Chunked, concurrent ingestion of raw logs and UDM events.
+
+Records are split into chunks that stay under a request byte budget and a
+record count, and the chunks are uploaded concurrently on the SDK thread
+pool. Chunks are built from the input lazily and only while fewer than
+`concurrency` uploads are in flight, so a large file is streamed rather
+than held in memory. Each chunk is reported on its own, so one bad chunk
+does not fail the whole batch.
+
+A chunk is retried with exponential backoff only when it failed before the
+API could have accepted it: when the connection could not be opened, or on
+a 429 or 503 response. Other failures, such as a dropped connection, a read
+timeout or another 5xx response, may have come after the records were
+ingested. Those chunks are not resent, which
+could duplicate records, but reported as possibly ingested.
+
+The defaults can be changed through the environment:
+
+- SECOPS_MCP_INGEST_CHUNK_BYTES: Request payload budget per chunk
+  (default 3000000, below the ingestion API's 4 MB request limit).
+- SECOPS_MCP_INGEST_CHUNK_RECORDS: Records per chunk (default 1000).
+- SECOPS_MCP_INGEST_CONCURRENCY: Chunks uploaded at once (default 4).
+- SECOPS_MCP_INGEST_MAX_ATTEMPTS: Attempts per chunk (default 3).
+
+For backfills too large to pass to a tool, run from server/secops:
+
+    python -m secops_mcp.ingestion --log-type OKTA --file okta.log
+    python -m secops_mcp.ingestion --udm --file events.ndjson
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import sys
+import uuid
+from datetime import datetime
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import requests
+import urllib3
+
+from secops_mcp.executor import run_sdk
+
+logger = logging.getLogger('secops-mcp')
+
+INGEST_CHUNK_BYTES_ENV = 'SECOPS_MCP_INGEST_CHUNK_BYTES'
+INGEST_CHUNK_RECORDS_ENV = 'SECOPS_MCP_INGEST_CHUNK_RECORDS'
+INGEST_CONCURRENCY_ENV = 'SECOPS_MCP_INGEST_CONCURRENCY'
+INGEST_MAX_ATTEMPTS_ENV = 'SECOPS_MCP_INGEST_MAX_ATTEMPTS'
+DEFAULT_CHUNK_BYTES = 3_000_000
+DEFAULT_CHUNK_RECORDS = 1000
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+# Bytes of JSON around each base64-encoded raw log in an import request.
+RAW_LOG_OVERHEAD = 128
+# Responses the ingestion API returns without having accepted the request.
+RETRYABLE_STATUSES = frozenset({429, 503})
+
+# Kinds of upload failures.
+RETRY = 'retry'
+REJECTED = 'rejected'
+UNCERTAIN = 'uncertain'
+
+# The SDK reports the response status in its error messages.
+_STATUS = re.compile(r'\bstatus(?:_code)?=(\d{3})\b')
+# Failures to open a connection, so nothing was sent.
+_CONNECT_ERRORS = (
+    ConnectionRefusedError,
+    requests.exceptions.ConnectTimeout,
+    urllib3.exceptions.NewConnectionError,
+)
+_TRANSPORT_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    requests.exceptions.RequestException,
+    urllib3.exceptions.HTTPError,
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(f'Ignoring invalid {name}={value!r}, using {default}')
+        return default
+
+
+def raw_log_size(log_message: str, labels: Optional[Dict[str, str]] = None) -> int:
+    """Estimates the bytes a raw log adds to an import request."""
+    encoded = 4 * -(-len(log_message.encode('utf-8')) // 3)
+    label_bytes = len(json.dumps(labels)) * 2 if labels else 0
+    return encoded + RAW_LOG_OVERHEAD + label_bytes
+
+
+def udm_event_size(event: Dict[str, Any]) -> int:
+    """Estimates the bytes a UDM event adds to an import request."""
+    return len(json.dumps(event, default=str).encode('utf-8')) + 16
+
+
+def chunk_records(
+    records: Iterable[Any],
+    size_of: Callable[[Any], int],
+    max_bytes: int,
+    max_records: int,
+) -> Iterator[Tuple[List[Any], int]]:
+    """Groups records into chunks under a byte budget and a record count.
+
+    A record larger than the budget on its own forms a chunk by itself, and
+    is left for the API to reject.
+
+    Yields:
+        Tuple[List[Any], int]: A chunk and its estimated request bytes.
+    """
+    chunk: List[Any] = []
+    chunk_bytes = 0
+    for record in records:
+        size = size_of(record)
+        if chunk and (chunk_bytes + size > max_bytes or len(chunk) >= max_records):
+            yield chunk, chunk_bytes
+            chunk, chunk_bytes = [], 0
+        chunk.append(record)
+        chunk_bytes += size
+    if chunk:
+        yield chunk, chunk_bytes
+
+
+def _causes(error: BaseException) -> Iterator[BaseException]:
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def classify_upload_error(error: BaseException) -> str:
+    """Tells whether a failed upload can safely be sent again.
+
+    Returns:
+        str: RETRY when the connection could not be opened, or on a 429 or
+        503 response, all of which happen before the API accepts a request.
+        REJECTED for input validation errors (ValueError) and other 4xx
+        responses. UNCERTAIN for anything else, such as a dropped connection,
+        a read timeout, an unreadable response or another 5xx response,
+        after which the records may have been ingested.
+    """
+    # The SDK wraps transport errors in its own, chained to the original.
+    causes = list(_causes(error))
+    transport_errors = [
+        cause
+        for cause in causes
+        if isinstance(cause, _TRANSPORT_ERRORS + (json.JSONDecodeError,))
+    ]
+    if isinstance(error, ValueError) and not transport_errors:
+        return REJECTED
+    if any(isinstance(cause, _CONNECT_ERRORS) for cause in transport_errors):
+        return RETRY
+    if transport_errors:
+        return UNCERTAIN
+    match = _STATUS.search(str(error))
+    if match:
+        status = int(match.group(1))
+        if status in RETRYABLE_STATUSES:
+            return RETRY
+        if 400 <= status < 500:
+            return REJECTED
+    return UNCERTAIN
+
+
+def _operation_of(result: Any) -> Optional[str]:
+    if isinstance(result, dict):
+        return result.get('operation') or result.get('name')
+    return None
+
+
+async def ingest_in_chunks(
+    records: Iterable[Any],
+    upload: Callable[[List[Any]], Awaitable[Any]],
+    size_of: Callable[[Any], int],
+    max_bytes: Optional[int] = None,
+    max_records: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    max_attempts: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Uploads records in concurrent chunks and reports each chunk.
+
+    Args:
+        records: The records to ingest, consumed lazily.
+        upload: Coroutine function uploading one chunk and returning the
+            API response.
+        size_of: Returns the request bytes a record needs.
+        max_bytes: Byte budget per chunk. Defaults to
+            SECOPS_MCP_INGEST_CHUNK_BYTES.
+        max_records: Records per chunk. Defaults to
+            SECOPS_MCP_INGEST_CHUNK_RECORDS.
+        concurrency: Chunks uploaded at once. Defaults to
+            SECOPS_MCP_INGEST_CONCURRENCY.
+        max_attempts: Attempts per chunk. Only failures that
+            `classify_upload_error` deems safe to resend are retried.
+            Defaults to SECOPS_MCP_INGEST_MAX_ATTEMPTS.
+
+    Returns:
+        Dict[str, Any]: Record and chunk totals, and per chunk its index,
+        record count, estimated bytes, attempts, operation ID, error and
+        whether it failed after possibly being ingested.
+    """
+    max_bytes = max_bytes or _env_int(INGEST_CHUNK_BYTES_ENV, DEFAULT_CHUNK_BYTES)
+    max_records = max_records or _env_int(INGEST_CHUNK_RECORDS_ENV, DEFAULT_CHUNK_RECORDS)
+    concurrency = concurrency or _env_int(INGEST_CONCURRENCY_ENV, DEFAULT_CONCURRENCY)
+    max_attempts = max_attempts or _env_int(INGEST_MAX_ATTEMPTS_ENV, DEFAULT_MAX_ATTEMPTS)
+
+    results: List[Dict[str, Any]] = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def upload_chunk(report: Dict[str, Any], chunk: List[Any]):
+        try:
+            for attempt in range(1, max_attempts + 1):
+                report['attempts'] = attempt
+                try:
+                    report['operation'] = _operation_of(await upload(chunk))
+                    report['error'] = None
+                    return
+                except Exception as e:
+                    report['error'] = str(e)
+                    kind = classify_upload_error(e)
+                    if kind == UNCERTAIN:
+                        # Resending could ingest the records twice.
+                        report['possibly_ingested'] = True
+                        logger.warning(
+                            f'Chunk {report["chunk"]} failed and may have been '
+                            f'ingested, not retrying: {e}'
+                        )
+                        return
+                    if kind == REJECTED or attempt == max_attempts:
+                        return
+                    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                    logger.warning(
+                        f'Chunk {report["chunk"]} failed (attempt {attempt}), '
+                        f'retrying in {delay:g}s: {e}'
+                    )
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        finally:
+            slots.release()
+
+    tasks = []
+    try:
+        chunks = chunk_records(records, size_of, max_bytes, max_records)
+        for index, (chunk, chunk_bytes) in enumerate(chunks):
+            # Backpressure: no more input is read until an upload slot is free.
+            await slots.acquire()
+            report = {
+                'chunk': index,
+                'records': len(chunk),
+                'bytes': chunk_bytes,
+                'attempts': 0,
+                'operation': None,
+                'error': None,
+                'possibly_ingested': False,
+            }
+            results.append(report)
+            tasks.append(asyncio.create_task(upload_chunk(report, chunk)))
+            tasks = [task for task in tasks if not task.done()]
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    failed = [report for report in results if report['error'] is not None]
+    return {
+        'records': sum(report['records'] for report in results),
+        'records_ingested': sum(
+            report['records'] for report in results if report['error'] is None
+        ),
+        'records_possibly_ingested': sum(
+            report['records'] for report in results if report['possibly_ingested']
+        ),
+        'chunks': len(results),
+        'failed_chunks': len(failed),
+        'chunk_results': results,
+    }
+
+
+async def ingest_raw_logs(
+    chronicle: Any,
+    log_type: str,
+    log_messages: Iterable[str],
+    forwarder_id: Optional[str] = None,
+    labels: Optional[Dict[str, str]] = None,
+    log_entry_time: Optional[datetime] = None,
+    collection_time: Optional[datetime] = None,
+    **options: Any,
+) -> Dict[str, Any]:
+    """Ingests raw logs in concurrent chunks.
+
+    The log type is validated and the default forwarder resolved once, up
+    front, rather than by every chunk.
+
+    Args:
+        chronicle: The Chronicle client.
+        log_type: Chronicle log type identifier.
+        log_messages: One string per log.
+        forwarder_id: Forwarder to use. Defaults to the SDK's forwarder.
+        labels: Labels attached to every log.
+        log_entry_time: When the logs were generated.
+        collection_time: When the logs were collected.
+        **options: Chunking options of `ingest_in_chunks`.
+    """
+    if not await run_sdk(chronicle.is_valid_log_type, log_type):
+        raise ValueError(f'Invalid log type: {log_type}')
+    if not forwarder_id:
+        forwarder = await run_sdk(chronicle.get_or_create_forwarder)
+        forwarder_id = forwarder['name']
+    ingestion_params = {'forwarder_id': forwarder_id, 'force_log_type': True}
+    if labels:
+        ingestion_params['labels'] = labels
+    if log_entry_time:
+        ingestion_params['log_entry_time'] = log_entry_time
+    if collection_time:
+        ingestion_params['collection_time'] = collection_time
+
+    async def upload(chunk: List[str]) -> Any:
+        return await run_sdk(
+            chronicle.ingest_log,
+            log_type=log_type,
+            log_message=chunk,
+            **ingestion_params,
+        )
+
+    return await ingest_in_chunks(
+        log_messages,
+        upload,
+        lambda log_message: raw_log_size(log_message, labels),
+        **options,
+    )
+
+
+def with_event_id(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Gives a UDM event a metadata ID if it has none, so it can be reported."""
+    metadata = event.get('metadata')
+    if isinstance(metadata, dict) and 'id' not in metadata:
+        metadata['id'] = str(uuid.uuid4())
+    return event
+
+
+async def ingest_udm_events_in_chunks(
+    chronicle: Any, udm_events: Iterable[Dict[str, Any]], **options: Any
+) -> Dict[str, Any]:
+    """Ingests UDM events in concurrent chunks.
+
+    Args:
+        chronicle: The Chronicle client.
+        udm_events: The UDM events; events without a metadata ID get one.
+        **options: Chunking options of `ingest_in_chunks`.
+    """
+
+    async def upload(chunk: List[Dict[str, Any]]) -> Any:
+        return await run_sdk(chronicle.ingest_udm, udm_events=chunk)
+
+    return await ingest_in_chunks(
+        (with_event_id(event) for event in udm_events), upload, udm_event_size, **options
+    )
+
+
+def format_report(report: Dict[str, Any], noun: str, max_chunks: int = 20) -> str:
+    """Formats an ingestion report for a tool response.
+
+    Failed chunks are listed first; at most `max_chunks` chunks are listed.
+    """
+    lines = [
+        f'Ingested {report["records_ingested"]} of {report["records"]} {noun} '
+        f'in {report["chunks"]} chunk(s).'
+    ]
+    if report['failed_chunks']:
+        lines.append(f'Failed chunks: {report["failed_chunks"]}')
+    if report['records_possibly_ingested']:
+        lines.append(
+            f'{report["records_possibly_ingested"]} {noun} may have been ingested '
+            'despite the error and were not resent; search for them before '
+            'sending them again.'
+        )
+    chunks = sorted(report['chunk_results'], key=lambda chunk: chunk['error'] is None)
+    for chunk in chunks[:max_chunks]:
+        if chunk['possibly_ingested']:
+            lines.append(
+                f'  Chunk {chunk["chunk"]} ({chunk["records"]} record(s), '
+                f'{chunk["attempts"]} attempt(s)) failed, possibly ingested: '
+                f'{chunk["error"]}'
+            )
+        elif chunk['error'] is not None:
+            lines.append(
+                f'  Chunk {chunk["chunk"]} ({chunk["records"]} record(s), '
+                f'{chunk["attempts"]} attempt(s)) failed: {chunk["error"]}'
+            )
+        else:
+            lines.append(
+                f'  Chunk {chunk["chunk"]} ({chunk["records"]} record(s)): '
+                f'operation {chunk["operation"] or "not reported"}'
+            )
+    if len(chunks) > max_chunks:
+        lines.append(f'  (and {len(chunks) - max_chunks} more chunk(s))')
+    return '\n'.join(lines)
+
+
+def _read_lines(path: str) -> Iterator[str]:
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\r\n')
+            if line.strip():
+                yield line
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    # Imported here, as the server imports the tools, which import this module.
+    from secops_mcp.server import get_chronicle_client
+
+    chronicle = await run_sdk(
+        get_chronicle_client, args.project_id, args.customer_id, args.region
+    )
+    options = {
+        'max_bytes': args.chunk_bytes,
+        'max_records': args.chunk_records,
+        'concurrency': args.concurrency,
+        'max_attempts': args.max_attempts,
+    }
+    if args.udm:
+        events = (json.loads(line) for line in _read_lines(args.file))
+        return await ingest_udm_events_in_chunks(chronicle, events, **options)
+    return await ingest_raw_logs(
+        chronicle,
+        args.log_type,
+        _read_lines(args.file),
+        forwarder_id=args.forwarder_id,
+        **options,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Ingest a file of raw logs (one per line) or UDM events (NDJSON)'
+    )
+    parser.add_argument('--file', required=True)
+    kind = parser.add_mutually_exclusive_group(required=True)
+    kind.add_argument('--log-type', help='Chronicle log type of the raw logs')
+    kind.add_argument('--udm', action='store_true', help='The file holds UDM events')
+    parser.add_argument('--forwarder-id')
+    parser.add_argument('--project-id')
+    parser.add_argument('--customer-id')
+    parser.add_argument('--region')
+    parser.add_argument('--chunk-bytes', type=int)
+    parser.add_argument('--chunk-records', type=int)
+    parser.add_argument('--concurrency', type=int)
+    parser.add_argument('--max-attempts', type=int)
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(
+            format_report(
+                report, 'events' if args.udm else 'logs', max_chunks=report['chunks']
+            )
+        )
+    sys.exit(1 if report['failed_chunks'] else 0)
+
+
+if __name__ == '__main__':
+    main()
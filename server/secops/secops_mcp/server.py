@@ -22,7 +22,9 @@ import os
 from typing import Any, Optional
 
 from mcp.server.fastmcp import FastMCP
-from secops import SecOpsClient
+
+from secops_mcp.client_pool import ChronicleClientPool
+from secops_mcp.translation_cache import TranslationCache
 
 # Initialize FastMCP server with a descriptive name
 server = FastMCP('Google Security Operations MCP server', log_level="ERROR")
@@ -41,13 +43,23 @@ DEFAULT_CUSTOMER_ID = os.environ.get(
 )
 DEFAULT_REGION = os.environ.get('CHRONICLE_REGION', 'us')
 
+# Chronicle clients reused across tool calls, one per tenant
+client_pool = ChronicleClientPool()
+
+# Natural language to UDM query translations, shared by all tenants
+translation_cache = TranslationCache()
+
 
 def get_chronicle_client(
     project_id: Optional[str] = None, 
     customer_id: Optional[str] = None, 
     region: Optional[str] = None
 ) -> Any:
-    """Initialize and return a Chronicle client.
+    """Return the pooled Chronicle client of a tenant.
+
+    Clients are created on first use and reused by later calls for the same
+    project, customer and region. This blocks on credential discovery and
+    token refresh, so tools call it through `run_sdk`.
 
     Args:
         project_id: Google Cloud project ID (defaults to CHRONICLE_PROJECT_ID env var)
@@ -69,11 +81,7 @@ def get_chronicle_client(
             '(CHRONICLE_PROJECT_ID, CHRONICLE_CUSTOMER_ID)'
         )
 
-    client = SecOpsClient()
-    chronicle = client.chronicle(
-        customer_id=customer_id, project_id=project_id, region=region
-    )
-    return chronicle
+    return client_pool.get(project_id, customer_id, region)
 
 
 # Import all tools
@@ -16,6 +16,7 @@
 import logging
 from typing import Any, Dict, List, Optional
 
+from secops_mcp.executor import run_sdk
 from secops_mcp.server import get_chronicle_client, server
 
 
@@ -119,10 +120,11 @@ async def create_data_table(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Create the data table
-        data_table = chronicle.create_data_table(
+        data_table = await run_sdk(
+            chronicle.create_data_table,
             name=name,
             description=description,
             header=header,
@@ -245,10 +247,10 @@ async def add_rows_to_data_table(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Add rows to the data table
-        result_response = chronicle.create_data_table_rows(table_name, rows)
+        result_response = await run_sdk(chronicle.create_data_table_rows, table_name, rows)
 
         result = f'Successfully added rows to data table: {table_name}\n'
         result += f'Rows added: {len(rows)}\n'
@@ -340,10 +342,10 @@ async def list_data_table_rows(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # List rows in the data table
-        rows = chronicle.list_data_table_rows(table_name)
+        rows = await run_sdk(chronicle.list_data_table_rows, table_name)
 
         if not rows:
             return f'Data table "{table_name}" has no rows or was not found.'
@@ -453,10 +455,10 @@ async def delete_data_table_rows(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Delete rows from the data table
-        chronicle.delete_data_table_rows(table_name, row_ids)
+        await run_sdk(chronicle.delete_data_table_rows, table_name, row_ids)
 
         result = f'Successfully deleted rows from data table: {table_name}\n'
         result += f'Rows deleted: {len(row_ids)}\n'
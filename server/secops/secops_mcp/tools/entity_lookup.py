@@ -16,6 +16,7 @@
 import logging
 from datetime import datetime, timedelta, timezone
 
+from secops_mcp.executor import run_sdk
 from secops_mcp.server import get_chronicle_client, server
 
 
@@ -82,12 +83,13 @@ async def lookup_entity(
         - Document findings in a relevant case management or ticketing system using an appropriate MCP tool.
     """
     try:
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=hours_back)
 
-        entity_summary = chronicle.summarize_entity(
+        entity_summary = await run_sdk(
+            chronicle.summarize_entity,
             value=entity_value,
             start_time=start_time,
             end_time=end_time,
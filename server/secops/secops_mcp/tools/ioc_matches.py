@@ -16,6 +16,7 @@
 import logging
 from datetime import datetime, timedelta, timezone
 
+from secops_mcp.executor import run_sdk
 from secops_mcp.server import get_chronicle_client, server
 
 
@@ -69,12 +70,13 @@ async def get_ioc_matches(
         - Correlate IoC match details with findings from other security tools (EDR, Network, Cloud) via their MCP tools.
     """
     try:
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=hours_back)
 
-        iocs = chronicle.list_iocs(
+        iocs = await run_sdk(
+            chronicle.list_iocs,
             start_time=start_time, end_time=end_time, max_matches=max_matches
         )
 
@@ -15,10 +15,17 @@
 
 import json
 import logging
-import uuid
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Union
 
+from secops.chronicle.log_ingest import initialize_multi_line_formats, split_logs
+
+from secops_mcp.executor import run_sdk
+from secops_mcp.ingestion import (
+    format_report,
+    ingest_raw_logs,
+    ingest_udm_events_in_chunks,
+)
 from secops_mcp.server import get_chronicle_client, server
 
 
@@ -41,6 +48,8 @@ async def ingest_raw_log(
 
     Allows ingestion of raw log data in various formats (JSON, XML, CEF, etc.) into Chronicle
     for parsing and normalization into UDM format. Supports both single log and batch ingestion.
+    Batches are split into chunks that fit the API request size limit, uploaded concurrently,
+    and failed chunks are retried; the response reports the operation ID or error of each chunk.
 
 
 
@@ -71,8 +80,8 @@ async def ingest_raw_log(
         collection_time (Optional[str]): ISO 8601 timestamp when the log was collected.
 
     Returns:
-        str: Success message with operation details, including any operation IDs for tracking.
-             Returns error message if ingestion fails.
+        str: Ingestion summary with the operation ID of each chunk for tracking, and the error
+             of any chunk that still failed after retries. Returns error message if ingestion fails.
 
     Example Usage:
         # Single OKTA log ingestion
@@ -106,33 +115,33 @@ async def ingest_raw_log(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
-
-        # Prepare ingestion parameters
-        ingestion_params = {
-            'log_type': log_type,
-            'log_message': log_message
-        }
-
-        if forwarder_id:
-            ingestion_params['forwarder_id'] = forwarder_id
-        if labels:
-            ingestion_params['labels'] = labels
-        if log_entry_time:
-            ingestion_params['log_entry_time'] = datetime.fromisoformat(log_entry_time.replace('Z', '+00:00'))
-        if collection_time:
-            ingestion_params['collection_time'] = datetime.fromisoformat(collection_time.replace('Z', '+00:00'))
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
-        # Ingest the log(s)
-        result = chronicle.ingest_log(**ingestion_params)
+        # Split a string into individual logs the way the SDK does, so they can be chunked
+        if isinstance(log_message, str):
+            initialize_multi_line_formats()
+            log_messages = split_logs(log_type, log_message) or [log_message]
+        else:
+            log_messages = log_message
+
+        # Ingest the log(s) in chunks
+        report = await ingest_raw_logs(
+            chronicle,
+            log_type,
+            log_messages,
+            forwarder_id=forwarder_id,
+            labels=labels,
+            log_entry_time=datetime.fromisoformat(log_entry_time.replace('Z', '+00:00')) if log_entry_time else None,
+            collection_time=datetime.fromisoformat(collection_time.replace('Z', '+00:00')) if collection_time else None,
+        )
 
         # Format response
-        operation = result.get('operation', 'Unknown operation')
-        log_count = len(log_message) if isinstance(log_message, list) else 1
-        
-        response = f'Successfully ingested {log_count} log(s) of type {log_type}.\n'
-        response += f'Operation: {operation}'
-        
+        if report['failed_chunks']:
+            response = f'Error ingesting some logs of type {log_type}.\n'
+        else:
+            response = f'Successfully ingested logs of type {log_type}.\n'
+        response += format_report(report, 'log(s)')
+
         if labels:
             response += f'\nLabels applied: {labels}'
         
@@ -154,6 +163,8 @@ async def ingest_udm_events(
     Allows direct ingestion of events already formatted in Chronicle's Unified Data Model (UDM)
     format, bypassing the parsing stage. This is useful for custom applications that generate
     structured security events or for migrating pre-normalized data from other SIEMs.
+    Batches are split into chunks that fit the API request size limit, uploaded concurrently,
+    and failed chunks are retried; the response reports the operation ID or error of each chunk.
 
 
 
@@ -183,8 +194,8 @@ async def ingest_udm_events(
         region (str): Chronicle region (e.g., "us", "europe") (required).
 
     Returns:
-        str: Success message with details about the ingested events, including any generated event IDs.
-             Returns error message if ingestion fails.
+        str: Ingestion summary with the operation ID or error of each chunk, and the event IDs,
+             including any generated ones. Returns error message if ingestion fails.
 
     Example Usage:
         # Single network connection event
@@ -258,22 +269,20 @@ async def ingest_udm_events(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
-        # Auto-generate IDs for events that don't have them
         events_to_ingest = udm_events if isinstance(udm_events, list) else [udm_events]
-        
-        for event in events_to_ingest:
-            if 'metadata' in event and 'id' not in event['metadata']:
-                event['metadata']['id'] = str(uuid.uuid4())
 
-        # Ingest the UDM events
-        result = chronicle.ingest_udm(udm_events=udm_events)
+        # Ingest the UDM events in chunks; events without an ID get one
+        report = await ingest_udm_events_in_chunks(chronicle, events_to_ingest)
 
         # Format response
-        event_count = len(events_to_ingest)
-        response = f'Successfully ingested {event_count} UDM event(s).\n'
-        
+        if report['failed_chunks']:
+            response = 'Error ingesting some UDM events.\n'
+        else:
+            response = 'Successfully ingested UDM events.\n'
+        response += format_report(report, 'UDM event(s)') + '\n'
+
         # Add event IDs if available
         event_ids = []
         for event in events_to_ingest:
@@ -352,14 +361,14 @@ async def get_available_log_types(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         if search_term:
             # Search for specific log types
-            log_types = chronicle.search_log_types(search_term)
+            log_types = await run_sdk(chronicle.search_log_types, search_term)
         else:
             # Get all log types (limit to first 50 to avoid overwhelming output)
-            log_types = chronicle.get_all_log_types()[:50]
+            log_types = (await run_sdk(chronicle.get_all_log_types))[:50]
 
         if not log_types:
             return f'No log types found{" matching search term: " + search_term if search_term else ""}.'
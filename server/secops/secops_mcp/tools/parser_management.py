@@ -18,6 +18,7 @@ import json
 import logging
 from typing import Any, Dict, List, Optional
 
+from secops_mcp.executor import run_sdk
 from secops_mcp.server import get_chronicle_client, server
 
 
@@ -116,10 +117,11 @@ async def create_parser(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Create the parser
-        parser = chronicle.create_parser(
+        parser = await run_sdk(
+            chronicle.create_parser,
             log_type=log_type,
             parser_code=parser_code,
             validated_on_empty_logs=validated_on_empty_logs
@@ -202,10 +204,10 @@ async def get_parser(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Get the parser
-        parser = chronicle.get_parser(log_type=log_type, id=parser_id)
+        parser = await run_sdk(chronicle.get_parser, log_type=log_type, id=parser_id)
 
         parser_name = parser.get("name", "").split("/")[-1]
         state = parser.get("state", "Unknown")
@@ -298,10 +300,10 @@ async def activate_parser(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Activate the parser
-        chronicle.activate_parser(log_type=log_type, id=parser_id)
+        await run_sdk(chronicle.activate_parser, log_type=log_type, id=parser_id)
 
         result = f'Successfully activated parser for log type: {log_type}\n'
         result += f'Parser ID: {parser_id}\n'
@@ -377,10 +379,10 @@ async def deactivate_parser(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Deactivate the parser
-        chronicle.deactivate_parser(log_type=log_type, id=parser_id)
+        await run_sdk(chronicle.deactivate_parser, log_type=log_type, id=parser_id)
 
         result = f'Successfully deactivated parser for log type: {log_type}\n'
         result += f'Parser ID: {parser_id}\n'
@@ -513,10 +515,11 @@ async def run_parser_against_sample_logs(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Run the parser
-        result = chronicle.run_parser(
+        result = await run_sdk(
+            chronicle.run_parser,
             log_type=log_type,
             parser_code=parser_code,
             parser_extension_code=parser_extension_code,
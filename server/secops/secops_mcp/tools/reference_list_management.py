@@ -16,6 +16,7 @@
 import logging
 from typing import Any, Dict, List, Optional
 
+from secops_mcp.executor import run_sdk
 from secops_mcp.server import get_chronicle_client, server
 
 
@@ -115,10 +116,11 @@ async def create_reference_list(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Create the reference list
-        reference_list = chronicle.create_reference_list(
+        reference_list = await run_sdk(
+            chronicle.create_reference_list,
             name=name,
             description=description,
             entries=entries,
@@ -225,13 +227,13 @@ async def get_reference_list(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Determine view based on include_entries parameter
         view = "FULL" if include_entries else "BASIC"
         
         # Get the reference list
-        reference_list = chronicle.get_reference_list(name, view=view)
+        reference_list = await run_sdk(chronicle.get_reference_list, name, view=view)
 
         if not reference_list:
             return f'Reference list "{name}" was not found.'
@@ -371,7 +373,7 @@ async def update_reference_list(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Prepare update parameters
         update_params = {"name": name}
@@ -381,7 +383,7 @@ async def update_reference_list(
             update_params["description"] = description
 
         # Update the reference list
-        updated_list = chronicle.update_reference_list(**update_params)
+        updated_list = await run_sdk(chronicle.update_reference_list, **update_params)
 
         result = f'Successfully updated reference list: {name}\n'
         
@@ -18,6 +18,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 
 from typing import Any, Dict, Optional, Literal, Union
+from secops_mcp.executor import run_sdk
 from secops_mcp.server import get_chronicle_client, server
 
 
@@ -75,12 +76,13 @@ async def get_security_alerts(
         - Correlate alert information with findings from other security tools (EDR, Cloud Posture, TI) via their MCP tools.
     """
     try:
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=hours_back)
 
-        alert_response = chronicle.get_alerts(
+        alert_response = await run_sdk(
+            chronicle.get_alerts,
             start_time=start_time,
             end_time=end_time,
             snapshot_query=status_filter,
@@ -197,8 +199,8 @@ async def get_security_alert_by_id(
     """
 
     try:
-        chronicle = get_chronicle_client(project_id, customer_id, region)
-        response = chronicle.get_alert(alert_id, include_detections)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
+        response = await run_sdk(chronicle.get_alert, alert_id, include_detections)
     except Exception as e:
         return f'Error retrieving security alert for {alert_id}: {str(e)}'
 
@@ -281,8 +283,8 @@ Next Steps (using MCP-enabled tools):
     - Communicate significant updates (e.g., confirmed breach, critical false positive) to relevant teams or stakeholders as per incident response procedures.
     """
     try:
-        chronicle = get_chronicle_client(project_id, customer_id, region)
-        response = chronicle.update_alert(alert_id, reason=reason, status=status, verdict=verdict, comment=comment, root_cause=root_cause, priority=priority, severity=severity)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
+        response = await run_sdk(chronicle.update_alert, alert_id, reason=reason, status=status, verdict=verdict, comment=comment, root_cause=root_cause, priority=priority, severity=severity)
     except Exception as e:
         return f'Error retrieving security alert for {alert_id}: {str(e)}'
 
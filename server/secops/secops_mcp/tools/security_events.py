@@ -13,24 +13,47 @@
 # limitations under the License.
 """Security Operations MCP tools for searching security events."""
 
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional
 
-from secops_mcp.server import get_chronicle_client, server
+from secops_mcp.event_shaping import (
+    OUTPUT_FORMATS,
+    THREAD_THRESHOLD,
+    compact_events,
+    summarize_events,
+)
+from secops_mcp.executor import run_sdk
+from secops_mcp.server import get_chronicle_client, server, translation_cache
+from secops_mcp.udm_search import MAX_TIME_SHARDS, search_udm_sharded
 
 
 # Configure logging
 logger = logging.getLogger('secops-mcp')
 
+
+async def _shape_events(
+    shape: Callable[..., Any], events: List[Dict[str, Any]], fields: Optional[List[str]]
+) -> Any:
+    """Shapes events, in a worker thread for large result sets."""
+    if len(events) > THREAD_THRESHOLD:
+        return await asyncio.to_thread(shape, events, fields)
+    return shape(events, fields)
+
+
 @server.tool()
 async def search_security_events(
-    text: str,
+    text: Optional[str] = None,
     project_id: str = None,
     customer_id: str = None,
     hours_back: int = 24,
     max_events: int = 100,
     region: str = None,
+    udm_query: Optional[str] = None,
+    time_shards: int = 1,
+    output_format: str = 'raw',
+    fields: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     """Search for security events in Chronicle SIEM using natural language.
 
@@ -58,20 +81,55 @@ async def search_security_events(
 
     Note: When searching for email addresses, use only lowercase letters.
 
+    Translations are cached per tenant and query text, so repeating a query is fast.
+    To rerun or adjust a query returned earlier, pass it as `udm_query`, which skips
+    the translation entirely.
+
+    For wide windows (e.g. a week-long hunt), set `time_shards` to split the window into
+    that many consecutive slices searched in parallel, four at a time. Results are merged
+    newest first, and older slices are abandoned as soon as the newest ones hold
+    `max_events` events, so recent matches come back quickly instead of a skewed sample
+    of the whole window.
+
+    Raw UDM events are large. To save tokens, use `output_format="compact"` to get flat
+    rows keyed by UDM field path with empty values and repeated events removed, and
+    `fields` to keep only the paths you need (e.g. ["metadata.event_type", "principal.ip",
+    "target.hostname"]). Use `output_format="summary"` to get, instead of rows, each
+    field's most common values with their counts and first/last seen times; this is the
+    best way to get an overview of thousands of events.
+
     Args:
-        text (str): Natural language description of the events you want to find.
+        text (Optional[str]): Natural language description of the events you want to find.
+                              Required unless `udm_query` is given.
         project_id (Optional[str]): Google Cloud project ID. Defaults to environment configuration.
         customer_id (Optional[str]): Chronicle customer ID. Defaults to environment configuration.
         hours_back (int): How many hours back from the current time to search. Defaults to 24.
         max_events (int): Maximum number of event records to return. Defaults to 100.
         region (Optional[str]): Chronicle region (e.g., "us", "europe"). Defaults to environment configuration.
+        udm_query (Optional[str]): A UDM query to run as is instead of translating `text`.
+        time_shards (int): Number of time slices to search in parallel, up to 48. Defaults to 1,
+                           a single search over the whole window.
+        output_format (str): "raw" (default) for UDM events as returned by Chronicle, "compact" for
+                             flat rows of non-empty fields without duplicates, or "summary" for
+                             per-field top values instead of rows.
+        fields (Optional[List[str]]): UDM field paths to keep in "compact" rows or to summarize,
+                                      relative to the event's `udm` object. Implies "compact"
+                                      when `output_format` is "raw".
 
     Returns:
         Dict[str, Any]: A dictionary containing:
             - 'udm_query' (str | None): The translated UDM query used for the search, or None if translation failed.
             - 'events' (Dict): A dictionary containing the search results:
                 - 'events' (List[Dict]): The list of UDM event records found.
-                - 'total_events' (int): The total number of events matching the query (may exceed `max_events`).
+                - 'total_events' (int): The number of events returned. With `time_shards` > 1, the number
+                  of merged events, at most `max_events`; check 'more_data_available' for more matches.
+                - 'more_data_available' (bool): Whether more events match than were returned.
+                - 'shards_searched' / 'shards_total' (int): With `time_shards` > 1, how many slices were
+                  searched before `max_events` was reached, out of how many.
+                - 'duplicates_removed' (int): With "compact" output, the number of repeated rows dropped.
+                - 'summary' (Dict): With "summary" output, replaces 'events': the event count, the
+                  first/last event times and, per field, the number of events having it, its
+                  number of distinct values and its top values with counts and first/last seen.
                 - 'error' (str | None): An error message if the search failed.
 
     Next Steps (using MCP-enabled tools):
@@ -112,27 +170,57 @@ async def search_security_events(
         *   *Result: 6 events (Success!)* - This indicates the user identifier was primarily in an `email` field, not the generic `user` field, and removing the `USER_LOGIN` constraint helped.
     """
     try:
-        logger.info(
-            f'Searching security events with natural language query: {text}'
-        )
+        if not text and not udm_query:
+            raise ValueError('Either text or udm_query must be provided')
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(
+                f'output_format must be one of {", ".join(OUTPUT_FORMATS)}'
+            )
+        if fields and output_format == 'raw':
+            output_format = 'compact'
+        if udm_query:
+            logger.info(f'Searching security events with UDM query: {udm_query}')
+        else:
+            logger.info(
+                f'Searching security events with natural language query: {text}'
+            )
 
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=hours_back)
 
         logger.info(f'Search time range: {start_time} to {end_time}')
 
-        # Use the new natural language search method
-        udm_query = chronicle.translate_nl_to_udm(text)
+        if not udm_query:
+            tenant = (chronicle.project_id, chronicle.customer_id, chronicle.region)
+            udm_query = await translation_cache.translate(
+                tenant,
+                text,
+                lambda query: run_sdk(chronicle.translate_nl_to_udm, query),
+            )
         logger.info(f'YL2 UDM Query: {udm_query}')
 
-        events = chronicle.search_udm(
-            query=udm_query,
-            start_time=start_time,
-            end_time=end_time,
-            max_events=max_events,
-        )
+        if time_shards > 1:
+            logger.info(
+                f'Searching in {min(time_shards, MAX_TIME_SHARDS)} time shards'
+            )
+            events = await search_udm_sharded(
+                chronicle,
+                udm_query,
+                start_time,
+                end_time,
+                max_events,
+                time_shards,
+            )
+        else:
+            events = await run_sdk(
+                chronicle.search_udm,
+                query=udm_query,
+                start_time=start_time,
+                end_time=end_time,
+                max_events=max_events,
+            )
 
         # For compatibility with old format, check if we need to transform response
         if isinstance(events, dict) and 'events' in events:
@@ -144,6 +232,13 @@ async def search_security_events(
             total_events = len(event_list)
             events = {'events': event_list, 'total_events': total_events}
 
+        if output_format == 'compact':
+            rows, duplicates = await _shape_events(compact_events, event_list, fields)
+            events = {**events, 'events': rows, 'duplicates_removed': duplicates}
+        elif output_format == 'summary':
+            events = {key: value for key, value in events.items() if key != 'events'}
+            events['summary'] = await _shape_events(summarize_events, event_list, fields)
+
         logger.info(
             f'Search results: {total_events} total events,'
             f' {len(event_list)} returned'
@@ -159,3 +254,33 @@ async def search_security_events(
             'udm_query': None,
             'events': {'error': str(e), 'events': [], 'total_events': 0},
         }
+
+
+@server.tool()
+async def get_query_translation_cache_stats() -> Dict[str, Any]:
+    """Report how well cached natural language to UDM translations are reused.
+
+    `search_security_events` caches the UDM query translated from each natural
+    language query, per tenant, in memory and in a local SQLite database. This tool
+    reports the cache configuration and its hit and miss counts since the server
+    started.
+
+    **Use Cases:**
+    - Check whether repeated searches are served from the cache.
+    - Confirm the cache is enabled and where its database is stored.
+
+    Returns:
+        Dict[str, Any]: A dictionary containing:
+            - 'enabled' (bool): Whether translations are cached.
+            - 'ttl_seconds' (float): How long a translation stays valid.
+            - 'memory_entries' (int): Translations currently held in memory.
+            - 'max_memory_entries' (int): Capacity of the in-memory cache.
+            - 'db_path' (str | None): SQLite database path, None if not in use.
+            - 'memory_hits' (int): Lookups answered from memory.
+            - 'disk_hits' (int): Lookups answered from the database.
+            - 'shared_translations' (int): Lookups that waited for an identical translation in progress.
+            - 'misses' (int): Lookups that required a translation request.
+            - 'errors' (int): Translation requests that failed.
+            - 'hit_rate' (float | None): Share of lookups that required no translation request.
+    """
+    return translation_cache.stats()
@@ -16,6 +16,7 @@
 import logging
 from typing import Any, Dict, Optional
 
+from secops_mcp.executor import run_sdk
 from secops_mcp.server import get_chronicle_client, server
 
 
@@ -71,8 +72,8 @@ async def list_security_rules(
             logger.warning("page_size cannot exceed 1000. Setting to 1000.")
             page_size = 1000
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
-        rules_response = chronicle.list_rules(page_size=page_size, page_token=page_token)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
+        rules_response = await run_sdk(chronicle.list_rules, page_size=page_size, page_token=page_token)
         return rules_response
     except Exception as e:
         logger.error(f'Error listing security rules: {str(e)}', exc_info=True)
@@ -124,8 +125,8 @@ async def search_security_rules(
         - Document relevant rule information in associated cases using a case management tool.
     """
     try:
-        chronicle = get_chronicle_client(project_id, customer_id, region)
-        rules_response = chronicle.search_rules(query)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
+        rules_response = await run_sdk(chronicle.search_rules, query)
         return rules_response
     except Exception as e:
         logger.error(f'Error searching security rules: {str(e)}', exc_info=True)
@@ -190,7 +191,7 @@ async def get_rule_detections(
         - **Visualize Detections:** Export detection data and use data visualization tools to identify trends or patterns over time.
     """
     try:
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         if not hasattr(chronicle, 'base_url') or not hasattr(chronicle, 'instance_id') or not hasattr(chronicle, 'session'):
             logger.error("Chronicle client from get_chronicle_client is missing expected attributes (base_url, instance_id, session).")
@@ -202,7 +203,7 @@ async def get_rule_detections(
                 logger.error(f"Invalid alert_state: {alert_state}. Must be one of {valid_alert_states}")
                 raise ValueError(f"alert_state must be one of {valid_alert_states}, got {alert_state}")
         
-        detections_response = chronicle.list_detections(rule_id, alert_state, page_size, page_token)
+        detections_response = await run_sdk(chronicle.list_detections, rule_id, alert_state, page_size, page_token)
         
         return detections_response
     except ValueError as ve: # Catch specific ValueError from alert_state validation
@@ -256,7 +257,7 @@ async def list_rule_errors(
         - **Re-check Detections:** After fixing errors, use `get_rule_detections` to see if the rule now produces detections.
     """
     try:
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         if not hasattr(chronicle, 'base_url') or not hasattr(chronicle, 'instance_id') or not hasattr(chronicle, 'session'):
             logger.error("Chronicle client from get_chronicle_client is missing expected attributes (base_url, instance_id, session).")
@@ -264,7 +265,7 @@ async def list_rule_errors(
 
         
         logger.info(f"Requesting errors for rule_id: {rule_id}")
-        response = chronicle.list_errors(rule_id)
+        response = await run_sdk(chronicle.list_errors, rule_id)
         
         return response
         
@@ -357,10 +358,10 @@ async def create_rule(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Create the rule
-        rule = chronicle.create_rule(rule_text)
+        rule = await run_sdk(chronicle.create_rule, rule_text)
 
         # Extract rule ID from the response
         rule_id = rule.get("name", "").split("/")[-1]
@@ -471,7 +472,7 @@ async def test_rule(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Define time range for testing
         from datetime import datetime, timedelta, timezone
@@ -481,11 +482,17 @@ async def test_rule(
         logger.info(f'Rule test time range: {start_time} to {end_time}')
 
         # Test the rule
-        test_results = chronicle.run_rule_test(
-            rule_text=rule_text,
-            start_time=start_time,
-            end_time=end_time,
-            max_results=max_results
+        # The SDK streams results as a generator, so it is drained in the
+        # worker thread rather than on the event loop.
+        test_results = await run_sdk(
+            lambda: list(
+                chronicle.run_rule_test(
+                    rule_text=rule_text,
+                    start_time=start_time,
+                    end_time=end_time,
+                    max_results=max_results
+                )
+            )
         )
 
         # Process streaming results
@@ -650,10 +657,10 @@ async def validate_rule(
 
         
         
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Validate the rule
-        validation_result = chronicle.validate_rule(rule_text)
+        validation_result = await run_sdk(chronicle.validate_rule, rule_text)
 
         # Format response based on validation result
         response = f'Rule Validation Results:\n\n'
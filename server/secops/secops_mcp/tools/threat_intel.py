@@ -16,6 +16,7 @@
 import json
 import logging
 
+from secops_mcp.executor import run_sdk
 from secops_mcp.server import get_chronicle_client, server
 
 
@@ -71,10 +72,10 @@ async def get_threat_intel(
     try:
         logger.info(f'Getting threat intelligence for query: {query}')
 
-        chronicle = get_chronicle_client(project_id, customer_id, region)
+        chronicle = await run_sdk(get_chronicle_client, project_id, customer_id, region)
 
         # Call the Gemini method from the SecOps SDK
-        response = chronicle.gemini(query)
+        response = await run_sdk(chronicle.gemini, query)
 
         # Handle GeminiResponse object
         if hasattr(response, 'get_text_content'):
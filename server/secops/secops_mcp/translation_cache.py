@@ -0,0 +1,320 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Cache of natural language to UDM query translations.
+
+Translating a natural language query is a slow, model-backed request, and
+agents tend to repeat the same phrasing. Translations are cached per tenant
+and normalized query text, in an in-memory LRU in front of a SQLite database
+that survives restarts. Database reads and writes run in worker threads, so
+a slow disk does not stall the event loop, and expired rows are purged at
+most once per PURGE_INTERVAL.
+
+The cache is configured through the environment:
+
+- SECOPS_MCP_TRANSLATION_CACHE_TTL: Seconds a translation stays valid
+  (default 86400, 0 disables the cache).
+- SECOPS_MCP_TRANSLATION_CACHE_SIZE: Translations kept in memory
+  (default 1024).
+- SECOPS_MCP_TRANSLATION_CACHE_DB: Path of the SQLite database (default
+  ~/.cache/secops-mcp/translations.sqlite3, "off" keeps the cache in memory).
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger('secops-mcp')
+
+TRANSLATION_CACHE_TTL_ENV = 'SECOPS_MCP_TRANSLATION_CACHE_TTL'
+TRANSLATION_CACHE_SIZE_ENV = 'SECOPS_MCP_TRANSLATION_CACHE_SIZE'
+TRANSLATION_CACHE_DB_ENV = 'SECOPS_MCP_TRANSLATION_CACHE_DB'
+DEFAULT_TRANSLATION_CACHE_TTL = 86400.0
+DEFAULT_TRANSLATION_CACHE_SIZE = 1024
+DEFAULT_TRANSLATION_CACHE_DB = Path.home() / '.cache' / 'secops-mcp' / 'translations.sqlite3'
+DISABLED_DB = 'off'
+# Seconds between purges of expired translations from the database.
+PURGE_INTERVAL = 3600.0
+
+TenantKey = Tuple[str, str, str]
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_query(text: str) -> str:
+    """Normalizes natural language query text for use as a cache key.
+
+    Whitespace runs are collapsed and trailing punctuation is dropped. Case
+    is kept, as UDM values such as user names are case-sensitive.
+    """
+    return _WHITESPACE.sub(' ', text).strip().rstrip('.?! ')
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f'Ignoring invalid {name}={value!r}, using {default:g}')
+        return default
+
+
+class TranslationCache:
+    """Two-level cache of UDM query translations with a TTL."""
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_memory_entries: Optional[int] = None,
+        db_path: Optional[str] = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds a translation stays valid, 0 to disable the cache.
+                Defaults to SECOPS_MCP_TRANSLATION_CACHE_TTL.
+            max_memory_entries: Translations kept in memory. Defaults to
+                SECOPS_MCP_TRANSLATION_CACHE_SIZE.
+            db_path: SQLite database path, or "off" for no database. Defaults
+                to SECOPS_MCP_TRANSLATION_CACHE_DB. The database is opened on
+                first use.
+        """
+        if ttl is None:
+            ttl = _env_number(TRANSLATION_CACHE_TTL_ENV, DEFAULT_TRANSLATION_CACHE_TTL)
+        if max_memory_entries is None:
+            max_memory_entries = int(
+                _env_number(TRANSLATION_CACHE_SIZE_ENV, DEFAULT_TRANSLATION_CACHE_SIZE)
+            )
+        if db_path is None:
+            db_path = os.environ.get(TRANSLATION_CACHE_DB_ENV) or str(
+                DEFAULT_TRANSLATION_CACHE_DB
+            )
+        self.ttl = ttl
+        self.max_memory_entries = max(1, max_memory_entries)
+        self.db_path = None if db_path == DISABLED_DB else db_path
+        # Key -> (UDM query, expiry as a Unix time), least recent first.
+        self._memory: 'OrderedDict[str, Tuple[str, float]]' = OrderedDict()
+        # Translations in progress, shared by concurrent identical requests.
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_failed = False
+        self._next_purge = 0.0
+        # Guards the in-memory LRU; the database has its own lock, so memory
+        # hits never wait on the disk.
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    async def translate(
+        self,
+        tenant: TenantKey,
+        text: str,
+        translator: Callable[[str], Awaitable[str]],
+    ) -> str:
+        """Returns the cached translation of a query, translating it on a miss.
+
+        Args:
+            tenant: The (project_id, customer_id, region) the query runs in.
+            text: The natural language query.
+            translator: Coroutine function translating the query text.
+
+        Returns:
+            str: The UDM query.
+        """
+        if not self.enabled:
+            return await translator(text)
+        key = self._key(tenant, text)
+        udm_query = self._get_memory(key)
+        if udm_query is None and self.db_path is not None:
+            udm_query = await asyncio.to_thread(self._get_disk, key)
+        if udm_query is not None:
+            return udm_query
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.shared += 1
+            return await asyncio.shield(pending)
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            udm_query = await translator(text)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.errors += 1
+            future.set_exception(e)
+            # Retrieved so an unshared failure is not reported as unhandled.
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+        future.set_result(udm_query)
+        if udm_query:
+            expires_at = time.time() + self.ttl
+            with self._lock:
+                self._remember(key, udm_query, expires_at)
+            if self.db_path is not None:
+                await asyncio.to_thread(self._store, key, udm_query, expires_at)
+        return udm_query
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns an unexpired translation from memory or disk, or None.
+
+        Blocks on the database; `translate` reads it from a worker thread.
+        """
+        udm_query = self._get_memory(key)
+        if udm_query is None:
+            udm_query = self._get_disk(key)
+        return udm_query
+
+    def put(self, key: str, udm_query: str) -> None:
+        """Stores a translation in memory and on disk, blocking on the database."""
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, udm_query, expires_at)
+        self._store(key, udm_query, expires_at)
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry[1] > time.time():
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[0]
+            del self._memory[key]
+            return None
+
+    def _get_disk(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._db_lock:
+            db = self._connect()
+            if db is None:
+                return None
+            try:
+                row = db.execute(
+                    'SELECT udm_query, expires_at FROM translations WHERE key = ?',
+                    (key,),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f'Translation cache lookup failed: {e}')
+                return None
+        if row is None or row[1] <= now:
+            return None
+        with self._lock:
+            self._remember(key, row[0], row[1])
+            self.disk_hits += 1
+        return row[0]
+
+    def _store(self, key: str, udm_query: str, expires_at: float) -> None:
+        now = time.time()
+        with self._db_lock:
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.execute(
+                        'INSERT OR REPLACE INTO translations VALUES (?, ?, ?)',
+                        (key, udm_query, expires_at),
+                    )
+                    if now >= self._next_purge:
+                        db.execute(
+                            'DELETE FROM translations WHERE expires_at <= ?', (now,)
+                        )
+                        self._next_purge = now + PURGE_INTERVAL
+            except sqlite3.Error as e:
+                logger.warning(f'Translation cache write failed: {e}')
+
+    def clear(self) -> None:
+        """Removes every translation from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+        with self._db_lock:
+            db = self._connect()
+            if db is not None:
+                with db:
+                    db.execute('DELETE FROM translations')
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.disk_hits + self.shared
+        lookups = hits + self.misses
+        with self._lock:
+            memory_entries = len(self._memory)
+        return {
+            'enabled': self.enabled,
+            'ttl_seconds': self.ttl,
+            'memory_entries': memory_entries,
+            'max_memory_entries': self.max_memory_entries,
+            'db_path': None if self._db_failed else self.db_path,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'shared_translations': self.shared,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_rate': round(hits / lookups, 3) if lookups else None,
+        }
+
+    @staticmethod
+    def _key(tenant: TenantKey, text: str) -> str:
+        material = '\0'.join((*tenant, normalize_query(text)))
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _remember(self, key: str, udm_query: str, expires_at: float) -> None:
+        self._memory[key] = (udm_query, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._db is not None or self.db_path is None or self._db_failed:
+            return self._db
+        try:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.db_path, check_same_thread=False)
+            with db:
+                db.execute(
+                    'CREATE TABLE IF NOT EXISTS translations ('
+                    'key TEXT PRIMARY KEY, udm_query TEXT NOT NULL, '
+                    'expires_at REAL NOT NULL)'
+                )
+        except (OSError, sqlite3.Error) as e:
+            # The in-memory cache still works without the database.
+            logger.warning(
+                f'Translation cache database {self.db_path} unavailable: {e}'
+            )
+            self._db_failed = True
+            return None
+        self._db = db
+        return db
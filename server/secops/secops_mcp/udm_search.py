@@ -0,0 +1,181 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Time-sharded UDM search.
+
+A single UDM search over a wide window is slow, and when it hits the event
+limit the sample it returns is not necessarily the most recent. The window
+is instead split into consecutive shards that are searched concurrently on
+the SDK thread pool, newest first, with at most MAX_CONCURRENT_SHARDS in
+flight so one wide search does not take every worker. Once the newest
+shards alone hold `max_events` events, the older shards are not searched,
+since none of their events could be among the newest `max_events`.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from secops_mcp.executor import run_sdk
+
+logger = logging.getLogger('secops-mcp')
+
+MAX_TIME_SHARDS = 48
+# Shard searches of one request running at the same time.
+MAX_CONCURRENT_SHARDS = 4
+
+
+def event_timestamp(event: Dict[str, Any]) -> Optional[datetime]:
+    """Returns the UDM event timestamp of a search result, if it has one."""
+    udm = event.get('udm', event)
+    value = (udm.get('metadata') or {}).get('eventTimestamp')
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    # datetime only supports microseconds; UDM timestamps can carry nanoseconds.
+    if '.' in value:
+        head, _, tail = value.partition('.')
+        digits = len(tail) - len(tail.lstrip('0123456789'))
+        value = f'{head}.{tail[:min(digits, 6)]:0<6}{tail[digits:]}'
+    try:
+        timestamp = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+
+def sort_newest_first(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sorts events by timestamp, newest first, events without one last."""
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    return sorted(
+        events, key=lambda event: event_timestamp(event) or oldest, reverse=True
+    )
+
+
+def split_window(
+    start_time: datetime, end_time: datetime, shards: int
+) -> List[Tuple[datetime, datetime]]:
+    """Splits a time window into equal consecutive windows, newest first."""
+    step = (end_time - start_time) / shards
+    windows = []
+    for i in range(shards):
+        shard_end = end_time - step * i
+        shard_start = start_time if i == shards - 1 else shard_end - step
+        windows.append((shard_start, shard_end))
+    return windows
+
+
+async def search_udm_sharded(
+    chronicle: Any,
+    query: str,
+    start_time: datetime,
+    end_time: datetime,
+    max_events: int,
+    shards: int,
+) -> Dict[str, Any]:
+    """Searches a time window in concurrent shards and merges the results.
+
+    At most MAX_CONCURRENT_SHARDS shards are searched at a time, and shards
+    older than the newest `max_events` events are never submitted.
+
+    Args:
+        chronicle: The Chronicle client.
+        query: The UDM query.
+        start_time: Start of the window.
+        end_time: End of the window.
+        max_events: Maximum number of events to return.
+        shards: Number of shards, at most MAX_TIME_SHARDS.
+
+    Returns:
+        Dict[str, Any]: The newest events first, in the format of
+        `search_udm`, plus 'shards_searched' and 'shards_total'.
+        'total_events' is the number of merged events returned.
+    """
+    shards = max(1, min(shards, MAX_TIME_SHARDS))
+    windows = iter(split_window(start_time, end_time, shards))
+    # Submitted shards, newest first; a new one is submitted whenever fewer
+    # than MAX_CONCURRENT_SHARDS are still running.
+    tasks: Deque[asyncio.Future] = deque()
+
+    def submit_shards():
+        running = sum(1 for task in tasks if not task.done())
+        while running < MAX_CONCURRENT_SHARDS:
+            window = next(windows, None)
+            if window is None:
+                return
+            shard_start, shard_end = window
+            tasks.append(
+                asyncio.ensure_future(
+                    run_sdk(
+                        chronicle.search_udm,
+                        query=query,
+                        start_time=shard_start,
+                        end_time=shard_end,
+                        max_events=max_events,
+                    )
+                )
+            )
+            running += 1
+
+    events: List[Dict[str, Any]] = []
+    more_data_available = False
+    searched = 0
+    submit_shards()
+    try:
+        while tasks:
+            if not tasks[0].done():
+                # Results are merged in order, but any finished shard frees a slot.
+                await asyncio.wait(
+                    [task for task in tasks if not task.done()],
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                submit_shards()
+                continue
+            result = tasks.popleft().result()
+            searched += 1
+            if isinstance(result, dict):
+                events.extend(result.get('events', []))
+                more_data_available |= bool(result.get('more_data_available'))
+            elif isinstance(result, list):
+                events.extend(result)
+            if len(events) >= max_events:
+                break
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # Failures of unneeded shards are retrieved and ignored.
+                task.exception()
+    if searched < shards:
+        logger.info(
+            f'Stopped after the newest {searched} of {shards} shards '
+            f'with {len(events)} events'
+        )
+        more_data_available = True
+    if len(events) > max_events:
+        more_data_available = True
+    events = sort_newest_first(events)[:max_events]
+    return {
+        'events': events,
+        'total_events': len(events),
+        'more_data_available': more_data_available,
+        'shards_searched': searched,
+        'shards_total': shards,
+    }
@@ -0,0 +1 @@
+"""Offline unit tests, run against a stub Chronicle client."""
@@ -0,0 +1,95 @@
+"""Fixtures for the offline unit tests.
+
+The unit tests replace the Chronicle client with `StubChronicle`, so they
+need neither credentials nor tests/config.json.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from secops_mcp.udm_search import event_timestamp
+
+END_TIME = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def udm_event(timestamp: datetime, **fields: Any) -> Dict[str, Any]:
+    """Builds a UDM search result with an event timestamp and extra fields."""
+    udm = {'metadata': {'eventTimestamp': timestamp.isoformat().replace('+00:00', 'Z')}}
+    for path, value in fields.items():
+        target = udm
+        *parents, leaf = path.split('__')
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return {'udm': udm}
+
+
+class StubChronicle:
+    """Stands in for the Chronicle client of the `secops` SDK.
+
+    `search_udm` returns the events whose timestamps fall in the searched
+    window, and every call is recorded.
+    """
+
+    def __init__(self, events: Optional[List[Dict[str, Any]]] = None):
+        self.events = events or []
+        self.searches: List[Dict[str, Any]] = []
+        self.translations: List[str] = []
+        self.ingested: List[List[Any]] = []
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # Set to block searches until the test releases them.
+        self.release = threading.Event()
+        self.release.set()
+
+    def search_udm(self, query, start_time, end_time, max_events, **kwargs):
+        with self.lock:
+            self.searches.append(
+                {'query': query, 'start_time': start_time, 'end_time': end_time}
+            )
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            self.release.wait(5)
+            events = [
+                event
+                for event in self.events
+                if start_time <= event_timestamp(event) < end_time
+            ]
+            return {
+                'events': events[:max_events],
+                'total_events': min(len(events), max_events),
+                'more_data_available': len(events) > max_events,
+            }
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def translate_nl_to_udm(self, text: str) -> str:
+        self.translations.append(text)
+        return f'metadata.description = "{text}"'
+
+    def ingest_udm(self, udm_events):
+        self.ingested.append(list(udm_events))
+        return {'operation': f'operations/{len(self.ingested)}'}
+
+
+@pytest.fixture
+def hourly_events() -> List[Dict[str, Any]]:
+    """One event per hour over the 24 hours before END_TIME, newest first."""
+    return [
+        udm_event(
+            END_TIME - timedelta(hours=hour, minutes=30),
+            principal__hostname=f'host-{hour % 3}',
+        )
+        for hour in range(24)
+    ]
+
+
+@pytest.fixture
+def chronicle(hourly_events) -> StubChronicle:
+    return StubChronicle(hourly_events)
@@ -0,0 +1,66 @@
+"""Tests for the pool of Chronicle clients."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from secops_mcp import client_pool
+from secops_mcp.client_pool import ChronicleClientPool
+
+
+class StubSecOpsClient:
+    """Creates a client per call, blocking for tenants listed in `blocked`."""
+
+    blocked = set()
+    release = threading.Event()
+
+    def __init__(self):
+        self.auth = type('Auth', (), {'credentials': object()})()
+        self.created = []
+
+    def chronicle(self, customer_id, project_id, region):
+        if customer_id in self.blocked:
+            assert self.release.wait(5)
+        client = object()
+        self.created.append((customer_id, client))
+        return client
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    StubSecOpsClient.blocked = set()
+    StubSecOpsClient.release = threading.Event()
+    monkeypatch.setattr(client_pool, 'SecOpsClient', StubSecOpsClient)
+    return ChronicleClientPool(max_size=2, idle_seconds=0)
+
+
+def test_clients_are_reused_per_tenant_and_evicted_lru(pool):
+    first = pool.get('project', 'a', 'us')
+    assert pool.get('project', 'a', 'us') is first
+    pool.get('project', 'b', 'us')
+    pool.get('project', 'c', 'us')
+    assert pool.get('project', 'a', 'us') is not first
+    stats = pool.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 4, 2)
+
+
+def test_slow_client_creation_does_not_block_other_tenants(pool):
+    warm = pool.get('project', 'warm', 'us')
+    StubSecOpsClient.blocked = {'slow'}
+    with ThreadPoolExecutor(2) as executor:
+        slow = executor.submit(pool.get, 'project', 'slow', 'us')
+        # Served while the slow tenant's client is still being created.
+        assert executor.submit(pool.get, 'project', 'warm', 'us').result(2) is warm
+        StubSecOpsClient.release.set()
+        slow.result(5)
+
+
+def test_concurrent_creation_keeps_one_client_per_tenant(pool):
+    StubSecOpsClient.blocked = {'a'}
+    with ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(pool.get, 'project', 'a', 'us') for _ in range(4)]
+        StubSecOpsClient.release.set()
+        clients = {id(future.result(5)) for future in futures}
+    assert len(clients) == 1
+    assert pool.stats()['clients'] == 1
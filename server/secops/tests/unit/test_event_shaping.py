@@ -0,0 +1,96 @@
+"""Tests for shaping UDM search results."""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from secops_mcp.event_shaping import (
+    THREAD_THRESHOLD,
+    compact_events,
+    summarize_events,
+)
+from secops_mcp.tools import security_events
+from tests.unit.conftest import END_TIME, StubChronicle, udm_event
+
+
+def test_compact_events_flattens_and_deduplicates():
+    events = [
+        udm_event(END_TIME, principal__ip=['10.0.0.1', ''], target__port=443),
+        udm_event(END_TIME, principal__ip=['10.0.0.1'], target__port=443),
+        udm_event(END_TIME, principal__ip=[], target__port=0),
+    ]
+    rows, duplicates = compact_events(events, ['principal.ip', 'udm.target.port'])
+    assert rows == [
+        {'principal.ip': ['10.0.0.1'], 'target.port': 443},
+        {'target.port': 0},
+    ]
+    assert duplicates == 1
+
+
+def test_summarize_events_counts_values_and_when_they_were_seen(hourly_events):
+    summary = summarize_events(hourly_events, top_values=2)
+
+    assert summary['events'] == 24
+    assert summary['first_seen'] == '2025-05-31T00:30:00Z'
+    assert summary['last_seen'] == '2025-05-31T23:30:00Z'
+    assert list(summary['fields']) == ['principal.hostname']
+    hostnames = summary['fields']['principal.hostname']
+    assert hostnames['events'] == 24
+    assert hostnames['distinct_values'] == 3
+    assert hostnames['top_values'][0] == {
+        'value': 'host-0',
+        'count': 8,
+        'first_seen': '2025-05-31T02:30:00Z',
+        'last_seen': '2025-05-31T23:30:00Z',
+    }
+    assert len(hostnames['top_values']) == 2
+
+
+def test_summarize_events_counts_list_elements_and_requested_fields():
+    events = [
+        udm_event(END_TIME, about__ip=['10.0.0.1', '10.0.0.2']),
+        udm_event(END_TIME - timedelta(hours=1), about__ip=['10.0.0.1']),
+        udm_event(END_TIME - timedelta(hours=2)),
+    ]
+    summary = summarize_events(events, fields=['udm.about.ip', 'principal.user'])
+
+    about = summary['fields']['about.ip']
+    assert about['events'] == 2
+    assert [(value['value'], value['count']) for value in about['top_values']] == [
+        ('10.0.0.1', 2),
+        ('10.0.0.2', 1),
+    ]
+    assert summary['fields']['principal.user'] == {
+        'events': 0,
+        'distinct_values': 0,
+        'top_values': [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_large_result_sets_are_summarized_off_the_event_loop(monkeypatch):
+    # The tool searches back from the current time.
+    now = datetime.now(timezone.utc)
+    events = [
+        udm_event(now - timedelta(seconds=i + 1), principal__hostname=f'host-{i % 3}')
+        for i in range(THREAD_THRESHOLD + 1)
+    ]
+    chronicle = StubChronicle(events)
+    monkeypatch.setattr(
+        security_events, 'get_chronicle_client', lambda *args: chronicle
+    )
+    threads = []
+
+    def summarize(events, fields):
+        threads.append(threading.current_thread())
+        return summarize_events(events, fields)
+
+    monkeypatch.setattr(security_events, 'summarize_events', summarize)
+
+    result = await security_events.search_security_events(
+        udm_query='query', max_events=len(events), output_format='summary'
+    )
+
+    assert threads and threads[0] is not threading.main_thread()
+    assert result['events']['summary']['events'] == len(events)
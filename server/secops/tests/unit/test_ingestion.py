@@ -0,0 +1,145 @@
+"""Tests for chunked ingestion."""
+
+import pytest
+import requests
+from secops.exceptions import APIError
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from secops_mcp import ingestion
+from secops_mcp.ingestion import (
+    REJECTED,
+    RETRY,
+    UNCERTAIN,
+    chunk_records,
+    classify_upload_error,
+    format_report,
+    ingest_in_chunks,
+    ingest_udm_events_in_chunks,
+)
+
+
+def _connection_error(reason: Exception) -> requests.exceptions.ConnectionError:
+    """Raises a connection error the way requests does after urllib3 gives up."""
+    try:
+        try:
+            raise MaxRetryError(None, '/', reason) from reason
+        except MaxRetryError as e:
+            raise requests.exceptions.ConnectionError(e)
+    except requests.exceptions.ConnectionError as e:
+        return e
+
+
+def _sdk_error(cause: Exception) -> APIError:
+    """Wraps a transport error the way the SDK does."""
+    try:
+        raise APIError(f'Failed to ingest log: request_error={cause!r}') from cause
+    except APIError as e:
+        return e
+
+
+def test_chunks_respect_the_byte_budget_and_record_count():
+    chunks = list(chunk_records(range(10), lambda record: 10, max_bytes=35, max_records=100))
+    assert [chunk for chunk, _ in chunks] == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+    assert [size for _, size in chunks] == [30, 30, 30, 10]
+
+    chunks = list(chunk_records(range(5), lambda record: 1, max_bytes=100, max_records=2))
+    assert [chunk for chunk, _ in chunks] == [[0, 1], [2, 3], [4]]
+
+
+def test_oversized_records_form_their_own_chunk():
+    sizes = {'small': 10, 'huge': 500}
+    chunks = list(
+        chunk_records(['small', 'huge', 'small'], sizes.get, max_bytes=100, max_records=10)
+    )
+    assert [chunk for chunk, _ in chunks] == [['small'], ['huge'], ['small']]
+
+
+@pytest.mark.asyncio
+async def test_udm_events_are_uploaded_in_chunks_with_ids(chronicle):
+    events = [{'metadata': {'eventType': 'GENERIC_EVENT'}} for _ in range(5)]
+
+    report = await ingest_udm_events_in_chunks(
+        chronicle, events, max_bytes=10_000, max_records=2, concurrency=2
+    )
+
+    assert (report['records'], report['records_ingested'], report['chunks']) == (5, 5, 3)
+    assert sorted(len(chunk) for chunk in chronicle.ingested) == [1, 2, 2]
+    assert all(event['metadata']['id'] for event in events)
+    assert {result['operation'] for result in report['chunk_results']} == {
+        'operations/1',
+        'operations/2',
+        'operations/3',
+    }
+
+
+@pytest.mark.asyncio
+async def test_invalid_chunks_are_not_retried():
+    calls = []
+
+    async def upload(chunk):
+        calls.append(chunk)
+        raise ValueError('bad record')
+
+    report = await ingest_in_chunks(
+        ['a', 'b'], upload, len, max_bytes=100, max_records=1, max_attempts=3
+    )
+    assert len(calls) == 2
+    assert report['failed_chunks'] == 2
+    assert all(result['attempts'] == 1 for result in report['chunk_results'])
+
+
+@pytest.mark.parametrize(
+    'error, kind',
+    [
+        (ConnectionRefusedError('refused'), RETRY),
+        (_sdk_error(_connection_error(NewConnectionError(None, 'refused'))), RETRY),
+        (_sdk_error(requests.exceptions.ConnectTimeout('connect')), RETRY),
+        (APIError('Failed to ingest log: status=429, response={}'), RETRY),
+        (APIError('Failed to ingest log: status=503, response={}'), RETRY),
+        (APIError('Failed to ingest log: status=400, response={}'), REJECTED),
+        (ValueError('bad record'), REJECTED),
+        (ConnectionResetError('reset'), UNCERTAIN),
+        (_sdk_error(requests.exceptions.ConnectionError('Connection aborted')), UNCERTAIN),
+        (_sdk_error(requests.exceptions.ChunkedEncodingError('truncated')), UNCERTAIN),
+        (_sdk_error(requests.exceptions.ReadTimeout('read')), UNCERTAIN),
+        (requests.exceptions.JSONDecodeError('Expecting value', '', 0), UNCERTAIN),
+        (APIError('Failed to ingest log: status=500, response={}'), UNCERTAIN),
+        (APIError('Failed to ingest log: status=504, response={}'), UNCERTAIN),
+    ],
+)
+def test_upload_errors_are_classified(error, kind):
+    assert classify_upload_error(error) == kind
+
+
+@pytest.mark.asyncio
+async def test_only_errors_before_acceptance_are_retried(monkeypatch):
+    monkeypatch.setattr(ingestion, 'RETRY_BASE_DELAY', 0)
+    errors = {
+        'throttled': [APIError('status=429'), None],
+        'timed_out': [_sdk_error(requests.exceptions.ReadTimeout('read'))],
+        'failed': [APIError('status=500')],
+    }
+    calls = []
+
+    async def upload(chunk):
+        calls.append(chunk[0])
+        error = errors[chunk[0]].pop(0)
+        if error is not None:
+            raise error
+        return {'operation': 'operations/1'}
+
+    report = await ingest_in_chunks(
+        list(errors), upload, len, max_bytes=100, max_records=1, max_attempts=3
+    )
+
+    assert sorted(calls) == ['failed', 'throttled', 'throttled', 'timed_out']
+    results = {result['chunk']: result for result in report['chunk_results']}
+    assert results[0]['error'] is None and results[0]['attempts'] == 2
+    assert results[1]['possibly_ingested'] and results[2]['possibly_ingested']
+    assert report['records_ingested'] == 1
+    assert report['records_possibly_ingested'] == 2
+
+    text = format_report(report, 'logs')
+    assert 'Ingested 1 of 3 logs' in text
+    assert '2 logs may have been ingested' in text
+    assert 'Chunk 1 (1 record(s), 1 attempt(s)) failed, possibly ingested' in text
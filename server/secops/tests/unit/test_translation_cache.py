@@ -0,0 +1,124 @@
+"""Tests for the cache of natural language to UDM query translations."""
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from secops_mcp import translation_cache
+from secops_mcp.translation_cache import TranslationCache, normalize_query
+
+TENANT = ('project', 'customer', 'us')
+
+
+class Translator:
+    """Counts translations, optionally waiting until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, text: str) -> str:
+        self.calls += 1
+        await self.release.wait()
+        return f'udm for {normalize_query(text)}'
+
+
+def test_normalize_query_ignores_spacing_and_trailing_punctuation():
+    assert normalize_query('  Failed logins\n for  Alice?  ') == 'Failed logins for Alice'
+
+
+@pytest.mark.asyncio
+async def test_translations_are_cached_per_tenant_and_persisted(tmp_path):
+    db_path = str(tmp_path / 'translations.sqlite3')
+    translator = Translator()
+    cache = TranslationCache(ttl=60, db_path=db_path)
+
+    first = await cache.translate(TENANT, 'failed logins', translator)
+    assert await cache.translate(TENANT, 'failed  logins.', translator) == first
+    await cache.translate(('other', 'customer', 'us'), 'failed logins', translator)
+    assert translator.calls == 2
+    assert cache.stats()['memory_hits'] == 1
+
+    restarted = TranslationCache(ttl=60, db_path=db_path)
+    assert await restarted.translate(TENANT, 'failed logins', translator) == first
+    assert translator.calls == 2
+    assert restarted.stats()['disk_hits'] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_translations_are_translated_again(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(translation_cache.time, 'time', lambda: now[0])
+    translator = Translator()
+    cache = TranslationCache(ttl=60, db_path=str(tmp_path / 'translations.sqlite3'))
+
+    await cache.translate(TENANT, 'failed logins', translator)
+    now[0] += 61
+    await cache.translate(TENANT, 'failed logins', translator)
+    assert translator.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_database_is_used_off_the_event_loop(tmp_path, monkeypatch):
+    threads = []
+    store = TranslationCache._store
+
+    def recording_store(self, *args):
+        threads.append(threading.current_thread())
+        return store(self, *args)
+
+    monkeypatch.setattr(TranslationCache, '_store', recording_store)
+    cache = TranslationCache(ttl=60, db_path=str(tmp_path / 'translations.sqlite3'))
+    await cache.translate(TENANT, 'failed logins', Translator())
+    assert threads and threading.main_thread() not in threads
+
+
+def test_expired_rows_are_purged_periodically(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(translation_cache.time, 'time', lambda: now[0])
+    db_path = str(tmp_path / 'translations.sqlite3')
+    cache = TranslationCache(ttl=60, db_path=db_path)
+
+    def rows() -> int:
+        with sqlite3.connect(db_path) as db:
+            return db.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+
+    cache.put('a', 'udm a')
+    now[0] += 120
+    cache.put('b', 'udm b')
+    # Not purged on every write.
+    assert rows() == 2
+    now[0] += translation_cache.PURGE_INTERVAL
+    cache.put('c', 'udm c')
+    assert rows() == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_translations_are_shared():
+    translator = Translator()
+    translator.release.clear()
+    cache = TranslationCache(ttl=60, db_path='off')
+
+    tasks = [
+        asyncio.create_task(cache.translate(TENANT, 'failed logins', translator))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    translator.release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert len(set(results)) == 1
+    assert translator.calls == 1
+    assert cache.stats()['shared_translations'] == 2
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_translates():
+    translator = Translator()
+    cache = TranslationCache(ttl=0, db_path='off')
+    for _ in range(2):
+        await cache.translate(TENANT, 'failed logins', translator)
+    assert translator.calls == 2
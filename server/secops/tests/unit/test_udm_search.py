@@ -0,0 +1,69 @@
+"""Tests for the time-sharded UDM search."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from secops_mcp.udm_search import (
+    MAX_CONCURRENT_SHARDS,
+    search_udm_sharded,
+    split_window,
+)
+from tests.unit.conftest import END_TIME
+
+START_TIME = END_TIME - timedelta(hours=24)
+
+
+def test_split_window_covers_the_window_newest_first():
+    windows = split_window(START_TIME, END_TIME, 4)
+    assert windows[0][1] == END_TIME
+    assert windows[-1][0] == START_TIME
+    for (newer_start, _), (_, older_end) in zip(windows, windows[1:]):
+        assert newer_start == older_end
+    assert all(end - start == timedelta(hours=6) for start, end in windows)
+
+
+@pytest.mark.asyncio
+async def test_shards_are_merged_newest_first(chronicle, hourly_events):
+    result = await search_udm_sharded(
+        chronicle, 'query', START_TIME, END_TIME, max_events=100, shards=4
+    )
+    assert result['events'] == hourly_events
+    assert result['total_events'] == 24
+    assert not result['more_data_available']
+    assert (result['shards_searched'], result['shards_total']) == (4, 4)
+
+
+@pytest.mark.asyncio
+async def test_older_shards_are_skipped_once_enough_events_are_found(
+    chronicle, hourly_events
+):
+    result = await search_udm_sharded(
+        chronicle, 'query', START_TIME, END_TIME, max_events=6, shards=4
+    )
+    assert result['events'] == hourly_events[:6]
+    assert result['total_events'] == 6
+    assert result['more_data_available']
+    assert result['shards_searched'] == 1
+
+
+@pytest.mark.asyncio
+async def test_at_most_four_shards_are_searched_at_a_time(chronicle, hourly_events):
+    chronicle.release.clear()
+    search = asyncio.ensure_future(
+        search_udm_sharded(
+            chronicle, 'query', START_TIME, END_TIME, max_events=100, shards=12
+        )
+    )
+    for _ in range(100):
+        if chronicle.in_flight == MAX_CONCURRENT_SHARDS:
+            break
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    assert len(chronicle.searches) == MAX_CONCURRENT_SHARDS
+    chronicle.release.set()
+    result = await search
+    assert len(chronicle.searches) == 12
+    assert chronicle.max_in_flight == MAX_CONCURRENT_SHARDS
+    assert result['events'] == hourly_events